@@ -0,0 +1,176 @@
+"""
+End-to-end load test of the API: throughput and latency per scenario.
+
+Seeds synthetic categories, products, users and transactions (see
+benchmarks/seed.py), then drives each scenario with --concurrency worker
+threads through the Flask test client and/or a real threaded WSGI server:
+
+    login           POST /api/auth/login
+    me              GET  /api/auth/me
+    product_list    GET  /api/inventory/products?category_id=...
+    product_get     GET  /api/inventory/products/<id>
+    adjust          POST /api/inventory/products/<id>/adjust
+    history         GET  /api/inventory/products/<id>/transactions
+
+Reports requests/sec, p50/p95/p99 and non-2xx counts per scenario. The
+JSON written with --output includes the git commit and the arguments, so
+runs can be compared with `python -m benchmarks.compare old.json new.json`.
+
+    python -m benchmarks.bench_api_load --products 100000 --transactions 1000000 --concurrency 16 --output load.json
+"""
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from inventory_management.app import create_app
+from inventory_management.services.auth_service import generate_token
+from benchmarks.common import ServerThread, run_metadata, summarize, write_results
+from benchmarks.seed import seed_dataset
+
+SCENARIOS = ("login", "me", "product_list", "product_get", "adjust", "history")
+
+class ClientTransport:
+    """Send requests through a Flask test client (one per worker thread)."""
+
+    def __init__(self, app):
+        self.app = app
+        self._local = threading.local()
+
+    def send(self, method, path, body=None, headers=None):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = self.app.test_client()
+        return client.open(path, method=method, json=body, headers=headers).status_code
+
+class HTTPTransport:
+    """Send requests over HTTP to a running server."""
+
+    def __init__(self, url):
+        self.url = url
+
+    def send(self, method, path, body=None, headers=None):
+        data = json.dumps(body).encode() if body is not None else None
+        req = urllib.request.Request(
+            self.url + path, data=data, method=method,
+            headers={"Content-Type": "application/json", **(headers or {})}
+        )
+        try:
+            with urllib.request.urlopen(req, timeout=60) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            e.read()
+            return e.code
+
+def scenario_request(name, i, rng, dataset, tokens):
+    """Return (method, path, body, headers) for request i of a scenario."""
+    user = i % dataset.users
+    auth = {"Authorization": f"Bearer {tokens[user]}"}
+    product_id = rng.randint(1, dataset.products)
+
+    if name == "login":
+        return "POST", "/api/auth/login", {"username": f"user{user}", "password": dataset.password}, None
+    if name == "me":
+        return "GET", "/api/auth/me", None, auth
+    if name == "product_list":
+        category = rng.randint(1, dataset.categories)
+        return "GET", f"/api/inventory/products?category_id={category}&limit=50", None, auth
+    if name == "product_get":
+        return "GET", f"/api/inventory/products/{product_id}", None, auth
+    if name == "adjust":
+        return "POST", f"/api/inventory/products/{product_id}/adjust", {"quantity_change": rng.choice((-1, 1))}, auth
+    if name == "history":
+        return "GET", f"/api/inventory/products/{product_id}/transactions?limit=20", None, auth
+    raise ValueError(f"Unknown scenario: {name}")
+
+def run_scenario(transport, name, requests, concurrency, dataset, tokens):
+    samples = []
+    statuses = {}
+    lock = threading.Lock()
+
+    def worker(worker_id):
+        rng = random.Random(worker_id)
+        local_samples = []
+        local_statuses = {}
+        for i in range(worker_id, requests, concurrency):
+            method, path, body, headers = scenario_request(name, i, rng, dataset, tokens)
+            start = time.perf_counter()
+            status = transport.send(method, path, body, headers)
+            local_samples.append(time.perf_counter() - start)
+            local_statuses[status] = local_statuses.get(status, 0) + 1
+        with lock:
+            samples.extend(local_samples)
+            for status, count in local_statuses.items():
+                statuses[status] = statuses.get(status, 0) + count
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    result = summarize(samples)
+    result["requests_per_sec"] = round(len(samples) / elapsed, 1)
+    result["errors"] = sum(count for status, count in statuses.items() if status >= 400)
+    result["statuses"] = {str(status): count for status, count in sorted(statuses.items())}
+    return result
+
+def run(args):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app("production", {
+            "DATABASE_URI": args.database_uri or f"sqlite:///{tmp}/load.db",
+            "DB_AUTO_MIGRATE": True,
+            "BCRYPT_ROUNDS": args.rounds,
+            "NOTIFICATION_ENABLED": False,
+            "RESPONSE_CACHE_ENABLED": not args.no_response_cache,
+        })
+        start = time.perf_counter()
+        dataset = seed_dataset(app, args.categories, args.products, args.users, args.transactions, rounds=args.rounds)
+        print(f"Seeded {args.products} products, {args.users} users, {args.transactions} transactions "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        with app.app_context():
+            tokens = [generate_token(user_id) for user_id in range(1, dataset.users + 1)]
+
+        modes = ["client", "server"] if args.mode == "both" else [args.mode]
+        for mode in modes:
+            with (ServerThread(app) if mode == "server" else nullcontext()) as server:
+                transport = HTTPTransport(server.url) if server is not None else ClientTransport(app)
+                results[mode] = {}
+                for name in args.scenarios:
+                    requests = args.login_requests if name == "login" else args.requests
+                    stats = results[mode][name] = run_scenario(transport, name, requests, args.concurrency, dataset, tokens)
+                    print(f"{mode:6} {name:13} {stats['requests_per_sec']:>9} req/s  p50={stats['p50_ms']:8.2f}ms "
+                          f"p95={stats['p95_ms']:8.2f}ms p99={stats['p99_ms']:8.2f}ms errors={stats['errors']}")
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--categories", type=int, default=50)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario")
+    parser.add_argument("--login-requests", type=int, default=200, help="Requests for the login scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt work factor")
+    parser.add_argument("--mode", choices=("client", "server", "both"), default="both")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--no-response-cache", action="store_true", help="Disable the catalog response cache")
+    parser.add_argument("--database-uri", help="Benchmark against this (empty) database instead of a temporary SQLite file")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        write_results(args.output, {"meta": run_metadata(args), **results})
+
+if __name__ == "__main__":
+    main()
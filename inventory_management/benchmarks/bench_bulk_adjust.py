@@ -0,0 +1,110 @@
+"""
+Throughput of bulk stock adjustments.
+
+Applies 10k and 100k random adjustments with apply_stock_adjustments()
+against in-memory SQLite and a file-backed SQLite database, and compares
+with the per-row ORM update + commit the single adjust endpoint performs.
+
+    python -m benchmarks.bench_bulk_adjust --sizes 10000 100000 --output bulk.json
+    python -m benchmarks.bench_bulk_adjust --database-uri postgresql://... --sizes 10000
+"""
+import argparse
+import random
+import tempfile
+import time
+from inventory_management.app import create_app
+from inventory_management.models.inventory import InventoryTransaction, Product
+from inventory_management.services.stock_service import apply_stock_adjustments
+from inventory_management.utils.database import get_db
+from benchmarks.common import write_results
+
+def seed_products(app, count):
+    with app.app_context():
+        db = get_db()
+        db.add_all(
+            Product(sku=f"BULK-{i:06d}", name=f"Product {i}", price=1.0, quantity=1_000_000)
+            for i in range(count)
+        )
+        db.commit()
+    return [f"BULK-{i:06d}" for i in range(count)]
+
+def make_adjustments(skus, size, seed=42):
+    rng = random.Random(seed)
+    return [
+        {"sku": rng.choice(skus), "quantity_change": rng.choice([-3, -2, -1, 1, 2, 5]), "reference": f"SCAN-{i}"}
+        for i in range(size)
+    ]
+
+def bench_bulk(app, adjustments):
+    with app.app_context():
+        start = time.perf_counter()
+        db = get_db()
+        results, _ = apply_stock_adjustments(db, adjustments)
+        db.commit()
+        elapsed = time.perf_counter() - start
+
+    applied = sum(1 for r in results if r["status"] == "applied")
+    return {"seconds": round(elapsed, 3), "applied": applied, "rows_per_sec": round(len(adjustments) / elapsed)}
+
+def bench_per_row(app, adjustments):
+    with app.app_context():
+        db = get_db()
+        start = time.perf_counter()
+        for record in adjustments:
+            product = db.query(Product).filter_by(sku=record["sku"]).first()
+            product.quantity += record["quantity_change"]
+            db.add(InventoryTransaction(
+                product_id=product.id,
+                quantity_change=record["quantity_change"],
+                transaction_type="addition" if record["quantity_change"] > 0 else "removal",
+                reference=record["reference"]
+            ))
+            db.commit()
+        elapsed = time.perf_counter() - start
+
+    return {"seconds": round(elapsed, 3), "rows_per_sec": round(len(adjustments) / elapsed)}
+
+def run(database_uris, sizes, products, baseline_size):
+    results = {}
+    for label, uri in database_uris.items():
+        for size in sizes:
+            app = create_app("testing", {"DATABASE_URI": uri(), "NOTIFICATION_ENABLED": False})
+            skus = seed_products(app, products)
+            results[f"{label}/bulk/{size}"] = bench_bulk(app, make_adjustments(skus, size))
+
+        if baseline_size:
+            app = create_app("testing", {"DATABASE_URI": uri(), "NOTIFICATION_ENABLED": False})
+            skus = seed_products(app, products)
+            results[f"{label}/per-row/{baseline_size}"] = bench_per_row(app, make_adjustments(skus, baseline_size))
+
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--products", type=int, default=5_000)
+    parser.add_argument("--baseline-size", type=int, default=2_000,
+                        help="Adjustments for the per-row commit baseline (0 to skip)")
+    parser.add_argument("--database-uri", help="Benchmark this database instead of the SQLite defaults")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        counter = iter(range(1_000_000))
+        if args.database_uri:
+            database_uris = {"custom": lambda: args.database_uri}
+        else:
+            database_uris = {
+                "sqlite-memory": lambda: "sqlite:///:memory:",
+                "sqlite-file": lambda: f"sqlite:///{tmp}/bulk-{next(counter)}.db",
+            }
+        results = run(database_uris, args.sizes, args.products, args.baseline_size)
+
+    for name, stats in results.items():
+        print(f"{name:32} {stats['rows_per_sec']:>10,} rows/s  ({stats['seconds']}s)")
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
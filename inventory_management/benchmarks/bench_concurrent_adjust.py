@@ -0,0 +1,99 @@
+"""
+Multi-threaded stress test for stock adjustments on a single hot SKU.
+
+Every thread adds +1 to the same product many times. The atomic path
+(adjust_quantity, a conditional UPDATE ... RETURNING) must end with exactly
+threads * iterations units; the legacy read-modify-write path is run for
+comparison and typically loses updates.
+
+    python -m benchmarks.bench_concurrent_adjust --threads 16 --iterations 200
+    python -m benchmarks.bench_concurrent_adjust --database-uri postgresql://...
+"""
+import argparse
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy.exc import OperationalError
+from inventory_management.app import create_app
+from inventory_management.models.inventory import InventoryTransaction, Product
+from inventory_management.services.stock_service import adjust_quantity
+from inventory_management.utils.database import get_db
+from benchmarks.common import write_results
+
+def atomic_increment(db, product_id):
+    adjust_quantity(db, product_id, 1)
+    db.add(InventoryTransaction(product_id=product_id, quantity_change=1, transaction_type="addition"))
+    db.commit()
+
+def read_modify_write_increment(db, product_id):
+    product = db.query(Product).filter_by(id=product_id).first()
+    product.quantity += 1
+    db.add(InventoryTransaction(product_id=product_id, quantity_change=1, transaction_type="addition"))
+    db.commit()
+
+def hammer(database_uri, sku, increment, threads, iterations):
+    app = create_app("testing", {"DATABASE_URI": database_uri})
+    with app.app_context():
+        db = get_db()
+        product = Product(sku=sku, name="Hot SKU", price=1.0, quantity=0)
+        db.add(product)
+        db.commit()
+        product_id = product.id
+
+    errors = []
+
+    def worker(_):
+        for _ in range(iterations):
+            with app.app_context():
+                db = get_db()
+                try:
+                    increment(db, product_id)
+                except OperationalError as e:
+                    db.rollback()
+                    errors.append(str(e.orig))
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, range(threads)))
+    elapsed = time.perf_counter() - start
+
+    with app.app_context():
+        final = get_db().query(Product).filter_by(id=product_id).first().quantity
+
+    attempted = threads * iterations
+    return {
+        "attempted": attempted,
+        "failed": len(errors),
+        "final_quantity": final,
+        "lost_updates": attempted - len(errors) - final,
+        "seconds": round(elapsed, 3),
+        "adjustments_per_sec": round(attempted / elapsed),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--database-uri", help="Benchmark this database instead of a temporary SQLite file")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        modes = (
+            ("atomic", "HOT-ATOMIC", atomic_increment),
+            ("read-modify-write", "HOT-RMW", read_modify_write_increment),
+        )
+        for name, sku, increment in modes:
+            uri = args.database_uri or f"sqlite:///{tmp}/{name}.db"
+            results[name] = hammer(uri, sku, increment, args.threads, args.iterations)
+
+    for name, stats in results.items():
+        print(f"{name:20} {stats['adjustments_per_sec']:>8,} adj/s  final={stats['final_quantity']} "
+              f"lost={stats['lost_updates']} failed={stats['failed']}")
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Memory use of streaming exports over a large transaction table.
+
+Seeds N synthetic inventory transactions (1M by default) into a file-backed
+SQLite database, streams /api/inventory/export/transactions through the
+test client without buffering the body, and reports throughput and peak
+memory. The same rows are then exported the old way (load everything,
+serialize one JSON array) for comparison.
+
+    python -m benchmarks.bench_export_memory --rows 1000000 --output export.json
+"""
+import argparse
+import json
+import resource
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from sqlalchemy import insert
+from inventory_management.app import create_app
+from inventory_management.models.inventory import InventoryTransaction, Product
+from inventory_management.utils.database import get_db
+from benchmarks.common import create_benchmark_user, write_results
+
+def max_rss_mb():
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+def seed_transactions(app, rows, products=1000, chunk=50_000):
+    now = datetime.utcnow()
+    with app.app_context():
+        db = get_db()
+        db.add_all(Product(sku=f"EXPORT-{i:05d}", name=f"Product {i}", price=1.0, quantity=0) for i in range(products))
+        db.commit()
+        for start in range(0, rows, chunk):
+            db.execute(insert(InventoryTransaction.__table__), [
+                {"product_id": i % products + 1, "quantity_change": 1, "transaction_type": "addition",
+                 "reference": f"REF-{i}", "notes": "", "timestamp": now}
+                for i in range(start, min(start + chunk, rows))
+            ])
+            db.commit()
+
+def measure(func, trace):
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    size = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else None
+    if trace:
+        tracemalloc.stop()
+    return {
+        "seconds": round(elapsed, 2),
+        "bytes": size,
+        "python_peak_mb": round(peak / 2**20, 1) if peak is not None else None,
+        "max_rss_mb": max_rss_mb(),
+    }
+
+def run(rows, trace):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app("testing", {"DATABASE_URI": f"sqlite:///{tmp}/export.db"})
+        seed_transactions(app, rows)
+        _, token = create_benchmark_user(app)
+        client = app.test_client()
+        headers = {"Authorization": f"Bearer {token}"}
+        results = {"rows": rows, "after_seed_max_rss_mb": max_rss_mb()}
+
+        def streamed():
+            response = client.get("/api/inventory/export/transactions", headers=headers, buffered=False)
+            size = sum(len(chunk) for chunk in response.iter_encoded())
+            response.close()
+            return size
+
+        def buffered():
+            with app.app_context():
+                transactions = get_db().query(InventoryTransaction).all()
+                body = json.dumps([{
+                    "id": t.id,
+                    "product_id": t.product_id,
+                    "quantity_change": t.quantity_change,
+                    "transaction_type": t.transaction_type,
+                    "reference": t.reference,
+                    "user_id": t.user_id,
+                    "timestamp": t.timestamp.isoformat(),
+                } for t in transactions])
+                return len(body)
+
+        results["streamed"] = measure(streamed, trace)
+        results["streamed"]["rows_per_sec"] = round(rows / results["streamed"]["seconds"])
+        results["buffered"] = measure(buffered, trace)
+        results["buffered"]["rows_per_sec"] = round(rows / results["buffered"]["seconds"])
+        return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--tracemalloc", action="store_true", help="Also report Python heap peaks (slower)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.tracemalloc)
+    print(f"rows={results['rows']} rss after seeding={results['after_seed_max_rss_mb']}MB")
+    for mode in ("streamed", "buffered"):
+        stats = results[mode]
+        peak = f"  python_peak={stats['python_peak_mb']}MB" if args.tracemalloc else ""
+        print(f"{mode:9} {stats['rows_per_sec']:>9,} rows/s  max_rss={stats['max_rss_mb']}MB{peak}")
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
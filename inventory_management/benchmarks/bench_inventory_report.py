@@ -0,0 +1,117 @@
+"""
+Inventory report: chunked pandas pipeline vs. a naive ORM loop.
+
+Seeds N products in 50 categories and M transactions (1M / 10M by
+default) into a file-backed SQLite database, then builds the valuation /
+turnover / days-of-cover report with services.reporting and with a
+straightforward loop over ORM objects and their transactions. Reports
+wall time of each, and Python peak memory with --tracemalloc.
+
+    python -m benchmarks.bench_inventory_report --products 1000000 --transactions 10000000 --output report.json
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from inventory_management.app import create_app
+from inventory_management.models.inventory import Category, InventoryTransaction, Product
+from inventory_management.services.reporting import build_inventory_report
+from inventory_management.utils.database import get_db, get_engine
+from benchmarks.common import write_results
+
+def seed(app, products, transactions, categories=50, chunk=100_000):
+    rng = random.Random(42)
+    now = datetime.utcnow()
+    with app.app_context():
+        db = get_db()
+        db.execute(insert(Category.__table__), [{"name": f"Category {i}"} for i in range(categories)])
+        for start in range(0, products, chunk):
+            db.execute(insert(Product.__table__), [
+                {"sku": f"RPT-{i:07d}", "name": f"Product {i}", "price": round(rng.uniform(1, 100), 2),
+                 "quantity": rng.randint(0, 500), "category_id": i % categories + 1, "active": True}
+                for i in range(start, min(start + chunk, products))
+            ])
+        for start in range(0, transactions, chunk):
+            db.execute(insert(InventoryTransaction.__table__), [
+                {"product_id": rng.randint(1, products), "quantity_change": rng.choice((-3, -2, -1, 5)),
+                 "transaction_type": "adjustment", "timestamp": now - timedelta(minutes=rng.randint(0, 60 * 24 * 60))}
+                for _ in range(start, min(start + chunk, transactions))
+            ])
+            db.commit()
+
+def naive_report(app, output_dir, period_days=30):
+    """Build the same report by walking ORM objects and lazy-loaded relationships."""
+    since = datetime.utcnow() - timedelta(days=period_days)
+    totals = defaultdict(lambda: {"products": 0, "quantity": 0, "valuation": 0.0, "units_out": 0})
+    with app.app_context(), open(os.path.join(output_dir, "products_naive.csv"), "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "sku", "name", "category", "price", "quantity", "valuation", "units_out", "turnover", "days_of_cover"])
+        for product in get_db().query(Product).order_by(Product.id):
+            units_out = sum(-t.quantity_change for t in product.transactions if t.quantity_change < 0 and t.timestamp >= since)
+            valuation = product.price * product.quantity
+            turnover = units_out / product.quantity if product.quantity else None
+            cover = product.quantity / (units_out / period_days) if units_out else None
+            category = product.category.name if product.category else "Uncategorized"
+            writer.writerow([product.id, product.sku, product.name, category, product.price, product.quantity,
+                             valuation, units_out, turnover, cover])
+            total = totals[category]
+            total["products"] += 1
+            total["quantity"] += product.quantity
+            total["valuation"] += valuation
+            total["units_out"] += units_out
+    return totals
+
+def measure(func, trace):
+    if trace:
+        tracemalloc.start()
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] if trace else None
+    if trace:
+        tracemalloc.stop()
+    return {"seconds": round(elapsed, 2), "python_peak_mb": round(peak / 2**20, 1) if peak is not None else None}
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app("testing", {"DATABASE_URI": f"sqlite:///{tmp}/report.db"})
+        start = time.perf_counter()
+        seed(app, args.products, args.transactions)
+        print(f"Seeded {args.products} products and {args.transactions} transactions in {time.perf_counter() - start:.1f}s")
+
+        with app.app_context():
+            engine = get_engine()
+        results = {"pandas": measure(lambda: build_inventory_report(
+            engine, tmp, fmt=args.format, chunksize=args.chunksize
+        ), args.tracemalloc)}
+        if not args.skip_naive:
+            results["orm_loop"] = measure(lambda: naive_report(app, tmp), args.tracemalloc)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--transactions", type=int, default=10_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--format", choices=("csv", "parquet"), default="csv")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also report Python heap peaks (slower)")
+    parser.add_argument("--skip-naive", action="store_true", help="Skip the ORM loop (slow on large catalogs)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args)
+    for name, stats in results.items():
+        peak = f"  python_peak={stats['python_peak_mb']}MB" if args.tracemalloc else ""
+        print(f"{name:10} {stats['seconds']:8.2f}s{peak}")
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
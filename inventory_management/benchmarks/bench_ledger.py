@@ -0,0 +1,203 @@
+"""
+Stock adjustments per second: per-row commit vs. the group-committing ledger.
+
+Seeds --products products in a fresh temporary SQLite file per run, then
+offers single adjustments at fixed rates (1k and 10k per second by
+default) for --seconds each. Arrivals are scheduled in advance (open
+loop), so latency is measured from when an adjustment was due, and a
+strategy that falls behind shows it as growing latency rather than a
+lower offered rate. Adjustments arriving while --max-in-flight are
+outstanding are shed and counted.
+
+Strategies:
+
+- per_row: --workers threads each apply an adjustment and commit it on
+  its own, as the adjust endpoint does without the ledger;
+- ledger_sync / ledger_async: LedgerWriter in each durability mode.
+
+Reports achieved adjustments/sec, p50/p95/p99 latency, shed and failed
+adjustments, commits (batches) and the mean batch size per strategy and
+rate. --sqlite-mode tuned applies the SQLITE_TUNED pragmas (WAL,
+synchronous=NORMAL), where commits are much cheaper than in the default
+rollback-journal mode. The load generator runs in the same process, so
+on small machines it competes with the writer for the CPU.
+
+    python -m benchmarks.bench_ledger --rates 1000 10000 --seconds 5 --output ledger.json
+"""
+import argparse
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import insert
+from inventory_management.app import create_app
+from inventory_management.models.inventory import Product
+from inventory_management.services.inventory_service import record_adjustment
+from inventory_management.services.ledger import LedgerWriter
+from inventory_management.utils.database import get_database, get_db
+from benchmarks.common import run_metadata, summarize, write_results
+
+STRATEGIES = ("per_row", "ledger_sync", "ledger_async")
+
+def seed_products(app, count):
+    with app.app_context():
+        db = get_db()
+        db.execute(insert(Product.__table__), [
+            {"sku": f"LED-{i:07d}", "name": f"Product {i}", "price": 1.0, "quantity": 1_000_000, "active": True}
+            for i in range(count)
+        ])
+        db.commit()
+
+class PerRowCommit:
+    """Apply each adjustment in its own transaction on a pool of worker threads."""
+
+    def __init__(self, session_factory, workers):
+        self.session_factory = session_factory
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.commits = 0
+        self._lock = threading.Lock()
+
+    def _apply(self, product_id, quantity_change):
+        session = self.session_factory()
+        try:
+            level = record_adjustment(session, product_id, {"quantity_change": quantity_change}, None)
+            session.commit()
+            with self._lock:
+                self.commits += 1
+            return level
+        finally:
+            session.close()
+
+    def submit(self, product_id, quantity_change):
+        return self.executor.submit(self._apply, product_id, quantity_change)
+
+    def stats(self):
+        return {"commits": self.commits}
+
+    def close(self):
+        self.executor.shutdown()
+
+class LedgerStrategy:
+    def __init__(self, session_factory, durability, batch_size, flush_interval):
+        self.ledger = LedgerWriter(session_factory, batch_size=batch_size, flush_interval=flush_interval,
+                                   durability=durability)
+
+    def submit(self, product_id, quantity_change):
+        return self.ledger.submit(product_id, quantity_change, reference="bench")
+
+    def stats(self):
+        stats = self.ledger.stats()
+        return {"commits": stats["batches"], "entries_per_batch": stats["entries_per_batch"],
+                "mean_flush_ms": stats["mean_flush_ms"]}
+
+    def close(self):
+        self.ledger.flush()
+        self.ledger.stop()
+
+def drive(strategy, rate, seconds, products, max_in_flight):
+    """Offer rate adjustments per second for seconds; return latency and throughput stats."""
+    rng = random.Random(rate)
+    total = int(rate * seconds)
+    samples = []
+    failed = [0]
+    shed = 0
+    lock = threading.Lock()
+    in_flight = threading.BoundedSemaphore(max_in_flight)
+    done = threading.Event()
+    remaining = [total]
+
+    def finished(due):
+        def callback(future):
+            latency = time.perf_counter() - due
+            with lock:
+                if future.exception() is None:
+                    samples.append(latency)
+                else:
+                    failed[0] += 1
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+            in_flight.release()
+        return callback
+
+    start = time.perf_counter()
+    for i in range(total):
+        due = start + i / rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        if not in_flight.acquire(blocking=False):
+            shed += 1
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    done.set()
+            continue
+        future = strategy.submit(rng.randint(1, products), rng.choice((-1, 1)))
+        future.add_done_callback(finished(due))
+
+    done.wait()
+    elapsed = time.perf_counter() - start
+
+    result = summarize(samples)
+    result["offered_per_sec"] = rate
+    result["adjustments_per_sec"] = round(len(samples) / elapsed, 1)
+    result["shed"] = shed
+    result["failed"] = failed[0]
+    result.update(strategy.stats())
+    return result
+
+def make_strategy(name, app, args):
+    session_factory = get_database(app).session_factory
+    if name == "per_row":
+        return PerRowCommit(session_factory, args.workers)
+    return LedgerStrategy(session_factory, name.split("_")[1], args.batch_size, args.flush_interval)
+
+def run(args):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.strategies:
+            results[name] = {}
+            for rate in args.rates:
+                # A fresh database per run, so earlier runs' rows do not slow later ones
+                app = create_app("production", {
+                    "DATABASE_URI": f"sqlite:///{tmp}/{name}-{rate}.db",
+                    "DB_AUTO_MIGRATE": True,
+                    "DB_POOL_SIZE": args.workers,
+                    "SQLITE_TUNED": args.sqlite_mode == "tuned",
+                    "SQLITE_SINGLE_WRITER": False,
+                    "NOTIFICATION_ENABLED": False,
+                })
+                seed_products(app, args.products)
+                strategy = make_strategy(name, app, args)
+                try:
+                    stats = results[name][str(rate)] = drive(strategy, rate, args.seconds, args.products, args.max_in_flight)
+                finally:
+                    strategy.close()
+                    get_database(app).engine.dispose()
+                print(f"{name:13} offered={rate:>6}/s achieved={stats['adjustments_per_sec']:>9}/s "
+                      f"p50={stats['p50_ms']:8.2f}ms p95={stats['p95_ms']:8.2f}ms p99={stats['p99_ms']:8.2f}ms "
+                      f"shed={stats['shed']} failed={stats['failed']} commits={stats['commits']}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rates", type=int, nargs="+", default=[1000, 10000], help="Offered adjustments per second")
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each run")
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--workers", type=int, default=8, help="Threads committing per row (and DB_POOL_SIZE)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="LEDGER_BATCH_SIZE")
+    parser.add_argument("--flush-interval", type=float, default=0.002, help="LEDGER_FLUSH_INTERVAL (seconds)")
+    parser.add_argument("--max-in-flight", type=int, default=5000, help="Shed arrivals beyond this many outstanding")
+    parser.add_argument("--sqlite-mode", choices=("default", "tuned"), default="default")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args)
+    if args.output:
+        write_results(args.output, {"meta": run_metadata(args), **results})
+
+if __name__ == "__main__":
+    main()
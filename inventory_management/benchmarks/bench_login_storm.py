@@ -0,0 +1,117 @@
+"""
+Login storm: latency of login vs. non-login endpoints under a burst of logins.
+
+Starts the app on a real threaded WSGI server, fires concurrent
+/api/auth/login requests and, at the same time, probes /health and an
+authenticated product read. Reports p50/p99 for each side by side, plus
+how many logins were shed with 503 by the bounded bcrypt pool.
+
+    python -m benchmarks.bench_login_storm --logins 200 --concurrency 32 --rounds 12
+"""
+import argparse
+import json
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from inventory_management.app import create_app
+from inventory_management.models.user import User
+from inventory_management.services.permissions import seed_roles_and_permissions
+from inventory_management.utils.database import get_db
+from inventory_management.utils.passwords import PasswordHasher
+from benchmarks.common import ServerThread, create_benchmark_user, summarize, write_results
+
+PASSWORD = "Password1!"
+
+def request(url, data=None, headers=None):
+    """Send a request and return (status, seconds)."""
+    body = json.dumps(data).encode() if data is not None else None
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json", **(headers or {})})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=60) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+def seed_users(app, count, rounds):
+    password_hash = PasswordHasher(rounds=rounds).hash_password(PASSWORD)
+    with app.app_context():
+        db = get_db()
+        role = seed_roles_and_permissions(db)["clerk"]
+        db.add_all(
+            User(username=f"user{i}", email=f"user{i}@example.com", role_id=role.id, password_hash=password_hash)
+            for i in range(count)
+        )
+        db.commit()
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app("production", {
+            "DATABASE_URI": f"sqlite:///{tmp}/storm.db",
+            "DB_AUTO_MIGRATE": True,
+            "BCRYPT_ROUNDS": args.rounds,
+            "PASSWORD_HASHER_WORKERS": args.workers,
+            "NOTIFICATION_ENABLED": False,
+        })
+        seed_users(app, args.logins, args.rounds)
+        _, token = create_benchmark_user(app)
+        auth = {"Authorization": f"Bearer {token}"}
+
+        with ServerThread(app) as server:
+            login_samples, login_statuses = [], []
+            probes = {"/health": [], "/api/inventory/products": []}
+            storm_over = threading.Event()
+
+            def login(i):
+                status, seconds = request(f"{server.url}/api/auth/login", {"username": f"user{i}", "password": PASSWORD})
+                login_statuses.append(status)
+                if status == 200:
+                    login_samples.append(seconds)
+
+            def probe():
+                while not storm_over.is_set():
+                    for path, samples in probes.items():
+                        status, seconds = request(f"{server.url}{path}", headers=auth)
+                        samples.append(seconds)
+                    time.sleep(args.probe_interval)
+
+            prober = threading.Thread(target=probe)
+            prober.start()
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                list(executor.map(login, range(args.logins)))
+            elapsed = time.perf_counter() - start
+            storm_over.set()
+            prober.join()
+
+    results = {"login": summarize(login_samples)}
+    results.update({path: summarize(samples) for path, samples in probes.items()})
+    results["login"]["shed_503"] = login_statuses.count(503)
+    results["login"]["logins_per_sec"] = round(len(login_samples) / elapsed, 1)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt work factor")
+    parser.add_argument("--workers", type=int, default=2, help="PASSWORD_HASHER_WORKERS")
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args)
+    for name, stats in results.items():
+        print(f"{name:28} p50={stats['p50_ms']:9.2f}ms p99={stats['p99_ms']:9.2f}ms n={stats['count']}")
+    print(f"logins/sec={results['login']['logins_per_sec']} shed={results['login']['shed_503']}")
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
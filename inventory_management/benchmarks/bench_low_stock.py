@@ -0,0 +1,79 @@
+"""
+Latency of the low stock listing on a large catalog.
+
+Seeds N products (1M by default) into a file-backed SQLite database, with
+a small fraction at or below their threshold, then times the first page
+of /api/inventory/low-stock and a full walk of all its pages. The same
+listing is timed as a full table scan calling Product.is_low_stock() per
+row, which is what finding low stock products used to require.
+
+    python -m benchmarks.bench_low_stock --products 1000000 --output low_stock.json
+"""
+import argparse
+import tempfile
+import time
+from sqlalchemy import insert
+from inventory_management.app import create_app
+from inventory_management.models.inventory import Product
+from inventory_management.utils.database import get_db
+from benchmarks.common import create_benchmark_user, summarize, time_calls, write_results
+
+def seed_products(app, count, low_every, chunk=50_000):
+    with app.app_context():
+        db = get_db()
+        for start in range(0, count, chunk):
+            db.execute(insert(Product.__table__), [
+                {"sku": f"LOW-{i:07d}", "name": f"Product {i}", "price": 1.0, "active": True,
+                 "quantity": 1 if i % low_every == 0 else 100, "low_stock_threshold": 10}
+                for i in range(start, min(start + chunk, count))
+            ])
+            db.commit()
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app("testing", {"DATABASE_URI": f"sqlite:///{tmp}/low_stock.db"})
+        seed_products(app, args.products, args.low_every)
+        _, token = create_benchmark_user(app)
+        headers = {"Authorization": f"Bearer {token}"}
+        client = app.test_client()
+
+        def first_page():
+            assert client.get("/api/inventory/low-stock?limit=100", headers=headers).status_code == 200
+
+        def all_pages():
+            url = "/api/inventory/low-stock?limit=500"
+            while url:
+                cursor = client.get(url, headers=headers).get_json()["next_cursor"]
+                url = f"/api/inventory/low-stock?limit=500&cursor={cursor}" if cursor else None
+
+        def table_scan():
+            with app.app_context():
+                db = get_db()
+                return [p.id for p in db.query(Product).yield_per(10_000) if p.active and p.is_low_stock()]
+
+        results = {
+            "first_page": summarize(time_calls(first_page, args.iterations)),
+            "all_pages": summarize(time_calls(all_pages, max(1, args.iterations // 10))),
+        }
+        start = time.perf_counter()
+        table_scan()
+        results["table_scan"] = summarize([time.perf_counter() - start])
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--low-every", type=int, default=1000, help="Every Nth product is low stock")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args)
+    for name, stats in results.items():
+        print(f"{name:12} p50={stats['p50_ms']:9.2f}ms p99={stats['p99_ms']:9.2f}ms n={stats['count']}")
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
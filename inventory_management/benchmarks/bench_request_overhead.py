@@ -0,0 +1,65 @@
+"""
+Per-request overhead of /health and /api/inventory/products.
+
+Run from the project root:
+
+    python -m benchmarks.bench_request_overhead --iterations 2000 --output overhead.json
+
+Run it on two commits and compare the JSON files to track the fixed cost
+the framework and database hooks add to every request.
+"""
+import argparse
+import tempfile
+from inventory_management.app import create_app
+from inventory_management.models.inventory import Product
+from inventory_management.utils.database import get_db
+from benchmarks.common import create_benchmark_user, summarize, time_calls, write_results
+
+def build_app(database_uri):
+    app = create_app("development", {"DATABASE_URI": database_uri})
+
+    with app.app_context():
+        db = get_db()
+        db.add_all(
+            Product(sku=f"BENCH-{i:05d}", name=f"Product {i}", price=1.0, quantity=100)
+            for i in range(20)
+        )
+        db.commit()
+
+    return app
+
+def run(iterations, warmup):
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(f"sqlite:///{tmp}/overhead.db")
+        _, token = create_benchmark_user(app)
+        client = app.test_client()
+        headers = {"Authorization": f"Bearer {token}"}
+
+        endpoints = {
+            "/health": lambda: client.get("/health"),
+            "/api/inventory/products": lambda: client.get("/api/inventory/products", headers=headers),
+        }
+
+        results = {}
+        for name, call in endpoints.items():
+            time_calls(call, warmup)
+            results[name] = summarize(time_calls(call, iterations))
+
+        return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.warmup)
+    for name, stats in results.items():
+        print(f"{name:30} p50={stats['p50_ms']:.3f}ms p95={stats['p95_ms']:.3f}ms p99={stats['p99_ms']:.3f}ms")
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Requests/sec of catalog reads with and without the response cache.
+
+Seeds a catalog, then reads a page of /api/inventory/products and single
+products through the test client with RESPONSE_CACHE_ENABLED off and on,
+and on with If-None-Match (304 responses). With --write-every N a stock
+adjustment is made every N reads, so the cache is invalidated at a
+realistic rate.
+
+    python -m benchmarks.bench_response_cache --requests 5000 --write-every 100 --output response_cache.json
+"""
+import argparse
+import tempfile
+import time
+from sqlalchemy import insert
+from inventory_management.app import create_app
+from inventory_management.models.inventory import Product
+from inventory_management.utils.database import get_db
+from benchmarks.common import create_benchmark_user, summarize, write_results
+
+def run_mode(tmp, args, cache_enabled, conditional):
+    app = create_app("testing", {
+        "DATABASE_URI": f"sqlite:///{tmp}/cache_{int(cache_enabled)}{int(conditional)}.db",
+        "RESPONSE_CACHE_ENABLED": cache_enabled,
+    })
+    with app.app_context():
+        db = get_db()
+        db.execute(insert(Product.__table__), [
+            {"sku": f"CACHE-{i:05d}", "name": f"Product {i}", "price": 1.0, "quantity": 1000, "active": True}
+            for i in range(args.products)
+        ])
+        db.commit()
+    _, token = create_benchmark_user(app)
+    headers = {"Authorization": f"Bearer {token}"}
+    client = app.test_client()
+
+    urls = ["/api/inventory/products?limit=50"] + [f"/api/inventory/products/{i}" for i in range(1, 11)]
+    etags = {}
+    samples = []
+    start = time.perf_counter()
+    for i in range(args.requests):
+        url = urls[i % len(urls)]
+        request_headers = headers
+        if conditional and url in etags:
+            request_headers = {**headers, "If-None-Match": etags[url]}
+
+        call_start = time.perf_counter()
+        response = client.get(url, headers=request_headers)
+        samples.append(time.perf_counter() - call_start)
+        if "ETag" in response.headers:
+            etags[url] = response.headers["ETag"]
+
+        if args.write_every and i % args.write_every == args.write_every - 1:
+            client.post("/api/inventory/products/1/adjust", headers=headers, json={"quantity_change": -1})
+    elapsed = time.perf_counter() - start
+
+    result = summarize(samples)
+    result["requests_per_sec"] = round(args.requests / elapsed, 1)
+    if cache_enabled:
+        result["cache"] = client.get("/health/cache").get_json()["responses"]
+    return result
+
+def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        return {
+            "uncached": run_mode(tmp, args, cache_enabled=False, conditional=False),
+            "cached": run_mode(tmp, args, cache_enabled=True, conditional=False),
+            "cached_conditional": run_mode(tmp, args, cache_enabled=True, conditional=True),
+        }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--write-every", type=int, default=100, help="Adjust stock every N reads (0 = never)")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args)
+    for name, stats in results.items():
+        cache = ""
+        if "cache" in stats:
+            # 304s are answered from table versions without looking up the cache
+            cache = f" hit_rate={stats['cache']['hit_rate']} not_modified={stats['cache']['not_modified']}"
+        print(f"{name:20} {stats['requests_per_sec']:>9} req/s p50={stats['p50_ms']:.3f}ms p99={stats['p99_ms']:.3f}ms{cache}")
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Latency of product search on a large catalog.
+
+Seeds N products (1M by default) into a file-backed SQLite database with
+names and descriptions drawn from a small vocabulary, spread over
+--categories categories, then times search_products() for several kinds
+of query: short and full word prefixes, two words, a word and a model
+number (few matches), a SKU prefix and a word within one category. Each
+kind runs --iterations different queries. A few of the word and number
+searches are also timed as LIKE '%term%' scans, which is what finding a
+product by name used to require.
+
+    python -m benchmarks.bench_search --products 1000000 --output search.json
+"""
+import argparse
+import random
+import tempfile
+import time
+from sqlalchemy import and_, insert, select
+from inventory_management.app import create_app
+from inventory_management.models.inventory import Category, Product
+from inventory_management.services.search_service import search_products
+from inventory_management.utils.database import get_db
+from benchmarks.common import summarize, write_results
+
+ADJECTIVES = ["heavy", "compact", "premium", "classic", "cordless", "stainless", "mini", "industrial",
+              "portable", "ergonomic", "deluxe", "rugged", "slim", "magnetic", "waterproof", "adjustable"]
+NOUNS = ["hammer", "wrench", "drill", "screwdriver", "pliers", "saw", "chisel", "clamp", "ladder", "bucket",
+         "hose", "rake", "shovel", "toolbox", "flashlight", "sander", "grinder", "level", "tape", "vise"]
+MATERIALS = ["steel", "aluminium", "oak", "plastic", "rubber", "brass", "carbon", "fiberglass"]
+
+def product_text(rng):
+    """Return a random (name, description)."""
+    name = f"{rng.choice(ADJECTIVES)} {rng.choice(MATERIALS)} {rng.choice(NOUNS)} {rng.randint(1, 999)}"
+    description = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} made of {rng.choice(MATERIALS)}"
+    return name.title(), description
+
+def seed_products(app, count, categories, rng, chunk=50_000):
+    with app.app_context():
+        db = get_db()
+        db.execute(insert(Category.__table__), [{"name": f"Category {i}"} for i in range(categories)])
+        for start in range(0, count, chunk):
+            rows = []
+            for i in range(start, min(start + chunk, count)):
+                name, description = product_text(rng)
+                rows.append({"sku": f"{rng.choice(NOUNS)[:3].upper()}-{i:07d}", "name": name, "description": description,
+                             "price": 1.0, "quantity": 100, "active": True, "category_id": i % categories + 1})
+            db.execute(insert(Product.__table__), rows)
+            db.commit()
+
+def queries(kind, count, categories, products, rng):
+    """Return count (query, category_id) pairs of one kind."""
+    words = ADJECTIVES + NOUNS
+    if kind == "prefix_2":
+        return [(rng.choice(words)[:2], None) for _ in range(count)]
+    if kind == "prefix_4":
+        return [(rng.choice(words)[:4], None) for _ in range(count)]
+    if kind == "word":
+        return [(rng.choice(words), None) for _ in range(count)]
+    if kind == "two_words":
+        return [(f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)[:4]}", None) for _ in range(count)]
+    if kind == "word_and_number":
+        return [(f"{rng.choice(NOUNS)} {rng.randint(1, 999)}", None) for _ in range(count)]
+    if kind == "sku_prefix":
+        return [(f"{rng.choice(NOUNS)[:3].upper()}-{rng.randint(0, products - 1):07d}"[:8], None) for _ in range(count)]
+    if kind == "word_in_category":
+        return [(rng.choice(NOUNS), rng.randint(1, categories)) for _ in range(count)]
+    raise ValueError(f"Unknown query kind: {kind}")
+
+KINDS = ("prefix_2", "prefix_4", "word", "two_words", "word_and_number", "sku_prefix", "word_in_category")
+
+def like_scan(db, query, limit, category_id=None):
+    """Every term as a substring of sku, name or description: a full table scan."""
+    conditions = [
+        (Product.sku.ilike(f"%{term}%")) | (Product.name.ilike(f"%{term}%")) | (Product.description.ilike(f"%{term}%"))
+        for term in query.split()
+    ]
+    if category_id is not None:
+        conditions.append(Product.category_id == category_id)
+    return db.scalars(select(Product).where(and_(*conditions)).limit(limit)).all()
+
+def time_queries(app, search, pairs, limit):
+    samples = []
+    with app.app_context():
+        db = get_db()
+        for query, category_id in pairs:
+            start = time.perf_counter()
+            search(db, query, limit, category_id)
+            samples.append(time.perf_counter() - start)
+            db.rollback()
+    return samples
+
+def run(args):
+    rng = random.Random(42)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app("production", {
+            "DATABASE_URI": f"sqlite:///{tmp}/search.db", "DB_AUTO_MIGRATE": True, "SQLITE_TUNED": True
+        })
+        start = time.perf_counter()
+        seed_products(app, args.products, args.categories, rng)
+        print(f"Seeded and indexed {args.products} products in {time.perf_counter() - start:.1f}s")
+
+        def search(db, query, limit, category_id):
+            return search_products(db, query, limit, category_id, args.candidates)
+
+        for kind in args.kinds:
+            pairs = queries(kind, args.iterations, args.categories, args.products, rng)
+            time_queries(app, search, pairs[:5], args.limit)
+            results[kind] = summarize(time_queries(app, search, pairs, args.limit))
+
+        like_pairs = queries("word_and_number", args.like_iterations, args.categories, args.products, rng)
+        results["like_scan"] = summarize(time_queries(app, like_scan, like_pairs, args.limit))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--categories", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=20, help="Results per search")
+    parser.add_argument("--candidates", type=int, default=250, help="SEARCH_MAX_CANDIDATES")
+    parser.add_argument("--iterations", type=int, default=200, help="Queries per kind")
+    parser.add_argument("--like-iterations", type=int, default=5, help="Queries timed as LIKE scans")
+    parser.add_argument("--kinds", nargs="+", choices=KINDS, default=list(KINDS))
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args)
+    for name, stats in results.items():
+        print(f"{name:18} p50={stats['p50_ms']:9.2f}ms p95={stats['p95_ms']:9.2f}ms p99={stats['p99_ms']:9.2f}ms n={stats['count']}")
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Mixed read/write concurrency on SQLite: default vs. tuned engine mode.
+
+Runs the same traffic against three fresh SQLite files: the default engine
+(rollback journal, pysqlite's implicit transactions), the tuned mode (WAL,
+busy_timeout, synchronous=NORMAL, mmap and cache size) and the tuned mode
+with the single writer that group-commits all writes. --threads workers
+each send --requests requests; --write-ratio of them are stock adjustments,
+the rest product reads and transaction history reads.
+
+Reports reads/sec, writes/sec, p95/p99 per kind and the number of failed
+requests (typically "database is locked" in the default mode).
+
+    python -m benchmarks.bench_sqlite_modes --threads 16 --requests 500 --write-ratio 0.2 --output sqlite.json
+"""
+import argparse
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from inventory_management.app import create_app
+from inventory_management.services.auth_service import generate_token
+from inventory_management.utils.database import get_pool_stats
+from benchmarks.bench_api_load import ClientTransport, scenario_request
+from benchmarks.common import run_metadata, summarize, write_results
+from benchmarks.seed import seed_dataset
+
+MODES = {
+    "default": {"SQLITE_TUNED": False, "SQLITE_SINGLE_WRITER": False},
+    "tuned": {"SQLITE_TUNED": True, "SQLITE_SINGLE_WRITER": False},
+    "tuned_single_writer": {"SQLITE_TUNED": True, "SQLITE_SINGLE_WRITER": True},
+}
+
+READ_SCENARIOS = ("product_get", "history")
+
+def run_mode(path, mode, args):
+    app = create_app("production", {
+        "DATABASE_URI": f"sqlite:///{path}",
+        "DB_AUTO_MIGRATE": True,
+        "DB_POOL_SIZE": args.threads,
+        "NOTIFICATION_ENABLED": False,
+        "RESPONSE_CACHE_ENABLED": False,
+        **MODES[mode]
+    })
+    dataset = seed_dataset(app, products=args.products, users=args.threads, transactions=args.transactions, rounds=4)
+    with app.app_context():
+        tokens = [generate_token(user_id) for user_id in range(1, dataset.users + 1)]
+
+    transport = ClientTransport(app)
+    samples = {"read": [], "write": []}
+    failures = {"read": 0, "write": 0}
+
+    def worker(worker_id):
+        rng = random.Random(worker_id)
+        local = {"read": [], "write": []}
+        failed = {"read": 0, "write": 0}
+        for i in range(args.requests):
+            kind = "write" if rng.random() < args.write_ratio else "read"
+            name = "adjust" if kind == "write" else rng.choice(READ_SCENARIOS)
+            method, url, body, headers = scenario_request(name, worker_id, rng, dataset, tokens)
+            start = time.perf_counter()
+            status = transport.send(method, url, body, headers)
+            local[kind].append(time.perf_counter() - start)
+            if status >= 400:
+                failed[kind] += 1
+        return local, failed
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as executor:
+        for local, failed in executor.map(worker, range(args.threads)):
+            for kind in samples:
+                samples[kind].extend(local[kind])
+                failures[kind] += failed[kind]
+    elapsed = time.perf_counter() - start
+
+    result = {"seconds": round(elapsed, 3)}
+    for kind in ("read", "write"):
+        stats = summarize(samples[kind])
+        stats["per_sec"] = round(len(samples[kind]) / elapsed, 1)
+        stats["failed"] = failures[kind]
+        result[kind] = stats
+
+    with app.app_context():
+        write_queue = get_pool_stats().get("write_queue")
+    if write_queue:
+        result["writes_per_commit"] = write_queue["writes_per_commit"]
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="Requests per thread")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in args.modes:
+            stats = results[mode] = run_mode(f"{tmp}/{mode}.db", mode, args)
+            read, write = stats["read"], stats["write"]
+            print(f"{mode:20} reads {read['per_sec']:>8}/s p99={read['p99_ms']:8.2f}ms failed={read['failed']:<5} "
+                  f"writes {write['per_sec']:>7}/s p99={write['p99_ms']:8.2f}ms failed={write['failed']}")
+
+    if args.output:
+        write_results(args.output, {"meta": run_metadata(args), **results})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Cold-start time of create_app, with a regression budget.
+
+Each run starts a fresh interpreter with -X importtime that imports
+inventory_management.app and calls create_app(--config). The child
+reports how long the import and create_app took, and which of the heavy,
+lazily imported modules (pandas, bcrypt, email_validator, email.mime, ...)
+ended up loaded anyway. The importtime lines on its stderr give the
+cumulative import time of every module, from which the slowest top-level
+imports are listed.
+
+Exits with status 1 if the median cold start (import plus create_app)
+exceeds --budget-ms, or if any heavy module was imported at startup, so
+it can run as a CI check. Budgets depend on the machine, and -X importtime
+itself adds to the time measured, so set one from a run of this benchmark
+on the CI hardware.
+
+    python -m benchmarks.bench_startup --runs 10 --budget-ms 1200 --output startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from benchmarks.common import run_metadata, write_results
+
+# Imported on first use; none of them should load when the app starts
+LAZY_MODULES = ("pandas", "numpy", "pyarrow", "bcrypt", "email_validator", "email.mime")
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from inventory_management.app import create_app
+imported = time.perf_counter()
+create_app({config!r})
+done = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - start) * 1000,
+    "create_app_ms": (done - imported) * 1000,
+    "modules": sorted(sys.modules),
+}}))
+"""
+
+def parse_importtime(stderr):
+    """
+    Parse -X importtime output into [(module, depth, self_ms, cumulative_ms)].
+
+    Lines look like "import time:  self [us] | cumulative | <indent>name",
+    with two spaces of indent per level of nesting.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            # The header line
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((name.strip(), depth, int(fields[0]) / 1000, int(fields[1]) / 1000))
+    return imports
+
+def cold_start(config):
+    """Run one fresh interpreter and return its timings, imports and lazily imported modules it loaded."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD.format(config=config)],
+        capture_output=True, text=True, check=True
+    )
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    modules = set(result.pop("modules"))
+    result["loaded_lazy_modules"] = [
+        name for name in LAZY_MODULES
+        if name in modules or any(m.startswith(f"{name}.") for m in modules)
+    ]
+    result["imports"] = parse_importtime(completed.stderr)
+    return result
+
+def app_imports(imports):
+    """The direct imports of inventory_management.app, which importtime lists just before it."""
+    children = []
+    for name, depth, _, cumulative in imports:
+        if depth == 0:
+            if name == "inventory_management.app":
+                return children
+            children = []
+        elif depth == 1:
+            children.append((name, cumulative))
+    return []
+
+def slowest_imports(runs, count):
+    """Median cumulative time of the slowest direct imports of the app module."""
+    times = {}
+    for run in runs:
+        for name, cumulative in app_imports(run["imports"]):
+            times.setdefault(name, []).append(cumulative)
+    medians = {name: round(statistics.median(samples), 1) for name, samples in times.items()}
+    return dict(sorted(medians.items(), key=lambda item: -item[1])[:count])
+
+def run(args):
+    runs = [cold_start(args.config) for _ in range(args.runs)]
+    totals = [run["import_ms"] + run["create_app_ms"] for run in runs]
+    return {
+        "runs": args.runs,
+        "cold_start_p50_ms": round(statistics.median(totals), 1),
+        "cold_start_max_ms": round(max(totals), 1),
+        "import_p50_ms": round(statistics.median(run["import_ms"] for run in runs), 1),
+        "create_app_p50_ms": round(statistics.median(run["create_app_ms"] for run in runs), 1),
+        "slowest_imports": slowest_imports(runs, args.top),
+        "loaded_lazy_modules": sorted({name for run in runs for name in run["loaded_lazy_modules"]}),
+        "budget_ms": args.budget_ms,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="Fresh interpreters to start")
+    parser.add_argument("--config", default="testing", help="create_app config name")
+    parser.add_argument("--budget-ms", type=float, default=1200, help="Fail if the median cold start exceeds this")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args)
+    print(f"cold start p50={results['cold_start_p50_ms']:.1f}ms max={results['cold_start_max_ms']:.1f}ms "
+          f"(import {results['import_p50_ms']:.1f}ms, create_app {results['create_app_p50_ms']:.1f}ms) "
+          f"budget={args.budget_ms:.0f}ms")
+    print("slowest imports by inventory_management.app (cumulative):")
+    for name, ms in results["slowest_imports"].items():
+        print(f"  {name:50} {ms:8.1f}ms")
+
+    if args.output:
+        write_results(args.output, {"meta": run_metadata(args), **results})
+
+    failures = []
+    if results["cold_start_p50_ms"] > args.budget_ms:
+        failures.append(f"cold start {results['cold_start_p50_ms']:.1f}ms is over the {args.budget_ms:.0f}ms budget")
+    if results["loaded_lazy_modules"]:
+        failures.append(f"imported at startup: {', '.join(results['loaded_lazy_modules'])}")
+    if failures:
+        sys.exit("FAIL: " + "; ".join(failures))
+
+if __name__ == "__main__":
+    main()
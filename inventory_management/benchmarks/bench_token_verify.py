@@ -0,0 +1,96 @@
+"""
+Tokens verified per second, and the auth cost of an authenticated request.
+
+Reports verifications/sec for jwt.decode with the raw secret (the previous
+verify_token), TokenVerifier on tokens it has not seen, and TokenVerifier
+on a working set of --tokens distinct tokens that fits its cache. It then
+times GET /api/auth/me-style authentication through the test client with
+a plain token (user cache) and with identity claims (no user lookup).
+
+    python -m benchmarks.bench_token_verify --verifications 200000 --output tokens.json
+"""
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+import jwt
+from inventory_management.app import create_app
+from inventory_management.models.user import User
+from inventory_management.services.auth_cache import identity_claims
+from inventory_management.services.auth_service import generate_token
+from inventory_management.services.tokens import TokenVerifier
+from inventory_management.utils.database import get_db
+from benchmarks.common import create_benchmark_user, summarize, time_calls, write_results
+
+SECRET = "benchmark-secret-key-of-reasonable-length"
+
+def make_tokens(count):
+    expiration = datetime.utcnow() + timedelta(hours=1)
+    return [jwt.encode({"user_id": i, "ver": 1, "exp": expiration}, SECRET, algorithm="HS256") for i in range(count)]
+
+def rate(func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return {"seconds": round(elapsed, 3), "verifications_per_sec": round(count / elapsed)}
+
+def verify_loop(verify, tokens, count):
+    size = len(tokens)
+    for i in range(count):
+        verify(tokens[i % size])
+
+def run_micro(count, working_set):
+    unique = make_tokens(count)
+    repeated = make_tokens(working_set)
+
+    cold = TokenVerifier(SECRET, maxsize=0)
+    warm = TokenVerifier(SECRET, maxsize=working_set)
+    verify_loop(warm.verify, repeated, working_set)
+
+    return {
+        "jwt_decode": rate(lambda: verify_loop(lambda t: jwt.decode(t, SECRET, algorithms=["HS256"]), unique, count), count),
+        "verifier_uncached": rate(lambda: verify_loop(cold.verify, unique, count), count),
+        "verifier_cached": rate(lambda: verify_loop(warm.verify, repeated, count), count),
+    }
+
+def run_requests(iterations):
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        app = create_app("development", {
+            "DATABASE_URI": f"sqlite:///{tmp}/tokens.db", "SECRET_KEY": SECRET, "RESPONSE_CACHE_ENABLED": False
+        })
+        user_id, plain = create_benchmark_user(app)
+        with app.app_context():
+            user = get_db().get(User, user_id)
+            with_claims = generate_token(user_id, user.auth_version, identity_claims(user.username, user.role_id, user.role.name))
+
+        client = app.test_client()
+        for name, token in (("request_user_cache", plain), ("request_identity_claims", with_claims)):
+            headers = {"Authorization": f"Bearer {token}"}
+            call = lambda: client.get("/api/inventory/categories", headers=headers)
+            time_calls(call, 100)
+            results[name] = summarize(time_calls(call, iterations))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--verifications", type=int, default=200_000)
+    parser.add_argument("--tokens", type=int, default=1000, help="Distinct tokens in the cached working set")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run_micro(args.verifications, args.tokens)
+    for name, stats in results.items():
+        print(f"{name:24} {stats['verifications_per_sec']:>12,} tokens/sec  ({stats['seconds']:.3f}s)")
+
+    requests = run_requests(args.requests)
+    for name, stats in requests.items():
+        print(f"{name:24} p50={stats['p50_ms']:.3f}ms p95={stats['p95_ms']:.3f}ms p99={stats['p99_ms']:.3f}ms")
+    results.update(requests)
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Throughput of SKU validation: single calls vs. batch validation.
+
+Generates N SKUs (1M by default, about 10% invalid in various ways) and
+reports calls/sec for the previous per-call implementation (uncompiled
+re calls and a new dict per call), validate_sku() in a loop, and
+validate_skus() on a list and on pandas Series of object and string dtype.
+
+    python -m benchmarks.bench_validators --skus 1000000 --output validators.json
+"""
+import argparse
+import random
+import re
+import time
+from inventory_management.utils.validators import validate_sku, validate_skus
+from benchmarks.common import write_results
+
+def legacy_validate_sku(sku):
+    """The per-call implementation validate_sku() replaced, kept for comparison."""
+    if len(sku) < 5 or len(sku) > 20:
+        return {"valid": False, "message": "SKU must be between 5 and 20 characters long"}
+    if not sku[0].isalpha():
+        return {"valid": False, "message": "SKU must start with a letter"}
+    if sku.endswith("-"):
+        return {"valid": False, "message": "SKU must not end with a hyphen"}
+    if not re.match(r"^[a-zA-Z0-9-]+$", sku):
+        return {"valid": False, "message": "SKU must contain only letters, numbers, and hyphens"}
+    return {"valid": True, "message": "SKU format is valid"}
+
+def generate_skus(count, seed=42):
+    rng = random.Random(seed)
+    invalid = ["AB1", "1ABC-DEF", "ABC-DEF-", "ABC_DEF", "ABCDEFGHIJKLMNOPQRSTUV"]
+    return [
+        rng.choice(invalid) if rng.random() < 0.1 else f"SKU-{rng.randrange(10**8):08d}"
+        for _ in range(count)
+    ]
+
+def rate(func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return {"seconds": round(elapsed, 3), "skus_per_sec": round(count / elapsed)}
+
+def run(count):
+    skus = generate_skus(count)
+    results = {
+        "legacy_single": rate(lambda: [legacy_validate_sku(s)["valid"] for s in skus], count),
+        "single": rate(lambda: [validate_sku(s)["valid"] for s in skus], count),
+        "batch_list": rate(lambda: validate_skus(skus), count),
+    }
+    try:
+        import pandas as pd
+    except ImportError:
+        return results
+
+    series = pd.Series(skus, dtype=object)
+    results["batch_series"] = rate(lambda: validate_skus(series), count)
+    strings = pd.Series(skus, dtype="string")
+    results["batch_series_string_dtype"] = rate(lambda: validate_skus(strings), count)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skus", type=int, default=1_000_000)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run(args.skus)
+    for name, stats in results.items():
+        print(f"{name:26} {stats['skus_per_sec']:>12,} SKUs/sec  ({stats['seconds']:.3f}s)")
+
+    if args.output:
+        write_results(args.output, results)
+
+if __name__ == "__main__":
+    main()
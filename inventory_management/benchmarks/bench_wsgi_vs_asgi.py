@@ -0,0 +1,203 @@
+"""
+Throughput under many concurrent connections: WSGI vs. ASGI app.
+
+Seeds one temporary SQLite database (tuned mode, see bench_sqlite_modes),
+then serves it in a child process with werkzeug's threaded WSGI server
+(create_app) and with uvicorn (create_asgi_app), one after the other.
+--concurrency asyncio clients, each on its own connection, send
+--requests requests drawn from the product_get, history, me and adjust
+scenarios (--write-ratio of them adjustments).
+
+The client speaks just enough HTTP/1.1 to keep connections alive (the
+werkzeug server closes them after every response, so WSGI clients
+reconnect), which keeps it cheap enough not to be the bottleneck at
+hundreds of connections. It still shares the machine with the server, so
+compare runs made on the same hardware.
+
+Reports requests/sec, p50/p95/p99 and non-2xx counts per server and
+concurrency level. Requires the "asgi" extra.
+
+    python -m benchmarks.bench_wsgi_vs_asgi --concurrency 10 100 500 --requests 5000 --output asgi.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from inventory_management.app import create_app
+from inventory_management.services.auth_service import generate_token
+from benchmarks.bench_api_load import scenario_request
+from benchmarks.common import ServerThread, run_metadata, summarize, write_results
+from benchmarks.seed import seed_dataset
+
+SERVERS = ("wsgi", "asgi")
+
+READ_SCENARIOS = ("product_get", "history", "me")
+
+SECRET = "benchmark-secret-key-of-reasonable-length"
+
+def app_config(path, pool_size):
+    return {
+        "DATABASE_URI": f"sqlite:///{path}",
+        "SECRET_KEY": SECRET,
+        "DB_POOL_SIZE": pool_size,
+        "NOTIFICATION_ENABLED": False,
+        "RESPONSE_CACHE_ENABLED": False,
+        "SQLITE_TUNED": True,
+        "SQLITE_SINGLE_WRITER": True,
+    }
+
+def serve(kind, path, port, pool_size):
+    """Child process: serve the database with the WSGI or the ASGI app until killed."""
+    if kind == "wsgi":
+        app = create_app("production", app_config(path, pool_size))
+        with ServerThread(app, port=port) as server:
+            server.thread.join()
+    else:
+        import uvicorn
+        from inventory_management.asgi import create_asgi_app
+
+        app = create_asgi_app("production", app_config(path, pool_size))
+        uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning", backlog=4096)
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def start_server(kind, path, pool_size):
+    port = free_port()
+    process = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.bench_wsgi_vs_asgi",
+        "--serve", kind, "--database", path, "--port", str(port), "--pool-size", str(pool_size)
+    ])
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1).read()
+            return process, port
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{kind} server did not start")
+
+class Connection:
+    """One keep-alive HTTP/1.1 connection; reconnects when the server closes it."""
+
+    def __init__(self, port):
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None, headers=None):
+        """Send a request and return the response status, or 599 if the connection failed."""
+        payload = json.dumps(body).encode() if body is not None else b""
+        lines = [f"{method} {path} HTTP/1.1", "Host: 127.0.0.1", f"Content-Length: {len(payload)}"]
+        if body is not None:
+            lines.append("Content-Type: application/json")
+        lines.extend(f"{name}: {value}" for name, value in (headers or {}).items())
+        try:
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection("127.0.0.1", self.port)
+            self.writer.write("\r\n".join(lines).encode() + b"\r\n\r\n" + payload)
+
+            head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").lower().split("\r\n")
+            fields = dict(line.split(": ", 1) for line in head[1:] if ": " in line)
+            await self.reader.readexactly(int(fields.get("content-length", 0)))
+            if fields.get("connection") == "close":
+                self.close()
+            return int(head[0].split()[1])
+        except (ConnectionError, asyncio.IncompleteReadError):
+            self.close()
+            return 599
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+async def drive(port, concurrency, requests, write_ratio, dataset, tokens):
+    """Open concurrency connections, warm them up, then time requests spread over them."""
+    samples = []
+    statuses = {}
+    connections = [Connection(port) for _ in range(concurrency)]
+    await asyncio.gather(*(connection.request("GET", "/health") for connection in connections))
+
+    async def worker(worker_id):
+        rng = random.Random(worker_id)
+        connection = connections[worker_id]
+        for i in range(worker_id, requests, concurrency):
+            name = "adjust" if rng.random() < write_ratio else rng.choice(READ_SCENARIOS)
+            method, path, body, headers = scenario_request(name, i, rng, dataset, tokens)
+            start = time.perf_counter()
+            status = await connection.request(method, path, body, headers)
+            samples.append(time.perf_counter() - start)
+            statuses[status] = statuses.get(status, 0) + 1
+        connection.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(worker_id) for worker_id in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    result = summarize(samples)
+    result["requests_per_sec"] = round(len(samples) / elapsed, 1)
+    result["errors"] = sum(count for status, count in statuses.items() if status >= 400)
+    result["statuses"] = {str(status): count for status, count in sorted(statuses.items())}
+    return result
+
+def run(args):
+    results = {kind: {} for kind in args.servers}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = f"{tmp}/asgi.db"
+        app = create_app("production", {**app_config(path, args.pool_size), "DB_AUTO_MIGRATE": True})
+        dataset = seed_dataset(app, products=args.products, users=args.users, transactions=args.transactions, rounds=4)
+        with app.app_context():
+            tokens = [generate_token(user_id) for user_id in range(1, dataset.users + 1)]
+        app.extensions["inventory_db"].engine.dispose()
+
+        for kind in args.servers:
+            process, port = start_server(kind, path, args.pool_size)
+            try:
+                for concurrency in args.concurrency:
+                    stats = results[kind][str(concurrency)] = asyncio.run(
+                        drive(port, concurrency, args.requests, args.write_ratio, dataset, tokens)
+                    )
+                    print(f"{kind:5} c={concurrency:<5} {stats['requests_per_sec']:>9} req/s  p50={stats['p50_ms']:8.2f}ms "
+                          f"p95={stats['p95_ms']:8.2f}ms p99={stats['p99_ms']:8.2f}ms errors={stats['errors']}")
+            finally:
+                process.terminate()
+                process.wait()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 500], help="Concurrent connections")
+    parser.add_argument("--requests", type=int, default=5000, help="Requests per server and concurrency level")
+    parser.add_argument("--write-ratio", type=float, default=0.1)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--transactions", type=int, default=100_000)
+    parser.add_argument("--pool-size", type=int, default=16, help="DB_POOL_SIZE of both servers")
+    parser.add_argument("--servers", nargs="+", choices=SERVERS, default=list(SERVERS))
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    # Used when the benchmark starts its own server processes
+    parser.add_argument("--serve", choices=SERVERS, help=argparse.SUPPRESS)
+    parser.add_argument("--database", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.database, args.port, args.pool_size)
+        return
+
+    results = run(args)
+    if args.output:
+        write_results(args.output, {"meta": run_metadata(args), **results})
+
+if __name__ == "__main__":
+    main()
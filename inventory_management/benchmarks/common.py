@@ -0,0 +1,90 @@
+import json
+import platform
+import statistics
+import subprocess
+import threading
+import time
+from datetime import datetime
+from werkzeug.serving import make_server
+from inventory_management.models.user import User
+from inventory_management.services.auth_service import generate_token
+from inventory_management.services.permissions import seed_roles_and_permissions
+from inventory_management.utils.database import get_db
+
+def percentile(samples, pct):
+    """Return the pct-th percentile of samples (nearest-rank)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+def summarize(samples):
+    """Summarize latency samples (seconds) in milliseconds."""
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+    }
+
+def time_calls(func, iterations):
+    """Call func repeatedly and return the per-call latencies in seconds."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def create_benchmark_user(app, username="bench", role_name="admin"):
+    """Create a user directly in the database and return (user_id, token)."""
+    with app.app_context():
+        db = get_db()
+        role = seed_roles_and_permissions(db)[role_name]
+
+        user = User(username=username, email=f"{username}@example.com", role_id=role.id)
+        user.password_hash = "!"
+        db.add(user)
+        db.commit()
+        return user.id, generate_token(user.id)
+
+def run_metadata(args):
+    """Describe a benchmark run (commit, time, arguments) for storing next to its results."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "args": vars(args),
+    }
+
+def write_results(path, results):
+    """Write benchmark results as JSON so runs can be compared across commits."""
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+
+class ServerThread:
+    """Serve a WSGI app with werkzeug's threaded server on a background thread."""
+
+    def __init__(self, app, host="127.0.0.1", port=0):
+        self.server = make_server(host, port, app, threaded=True)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        return f"http://{self.server.host}:{self.server.port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.thread.join()
@@ -0,0 +1,60 @@
+"""
+Compare two benchmark result files, e.g. from runs on two commits.
+
+Prints every numeric value present in both files with its relative
+change. Keys ending in _per_sec are better when higher, everything else
+(latencies, seconds, memory) when lower.
+
+    python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+
+def flatten(results, prefix=""):
+    """Yield (dotted key, value) for every numeric leaf, skipping run metadata."""
+    for key, value in results.items():
+        if key == "meta":
+            continue
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            yield from flatten(value, name)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            yield name, value
+
+def compare(before, after):
+    """Return (key, before, after, change %, better) rows for keys in both results."""
+    old = dict(flatten(before))
+    rows = []
+    for key, new_value in flatten(after):
+        if key not in old:
+            continue
+        old_value = old[key]
+        change = (new_value - old_value) / old_value * 100 if old_value else None
+        higher_is_better = key.endswith("_per_sec")
+        better = None if change is None or change == 0 else (change > 0) == higher_is_better
+        rows.append((key, old_value, new_value, change, better))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+
+    for label, results in (("before", before), ("after", after)):
+        meta = results.get("meta", {})
+        if meta:
+            print(f"{label}: commit {meta.get('commit')} at {meta.get('timestamp')}")
+
+    for key, old_value, new_value, change, better in compare(before, after):
+        marker = "" if better is None else (" +" if better else " -")
+        change_text = f"{change:+8.1f}%" if change is not None else "     n/a"
+        print(f"{key:55} {old_value:>12} -> {new_value:>12} {change_text}{marker}")
+
+if __name__ == "__main__":
+    main()
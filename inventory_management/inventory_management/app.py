@@ -4,11 +4,31 @@ import logging
 from flask import Flask
 from dotenv import load_dotenv
 
-from inventory_management.utils.database import init_db, close_db
+from inventory_management.utils.database import (
+    WriteTimeout,
+    close_db,
+    get_db,
+    get_engine,
+    get_pool_stats,
+    init_db,
+    init_engine,
+    write_timeout_response,
+)
+from inventory_management.utils.metrics import init_metrics
+from inventory_management.utils.passwords import init_password_hasher
 from inventory_management.models.inventory import Product, Category
 from inventory_management.models.user import User
+from inventory_management.services.auth_cache import init_user_cache, get_user_cache
 from inventory_management.services.auth_service import auth_bp
-from inventory_management.services.inventory_service import inventory_bp
+from inventory_management.services.permissions import init_role_permissions, seed_roles_and_permissions
+from inventory_management.services.inventory_service import inventory_bp, low_stock_query
+from inventory_management.services.ledger import init_ledger, get_ledger
+from inventory_management.services.importer import IMPORT_FORMATS, import_products
+from inventory_management.services.notification_service import init_notifications, send_inventory_report
+from inventory_management.services.response_cache import init_response_cache, get_response_cache
+from inventory_management.services.reporting import REPORT_FORMATS, build_inventory_report
+from inventory_management.services.snapshot_service import snapshot_cutoff, take_stock_snapshots
+from inventory_management.services.tokens import init_token_verifier, get_token_verifier
 
 # Configure logging
 logging.basicConfig(
@@ -17,7 +37,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def create_app(config_name=None):
+def create_app(config_name=None, config_overrides=None):
     """Create and configure the Flask application."""
     load_dotenv()
     
@@ -34,31 +54,161 @@ def create_app(config_name=None):
     elif config_name == "testing":
         app.config.from_object("inventory_management.config.TestingConfig")
     
+    if config_overrides:
+        app.config.update(config_overrides)
+    
+    # Build the engine and connection pool once per app
+    init_engine(app)
+    
+    # Schema setup runs once here or via `flask init-db`, never per request
+    if app.config.get("DB_AUTO_MIGRATE"):
+        init_db(app)
+    
     # Register database hooks
-    app.before_request(init_db)
     app.teardown_appcontext(close_db)
     
+    # Per-process caches of verified tokens, authenticated users and role permissions
+    init_token_verifier(app)
+    init_user_cache(app)
+    init_role_permissions(app)
+    
+    # Cache of catalog GET responses, invalidated by table writes
+    if app.config["RESPONSE_CACHE_ENABLED"]:
+        init_response_cache(app)
+    
+    # Bounded worker pool for bcrypt
+    init_password_hasher(app)
+    
+    # Background low stock notification dispatcher
+    init_notifications(app)
+    
+    # Optional group-committing writer for single stock adjustments
+    init_ledger(app)
+    
+    # Opt-in request metrics and slow request profiling
+    if app.config["METRICS_ENABLED"] or app.config["PROFILE_SLOW_REQUESTS"]:
+        init_metrics(app)
+    
     # Register blueprints
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(inventory_bp, url_prefix="/api/inventory")
     
+    @app.errorhandler(WriteTimeout)
+    def write_timed_out(e):
+        """Never answer 500 for a queued write that may still commit."""
+        logger.warning(f"Queued write timed out: {e}")
+        return write_timeout_response(e)
+    
     @app.route("/health")
     def health_check():
         """Health check endpoint."""
         return {"status": "healthy"}, 200
     
+    @app.route("/health/db")
+    def db_pool_stats():
+        """Connection pool statistics for sizing the pool per worker."""
+        stats = get_pool_stats()
+        ledger = get_ledger()
+        if ledger is not None:
+            stats["ledger"] = ledger.stats()
+        return stats, 200
+    
+    @app.route("/health/cache")
+    def cache_stats():
+        """Hit and miss counters of the in-process caches."""
+        stats = {"auth_tokens": get_token_verifier().stats(), "auth_users": get_user_cache().stats()}
+        response_cache = get_response_cache()
+        if response_cache is not None:
+            stats["responses"] = response_cache.stats()
+        return stats, 200
+    
     # CLI commands
     @app.cli.command("init-db")
     def init_db_command():
-        """Initialize the database with tables."""
-        init_db()
+        """Initialize the database and apply pending migrations."""
+        applied = init_db()
+        if applied:
+            click.echo(f"Applied migrations: {', '.join(str(v) for v in applied)}")
         click.echo("Initialized the database.")
     
     @app.cli.command("seed-db")
     def seed_db_command():
         """Seed the database with initial data."""
+        roles = seed_roles_and_permissions(get_db())
+        click.echo(f"Seeded roles: {', '.join(sorted(roles))}")
         click.echo("Seeded the database.")
     
+    @app.cli.command("import-products")
+    @click.argument("path", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--format", "fmt", type=click.Choice(IMPORT_FORMATS), default=None,
+                  help="File format (default: from the file extension).")
+    @click.option("--chunk-size", type=int, default=None, help="Rows per transaction (IMPORT_CHUNK_SIZE).")
+    @click.option("--workers", type=int, default=1, show_default=True, help="Processes that parse and validate rows.")
+    @click.option("--rejects", "rejects_path", default=None, help="Rejected rows file (default: PATH.rejects.jsonl).")
+    def import_products_command(path, fmt, chunk_size, workers, rejects_path):
+        """Import or update products from a CSV or JSONL file."""
+        rejects_path = rejects_path or f"{path}.rejects.jsonl"
+        try:
+            result = import_products(
+                get_db(),
+                path,
+                fmt=fmt,
+                chunk_size=chunk_size or app.config["IMPORT_CHUNK_SIZE"],
+                workers=workers,
+                rejects_path=rejects_path
+            )
+        except ValueError as e:
+            raise click.BadParameter(str(e), param_hint="--format")
+        
+        rate = result.rows / result.seconds if result.seconds else 0
+        click.echo(f"Imported {result.inserted + result.updated} products "
+                   f"({result.inserted} inserted, {result.updated} updated), {result.rejected} rejected")
+        click.echo(f"{result.rows} rows in {result.seconds:.2f}s ({rate:,.0f} rows/sec)")
+        if result.rejected:
+            click.echo(f"Rejected rows written to {rejects_path}")
+    
+    @app.cli.command("low-stock")
+    @click.option("--limit", default=100, show_default=True, help="Maximum number of products to list.")
+    @click.option("--category-id", type=int, default=None, help="Only list products in this category.")
+    def low_stock_command(limit, category_id):
+        """List active products at or below their low stock threshold."""
+        rows = low_stock_query(get_db(), limit, category_id=category_id)
+        for row in rows:
+            click.echo(f"{row.sku:20} {row.quantity:>8} / {row.low_stock_threshold:<8} {row.name}")
+        click.echo(f"{len(rows)} low stock products")
+    
+    @app.cli.command("snapshot-stock")
+    @click.option("--at", "taken_at", type=click.DateTime(), default=None,
+                  help="Snapshot time (UTC). Defaults to now minus SNAPSHOT_SETTLE_SECONDS.")
+    def snapshot_stock_command(taken_at):
+        """Snapshot the stock of products that changed since their last snapshot."""
+        if taken_at is None:
+            taken_at = snapshot_cutoff(app.config["SNAPSHOT_SETTLE_SECONDS"])
+        written = take_stock_snapshots(get_db(), taken_at, batch_size=app.config["SNAPSHOT_BATCH_SIZE"])
+        click.echo(f"Wrote {written} stock snapshots at {taken_at.isoformat()}")
+    
+    @app.cli.command("inventory-report")
+    @click.option("--output-dir", default="reports", show_default=True, help="Directory for the report files.")
+    @click.option("--format", "fmt", type=click.Choice(REPORT_FORMATS), default="csv", show_default=True)
+    @click.option("--period-days", type=int, default=None, help="Sales period for turnover (REPORT_PERIOD_DAYS).")
+    @click.option("--email", "recipient", default=None, help="Also email the report to this address.")
+    def inventory_report_command(output_dir, fmt, period_days, recipient):
+        """Write the inventory valuation, turnover and days-of-cover report."""
+        try:
+            report = build_inventory_report(
+                get_engine(),
+                output_dir,
+                fmt=fmt,
+                period_days=period_days or app.config["REPORT_PERIOD_DAYS"],
+                chunksize=app.config["REPORT_CHUNK_SIZE"]
+            )
+        except ImportError as e:
+            raise click.ClickException(str(e))
+        click.echo(f"Products: {report.summary['products']}, valuation: {report.summary['valuation']:.2f}")
+        click.echo(f"Wrote {', '.join(report.files)}")
+        if recipient and not send_inventory_report(recipient, report):
+            click.echo("The report was not emailed; see the log for details.")
+    
     return app
 
 if __name__ == "__main__":
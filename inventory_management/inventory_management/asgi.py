@@ -0,0 +1,560 @@
+"""
+ASGI entry point serving the /api/auth and /api/inventory routes.
+
+create_asgi_app() builds the regular Flask app for its configuration and
+per-app services (token verifier, user cache, role permissions, password
+hasher, notification dispatcher, SQLite write queue) and serves the same
+JSON API with Starlette on an SQLAlchemy AsyncEngine. Each request runs
+inside the Flask app context, so the shared service code sees the same
+config and extensions.
+
+Views either await the AsyncSession directly or run the existing query
+functions with AsyncSession.run_sync(), which drives them over the async
+driver without blocking the event loop. bcrypt runs on the password
+hasher's pool, email validation in a worker thread, and writes go through
+the SQLite write queue when there is one.
+
+    uvicorn --factory inventory_management.asgi:create_asgi_app
+
+Requires the "asgi" extra. The catalog response cache and /metrics are
+only served by the WSGI app.
+"""
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from functools import wraps
+from flask import current_app
+from sqlalchemy import select
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import selectinload
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+from inventory_management.app import create_app
+from inventory_management.models.inventory import Product
+from inventory_management.models.user import Role, User
+from inventory_management.services.auth_cache import get_user_cache, identity_claims
+from inventory_management.services.auth_service import (
+    add_user,
+    generate_token,
+    new_user,
+    record_login,
+    registration_error,
+    serialize_user,
+    verify_token,
+)
+from inventory_management.services.inventory_service import (
+    add_category,
+    add_product,
+    adjustment_applied,
+    adjustment_payload_error,
+    bulk_adjustment_payload_error,
+    bulk_adjustment_summary,
+    export_format,
+    export_product_row,
+    export_products_query,
+    export_transaction_row,
+    export_transactions_query,
+    list_categories,
+    low_stock_page,
+    parse_as_of,
+    product_page,
+    product_payload_error,
+    record_adjustment,
+    serialize_product,
+    serialize_stock,
+    transaction_page,
+)
+from inventory_management.services.ledger import get_ledger
+from inventory_management.services.notification_service import send_low_stock_notification
+from inventory_management.services.permissions import get_role_permissions
+from inventory_management.services.search_service import search_products
+from inventory_management.services.snapshot_service import stock_as_of
+from inventory_management.services.stock_service import (
+    InsufficientStockError,
+    ProductNotFoundError,
+    apply_stock_adjustments,
+)
+from inventory_management.utils.database import (
+    WriteTimeout,
+    get_database,
+    is_file_sqlite,
+    is_memory_sqlite,
+    sqlite_engine_events,
+    sqlite_pragmas,
+    wait_for_write,
+    write_timeout_response,
+)
+from inventory_management.utils.pagination import InvalidCursor, page_size
+from inventory_management.utils.passwords import PasswordHasherBusy, get_password_hasher
+from inventory_management.utils.streaming import EXPORT_FORMATS, aiter_json
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "async_db"
+
+# Async driver used when DATABASE_URI names a backend without a driver
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+
+class AsyncDatabase:
+    """Per-application AsyncEngine and AsyncSession factory."""
+
+    def __init__(self, engine, session_factory):
+        self.engine = engine
+        self.session_factory = session_factory
+
+def async_database_uri(config):
+    """ASYNC_DATABASE_URI, or DATABASE_URI with its backend's async driver."""
+    if config["ASYNC_DATABASE_URI"]:
+        return make_url(config["ASYNC_DATABASE_URI"])
+
+    url = make_url(config["DATABASE_URI"])
+    if "+" in url.drivername:
+        return url
+    return url.set(drivername=f"{url.drivername}+{ASYNC_DRIVERS[url.drivername]}")
+
+def init_async_engine(app):
+    """Create the app's AsyncEngine, sharing the sync session class so its session events still fire."""
+    url = async_database_uri(app.config)
+    options = {"pool_pre_ping": app.config.get("DB_POOL_PRE_PING", True)}
+    if not is_memory_sqlite(url):
+        options.update({
+            "pool_size": app.config.get("DB_POOL_SIZE", 5),
+            "max_overflow": app.config.get("DB_MAX_OVERFLOW", 10),
+            "pool_timeout": app.config.get("DB_POOL_TIMEOUT", 30),
+            "pool_recycle": app.config.get("DB_POOL_RECYCLE", -1),
+        })
+    engine = create_async_engine(url, **options)
+
+    if is_file_sqlite(url) and app.config.get("SQLITE_TUNED"):
+        sqlite_engine_events(engine.sync_engine, sqlite_pragmas(app.config))
+
+    session_factory = async_sessionmaker(
+        engine,
+        expire_on_commit=False,
+        sync_session_class=get_database(app).session_factory.class_
+    )
+    database = AsyncDatabase(engine, session_factory)
+    app.extensions[EXTENSION_KEY] = database
+    return database
+
+def get_async_database():
+    """Get the AsyncDatabase of the current app."""
+    return current_app.extensions[EXTENSION_KEY]
+
+async def wait_for_write_async(future, timeout, reference=None):
+    """wait_for_write() for async views: await a queued write without blocking the event loop."""
+    await asyncio.wait([asyncio.wrap_future(future)], timeout=timeout)
+    return wait_for_write(future, 0, reference)
+
+async def run_write_async(session, func):
+    """run_write() for async views: func(sync session) on the write queue if any, else on session."""
+    write_queue = get_database().write_queue
+    if write_queue is not None:
+        return await wait_for_write_async(write_queue.submit(func), write_queue.timeout)
+
+    try:
+        result = await session.run_sync(func)
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+    return result
+
+def error(message, status):
+    return JSONResponse({"error": message}, status_code=status)
+
+async def read_json(request):
+    """Return the request's JSON object, or None if the body is not a JSON object."""
+    try:
+        data = await request.json()
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+def int_arg(params, name):
+    """Like Flask's args.get(name, type=int): None when missing or not an integer."""
+    try:
+        return int(params[name]) if name in params else None
+    except ValueError:
+        return None
+
+async def authenticate(request, session, permission=None):
+    """Set request.state.user from the bearer token; return an error response or None."""
+    auth_header = request.headers.get("Authorization")
+    if not auth_header or not auth_header.startswith("Bearer "):
+        return error("Authorization header is missing or invalid", 401)
+
+    claims = verify_token(auth_header.split(" ")[1])
+    if not claims:
+        return error("Invalid or expired token", 401)
+
+    user_cache = get_user_cache()
+
+    def load_identity(db):
+        user = user_cache.from_claims(db, claims)
+        if user is None:
+            user = user_cache.get(db, claims["user_id"], claims.get("ver", 1))
+        allowed = bool(user) and (permission is None or permission in get_role_permissions(user.role_id, db))
+        return user, allowed
+
+    user, allowed = await session.run_sync(load_identity)
+    if not user or not user.active:
+        return error("User not found or inactive", 401)
+
+    request.state.user = user
+    if not allowed:
+        logger.warning(f"Permission denied: {user.username} lacks {permission}")
+        return error(f"Permission required: {permission}", 403)
+    return None
+
+def view(auth=True, permission=None):
+    """Wrap an async view(request, session): open a session and authenticate unless auth is False."""
+    def decorator(func):
+        @wraps(func)
+        async def wrapped(request):
+            async with get_async_database().session_factory() as session:
+                if auth:
+                    response = await authenticate(request, session, permission)
+                    if response is not None:
+                        return response
+                return await func(request, session)
+        return wrapped
+    return decorator
+
+# /api/auth
+
+@view(auth=False)
+async def register(request, session):
+    """Register a new user."""
+    data = await read_json(request)
+    if data is None:
+        return error("Request body must be a JSON object", 400)
+
+    # Email validation may resolve the domain, so keep it off the loop
+    message = await asyncio.to_thread(registration_error, data)
+    if message:
+        return error(message, 400)
+
+    user = new_user(data)
+    user.password_hash = await get_password_hasher().hash_password_async(data["password"])
+
+    try:
+        user_id = await run_write_async(session, lambda db: add_user(db, user))
+    except IntegrityError:
+        logger.warning(f"Registration failed: Username or email already exists - {data['username']}")
+        return error("Username or email already exists", 409)
+
+    logger.info(f"User registered: {data['username']}")
+    return JSONResponse({"message": "User registered successfully", "user_id": user_id}, status_code=201)
+
+@view(auth=False)
+async def login(request, session):
+    """Authenticate user and return JWT token."""
+    data = await read_json(request)
+    if data is None or "username" not in data or "password" not in data:
+        return error("Username and password are required", 400)
+
+    user = (await session.execute(
+        select(User.id, User.username, User.password_hash, User.active, User.auth_version, User.role_id, Role.name.label("role_name"))
+        .outerjoin(Role, User.role_id == Role.id)
+        .where(User.username == data["username"])
+    )).first()
+
+    hasher = get_password_hasher()
+    if user is None or not await hasher.check_password_async(data["password"], user.password_hash):
+        logger.warning(f"Login failed: Invalid username or password - {data['username']}")
+        return error("Invalid username or password", 401)
+
+    if not user.active:
+        logger.warning(f"Login failed: Account is inactive - {data['username']}")
+        return error("Account is inactive", 403)
+
+    identity = None
+    if current_app.config["JWT_IDENTITY_CLAIMS"]:
+        identity = identity_claims(user.username, user.role_id, user.role_name)
+    token = generate_token(user.id, user.auth_version, identity)
+
+    # Record the login, upgrading a hash made with another work factor
+    rehashed = None
+    if hasher.needs_rehash(user.password_hash):
+        rehashed = await hasher.hash_password_async(data["password"])
+    await run_write_async(session, lambda db: record_login(db, user.id, rehashed))
+
+    logger.info(f"User logged in: {user.username}")
+    return JSONResponse({"token": token, "user_id": user.id})
+
+@view()
+async def get_current_user(request, session):
+    """Get the current authenticated user."""
+    user = await session.get(User, request.state.user.id, options=[selectinload(User.role)])
+    if user is None:
+        # Deleted after its still-valid token was issued
+        return error("User not found or inactive", 401)
+    return JSONResponse(serialize_user(user))
+
+# /api/inventory
+
+@view()
+async def get_categories(request, session):
+    """Get all product categories."""
+    return JSONResponse(await session.run_sync(list_categories))
+
+@view(permission="manage_products")
+async def create_category(request, session):
+    """Create a new product category."""
+    data = await read_json(request)
+    if data is None or "name" not in data:
+        return error("Missing required field: name", 400)
+
+    try:
+        category = await run_write_async(session, lambda db: add_category(db, data))
+    except IntegrityError:
+        return error("Category already exists", 409)
+
+    logger.info(f"Category created: {category['name']}")
+    return JSONResponse(category, status_code=201)
+
+@view()
+async def get_products(request, session):
+    """Get a page of products ordered by id (keyset pagination)."""
+    params = request.query_params
+    try:
+        page = await session.run_sync(
+            product_page, page_size(params), int_arg(params, "category_id"), params.get("cursor")
+        )
+    except InvalidCursor:
+        return error("Invalid cursor", 400)
+    return JSONResponse(page)
+
+@view()
+async def get_low_stock_products(request, session):
+    """Get a page of active products at or below their low stock threshold."""
+    params = request.query_params
+    try:
+        page = await session.run_sync(
+            low_stock_page, page_size(params), int_arg(params, "category_id"), params.get("cursor")
+        )
+    except InvalidCursor:
+        return error("Invalid cursor", 400)
+    return JSONResponse(page)
+
+@view()
+async def search(request, session):
+    """Search products by SKU prefix and words of their name and description."""
+    params = request.query_params
+    query = params.get("q", "")
+    if not query.strip():
+        return error("Missing required parameter: q", 400)
+
+    products = await session.run_sync(
+        search_products, query, page_size(params), int_arg(params, "category_id"),
+        current_app.config["SEARCH_MAX_CANDIDATES"]
+    )
+    return JSONResponse({"items": [serialize_product(p) for p in products]})
+
+@view()
+async def get_product(request, session):
+    """Get a single product."""
+    product = await session.get(Product, request.path_params["product_id"])
+    if product is None:
+        return error("Product not found", 404)
+    return JSONResponse(serialize_product(product))
+
+@view(permission="manage_products")
+async def create_product(request, session):
+    """Create a new product."""
+    data = await read_json(request)
+    if data is None:
+        return error("Request body must be a JSON object", 400)
+
+    message = product_payload_error(data)
+    if message:
+        return error(message, 400)
+
+    try:
+        product = await run_write_async(session, lambda db: add_product(db, data))
+    except IntegrityError:
+        logger.warning(f"Product creation failed: SKU already exists - {data['sku']}")
+        return error("SKU already exists", 409)
+
+    logger.info(f"Product created: {product['name']} ({product['sku']})")
+    return JSONResponse(product, status_code=201)
+
+@view(permission="adjust_stock")
+async def adjust_stock(request, session):
+    """Adjust the stock level of a product."""
+    data = await read_json(request)
+    if data is None:
+        return error("Request body must be a JSON object", 400)
+
+    message = adjustment_payload_error(data)
+    if message:
+        return error(message, 400)
+
+    product_id = request.path_params["product_id"]
+    user_id = request.state.user.id
+    ledger = get_ledger()
+    try:
+        if ledger is not None:
+            reference = data.get("reference", "")
+            future = ledger.submit(product_id, data["quantity_change"], reference, data.get("notes", ""), user_id)
+            product = await wait_for_write_async(future, ledger.timeout, reference or None)
+        else:
+            product = await run_write_async(session, lambda db: record_adjustment(db, product_id, data, user_id))
+    except ProductNotFoundError:
+        return error("Product not found", 404)
+    except InsufficientStockError:
+        return error("Insufficient stock", 400)
+
+    return JSONResponse(adjustment_applied(product, data["quantity_change"]))
+
+@view(permission="adjust_stock")
+async def bulk_adjust_stock(request, session):
+    """Apply many stock adjustments, identified by SKU, in one transaction."""
+    data = await read_json(request)
+    problem = bulk_adjustment_payload_error(data)
+    if problem:
+        return error(*problem)
+
+    user_id = request.state.user.id
+    results, crossed = await run_write_async(
+        session, lambda db: apply_stock_adjustments(db, data["adjustments"], user_id=user_id)
+    )
+
+    # Notify for products that crossed their low stock threshold
+    if crossed and current_app.config["NOTIFICATION_ENABLED"]:
+        for product in (await session.scalars(select(Product).where(Product.id.in_(crossed)))).all():
+            send_low_stock_notification(product)
+
+    return JSONResponse(bulk_adjustment_summary(results))
+
+def stream_export(stmt, serialize, fmt, filename):
+    """Stream a Core select as JSON on a session of its own, which lives as long as the response."""
+    database = get_async_database()
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+
+    async def generate():
+        async with database.session_factory() as session:
+            result = await session.stream(stmt.execution_options(yield_per=batch_size))
+            async for chunk in aiter_json(result.partitions(), serialize, fmt):
+                yield chunk
+
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{fmt}"'}
+    return StreamingResponse(generate(), media_type=EXPORT_FORMATS[fmt], headers=headers)
+
+@view()
+async def export_products(request, session):
+    """Stream every product as JSON Lines (default) or a JSON array."""
+    fmt = export_format(request.query_params)
+    if fmt is None:
+        return error("format must be one of: " + ", ".join(EXPORT_FORMATS), 400)
+    return stream_export(export_products_query(), export_product_row, fmt, "products")
+
+@view()
+async def export_transactions(request, session):
+    """Stream inventory transactions (optionally for one product) as JSON Lines or a JSON array."""
+    fmt = export_format(request.query_params)
+    if fmt is None:
+        return error("format must be one of: " + ", ".join(EXPORT_FORMATS), 400)
+    stmt = export_transactions_query(int_arg(request.query_params, "product_id"))
+    return stream_export(stmt, export_transaction_row, fmt, "transactions")
+
+@view()
+async def get_product_transactions(request, session):
+    """Get a page of transaction history for a product."""
+    params = request.query_params
+    try:
+        page = await session.run_sync(
+            transaction_page, request.path_params["product_id"], page_size(params), params.get("cursor")
+        )
+    except ProductNotFoundError:
+        return error("Product not found", 404)
+    except InvalidCursor:
+        return error("Invalid cursor", 400)
+    return JSONResponse(page)
+
+@view()
+async def get_product_stock(request, session):
+    """Get the quantity of a product now or at a past time (?as_of=ISO 8601, UTC)."""
+    try:
+        as_of = parse_as_of(request.query_params.get("as_of"))
+    except ValueError:
+        return error("as_of must be an ISO 8601 timestamp", 400)
+
+    try:
+        stock = await session.run_sync(stock_as_of, request.path_params["product_id"], as_of)
+    except ProductNotFoundError:
+        return error("Product not found", 404)
+    return JSONResponse(serialize_stock(stock))
+
+async def health_check(request):
+    """Health check endpoint."""
+    return JSONResponse({"status": "healthy"})
+
+async def password_hasher_busy(request, exc):
+    """Shed login/registration load instead of queueing behind bcrypt."""
+    logger.warning(f"Password hashing unavailable: {exc}")
+    return JSONResponse({"error": "Server busy, please retry"}, status_code=503, headers={"Retry-After": "1"})
+
+async def write_timed_out(request, exc):
+    """Never answer 500 for a queued write that may still commit."""
+    logger.warning(f"Queued write timed out: {exc}")
+    body, status, headers = write_timeout_response(exc)
+    return JSONResponse(body, status_code=status, headers=headers)
+
+ROUTES = [
+    Route("/health", health_check),
+    Route("/api/auth/register", register, methods=["POST"]),
+    Route("/api/auth/login", login, methods=["POST"]),
+    Route("/api/auth/me", get_current_user, methods=["GET"]),
+    Route("/api/inventory/categories", get_categories, methods=["GET"]),
+    Route("/api/inventory/categories", create_category, methods=["POST"]),
+    Route("/api/inventory/products", get_products, methods=["GET"]),
+    Route("/api/inventory/products", create_product, methods=["POST"]),
+    Route("/api/inventory/low-stock", get_low_stock_products, methods=["GET"]),
+    Route("/api/inventory/products/search", search, methods=["GET"]),
+    Route("/api/inventory/products/{product_id:int}", get_product, methods=["GET"]),
+    Route("/api/inventory/products/{product_id:int}/adjust", adjust_stock, methods=["POST"]),
+    Route("/api/inventory/stock/bulk-adjust", bulk_adjust_stock, methods=["POST"]),
+    Route("/api/inventory/export/products", export_products, methods=["GET"]),
+    Route("/api/inventory/export/transactions", export_transactions, methods=["GET"]),
+    Route("/api/inventory/products/{product_id:int}/transactions", get_product_transactions, methods=["GET"]),
+    Route("/api/inventory/products/{product_id:int}/stock", get_product_stock, methods=["GET"]),
+]
+
+class FlaskContextMiddleware:
+    """Run each ASGI request inside the Flask app's application context."""
+
+    def __init__(self, app, flask_app):
+        self.app = app
+        self.flask_app = flask_app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            return await self.app(scope, receive, send)
+        with self.flask_app.app_context():
+            await self.app(scope, receive, send)
+
+def create_asgi_app(config_name=None, config_overrides=None):
+    """Create the ASGI application for the same configuration as create_app()."""
+    flask_app = create_app(config_name, config_overrides)
+    database = init_async_engine(flask_app)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        yield
+        await database.engine.dispose()
+
+    app = Starlette(
+        routes=ROUTES,
+        middleware=[Middleware(FlaskContextMiddleware, flask_app=flask_app)],
+        exception_handlers={PasswordHasherBusy: password_hasher_busy, WriteTimeout: write_timed_out},
+        lifespan=lifespan
+    )
+    app.state.flask_app = flask_app
+    return app
@@ -5,19 +5,115 @@ class Config:
     """Base configuration."""
     SECRET_KEY = os.environ.get("SECRET_KEY", "dev-key-not-secure")
     DATABASE_URI = os.environ.get("DATABASE_URI", "sqlite:///inventory.db")
+    ASYNC_DATABASE_URI = os.environ.get("ASYNC_DATABASE_URI")
     JWT_EXPIRATION = timedelta(hours=1)
+    
+    # Per-process cache of authenticated users (TTL bounds staleness across workers)
+    AUTH_CACHE_SIZE = int(os.environ.get("AUTH_CACHE_SIZE", 10000))
+    AUTH_CACHE_TTL = int(os.environ.get("AUTH_CACHE_TTL", 60))
+    ROLE_PERMISSION_TTL = int(os.environ.get("ROLE_PERMISSION_TTL", 300))
+    
+    # Verified token claims are cached until the token expires. With
+    # JWT_IDENTITY_CLAIMS, tokens carry the user's name and role so requests
+    # skip the user lookup; revocations by other processes are picked up
+    # every AUTH_REVOCATION_REFRESH seconds
+    TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", 10000))
+    JWT_IDENTITY_CLAIMS = os.environ.get("JWT_IDENTITY_CLAIMS", "true").lower() == "true"
+    AUTH_REVOCATION_REFRESH = int(os.environ.get("AUTH_REVOCATION_REFRESH", 5))
+    
+    # bcrypt work factor and the bounded pool that runs it
+    BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASHER_WORKERS = int(os.environ.get("PASSWORD_HASHER_WORKERS", 2))
+    PASSWORD_HASHER_MAX_PENDING = int(os.environ.get("PASSWORD_HASHER_MAX_PENDING", 16))
+    PASSWORD_HASHER_TIMEOUT = float(os.environ.get("PASSWORD_HASHER_TIMEOUT", 5.0))
     ITEMS_PER_PAGE = 20
+    MAX_ITEMS_PER_PAGE = 500
+    EXPORT_BATCH_SIZE = int(os.environ.get("EXPORT_BATCH_SIZE", 1000))
+    SEARCH_MAX_CANDIDATES = int(os.environ.get("SEARCH_MAX_CANDIDATES", 250))
+    BULK_ADJUST_MAX_RECORDS = int(os.environ.get("BULK_ADJUST_MAX_RECORDS", 10000))
     NOTIFICATION_ENABLED = False
+    
+    # Stock snapshots only cover transactions older than this, so that
+    # writes still in flight when a snapshot is taken are not skipped
+    SNAPSHOT_SETTLE_SECONDS = int(os.environ.get("SNAPSHOT_SETTLE_SECONDS", 60))
+    SNAPSHOT_BATCH_SIZE = int(os.environ.get("SNAPSHOT_BATCH_SIZE", 1000))
+    
+    # Per-process cache of catalog GET responses. Writes only invalidate the
+    # process that made them, so with several workers others serve stale
+    # responses for up to RESPONSE_CACHE_TTL seconds; off unless opted in
+    RESPONSE_CACHE_ENABLED = os.environ.get("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+    RESPONSE_CACHE_SIZE = int(os.environ.get("RESPONSE_CACHE_SIZE", 1024))
+    RESPONSE_CACHE_TTL = int(os.environ.get("RESPONSE_CACHE_TTL", 30))
+    
+    # Single stock adjustments queued and group-committed by a ledger writer
+    # thread: up to LEDGER_BATCH_SIZE per commit, waiting at most
+    # LEDGER_FLUSH_INTERVAL seconds for a batch to fill. "sync" durability
+    # acknowledges after the commit, "async" before it (see services/ledger.py)
+    LEDGER_ENABLED = os.environ.get("LEDGER_ENABLED", "false").lower() == "true"
+    LEDGER_BATCH_SIZE = int(os.environ.get("LEDGER_BATCH_SIZE", 1000))
+    LEDGER_FLUSH_INTERVAL = float(os.environ.get("LEDGER_FLUSH_INTERVAL", 0.002))
+    LEDGER_DURABILITY = os.environ.get("LEDGER_DURABILITY", "sync").lower()
+    
+    # Rows per transaction for `flask import-products`
+    IMPORT_CHUNK_SIZE = int(os.environ.get("IMPORT_CHUNK_SIZE", 1000))
+    
+    # Inventory reports (rows read per pandas chunk, sales period for turnover)
+    REPORT_CHUNK_SIZE = int(os.environ.get("REPORT_CHUNK_SIZE", 100000))
+    REPORT_PERIOD_DAYS = int(os.environ.get("REPORT_PERIOD_DAYS", 30))
+    
+    # Low stock notifications (sent from a background dispatcher)
+    SMTP_HOST = os.environ.get("SMTP_HOST", "smtp.example.com")
+    SMTP_PORT = int(os.environ.get("SMTP_PORT", 587))
+    SMTP_USERNAME = os.environ.get("SMTP_USERNAME", "inventory@example.com")
+    SMTP_PASSWORD = os.environ.get("SMTP_PASSWORD", "")
+    SMTP_USE_TLS = os.environ.get("SMTP_USE_TLS", "true").lower() == "true"
+    NOTIFICATION_SENDER = os.environ.get("NOTIFICATION_SENDER", "inventory@example.com")
+    NOTIFICATION_RECIPIENTS = os.environ.get("NOTIFICATION_RECIPIENTS", "manager@example.com").split(",")
+    NOTIFICATION_DEDUP_WINDOW = int(os.environ.get("NOTIFICATION_DEDUP_WINDOW", 900))
+    NOTIFICATION_BATCH_SIZE = int(os.environ.get("NOTIFICATION_BATCH_SIZE", 20))
+    NOTIFICATION_BATCH_INTERVAL = float(os.environ.get("NOTIFICATION_BATCH_INTERVAL", 5.0))
+    
+    # Connection pool (one engine per app; ignored for in-memory SQLite)
+    DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.environ.get("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = int(os.environ.get("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.environ.get("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true"
+    
+    # SQLite files only: WAL journaling and tuned pragmas on every connection,
+    # and optionally one writer thread that group-commits all request writes
+    SQLITE_TUNED = os.environ.get("SQLITE_TUNED", "false").lower() == "true"
+    SQLITE_SINGLE_WRITER = os.environ.get("SQLITE_SINGLE_WRITER", "false").lower() == "true"
+    SQLITE_WRITE_BATCH = int(os.environ.get("SQLITE_WRITE_BATCH", 100))
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get("SQLITE_BUSY_TIMEOUT", 5000))
+    SQLITE_CACHE_SIZE_KB = int(os.environ.get("SQLITE_CACHE_SIZE_KB", 65536))
+    SQLITE_MMAP_SIZE = int(os.environ.get("SQLITE_MMAP_SIZE", 268435456))
+    
+    # Opt-in instrumentation: /metrics in Prometheus format, and folded
+    # stacks of requests slower than PROFILE_SLOW_THRESHOLD seconds
+    METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "false").lower() == "true"
+    PROFILE_SLOW_REQUESTS = os.environ.get("PROFILE_SLOW_REQUESTS", "false").lower() == "true"
+    PROFILE_SLOW_THRESHOLD = float(os.environ.get("PROFILE_SLOW_THRESHOLD", 0.5))
+    PROFILE_SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_INTERVAL", 0.005))
+    PROFILE_DIR = os.environ.get("PROFILE_DIR", "profiles")
+    
+    # Run pending schema migrations in create_app (otherwise use `flask init-db`)
+    DB_AUTO_MIGRATE = os.environ.get("DB_AUTO_MIGRATE", "false").lower() == "true"
 
 class DevelopmentConfig(Config):
     """Development configuration."""
     DEBUG = True
     TESTING = False
+    DB_AUTO_MIGRATE = True
+    BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", 10))
 
 class TestingConfig(Config):
     """Testing configuration."""
     DEBUG = True
     TESTING = True
+    DB_AUTO_MIGRATE = True
+    BCRYPT_ROUNDS = 4
+    SNAPSHOT_SETTLE_SECONDS = 0
     DATABASE_URI = "sqlite:///:memory:"
 
 class ProductionConfig(Config):
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Boolean, Text, Index, and_
 from sqlalchemy.orm import relationship
 from inventory_management.utils.database import Base
 
@@ -39,12 +39,36 @@ class Product(Base):
     category = relationship("Category", back_populates="products")
     transactions = relationship("InventoryTransaction", back_populates="product")
     
+    __table_args__ = (
+        # Keyset pagination of products within a category
+        Index("ix_products_category_id_id", "category_id", "id"),
+        # SKU prefix search within a category
+        Index("ix_products_category_id_sku", "category_id", "sku"),
+    )
+    
     def __repr__(self):
         return f"<Product {self.name} ({self.sku})>"
     
+    @classmethod
+    def low_stock_condition(cls):
+        """SQL condition for active products at or below their low stock threshold."""
+        return and_(cls.quantity <= cls.low_stock_threshold, cls.active == True)  # noqa: E712
+    
     def is_low_stock(self):
-        """Check if product is below the low stock threshold."""
-        return self.quantity <= 0
+        """Check if product is at or below the low stock threshold."""
+        if self.low_stock_threshold is None:
+            return False
+        return self.quantity <= self.low_stock_threshold
+
+# Partial index holding only low stock products. The database maintains it
+# incrementally on every quantity/threshold change, so listing low stock
+# products costs O(low stock products) instead of a full table scan.
+Index(
+    "ix_products_low_stock",
+    Product.id,
+    sqlite_where=Product.low_stock_condition(),
+    postgresql_where=Product.low_stock_condition(),
+)
 
 class InventoryTransaction(Base):
     """Model for inventory transactions (additions, removals, etc.)."""
@@ -63,5 +87,28 @@ class InventoryTransaction(Base):
     product = relationship("Product", back_populates="transactions")
     user = relationship("User", back_populates="inventory_transactions")
     
+    __table_args__ = (
+        # Keyset pagination of a product's history, newest first
+        Index("ix_inventory_transactions_product_id_timestamp_id", "product_id", "timestamp", "id"),
+    )
+    
     def __repr__(self):
         return f"<InventoryTransaction {self.id}: {self.quantity_change} units>"
+
+class StockSnapshot(Base):
+    """Quantity of a product at a checkpoint, so stock history need not be replayed from the start."""
+    __tablename__ = "stock_snapshots"
+    
+    id = Column(Integer, primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    taken_at = Column(DateTime, nullable=False)  # Includes every transaction with timestamp <= taken_at
+    quantity = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # Nearest snapshot before or after a point in time
+        Index("ix_stock_snapshots_product_id_taken_at", "product_id", "taken_at", unique=True),
+    )
+    
+    def __repr__(self):
+        return f"<StockSnapshot {self.product_id} @ {self.taken_at}: {self.quantity}>"
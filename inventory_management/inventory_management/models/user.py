@@ -1,8 +1,8 @@
 from datetime import datetime
-import bcrypt
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Text, Index, event, inspect
+from sqlalchemy.orm import relationship, object_session
 from inventory_management.utils.database import Base
+from inventory_management.utils.passwords import get_password_hasher
 
 class User(Base):
     """User model for authentication and authorization."""
@@ -16,6 +16,7 @@ class User(Base):
     last_name = Column(String(50), nullable=True)
     role_id = Column(Integer, ForeignKey("roles.id"), nullable=False)
     active = Column(Boolean, default=True)
+    auth_version = Column(Integer, nullable=False, default=1)  # Bumped to revoke cached identities and tokens
     last_login = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -24,20 +25,51 @@ class User(Base):
     role = relationship("Role", back_populates="users")
     inventory_transactions = relationship("InventoryTransaction", back_populates="user")
     
+    __table_args__ = (
+        # Revocation refreshes reload the users updated since the last one
+        Index("ix_users_updated_at", "updated_at"),
+    )
+    
     def __repr__(self):
         return f"<User {self.username}>"
     
     def set_password(self, password):
         """Hash and set the user password."""
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = get_password_hasher().hash_password(password)
     
     def check_password(self, password):
-        """Verify the password against the stored hash."""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        """Verify the password against the stored hash.
+        
+        A hash made with a different work factor than the configured one is
+        transparently replaced after a successful check; the caller commits.
+        """
+        hasher = get_password_hasher()
+        if not hasher.check_password(password, self.password_hash):
+            return False
+        
+        if hasher.needs_rehash(self.password_hash):
+            self.password_hash = hasher.hash_password(password)
+        return True
     
     def has_permission(self, permission_name):
         """Check if user has a specific permission."""
-        return any(perm.name == permission_name for perm in self.role.permissions)
+        from inventory_management.services.permissions import get_role_permissions
+        
+        return permission_name in get_role_permissions(self.role_id, object_session(self))
+
+@event.listens_for(User, "before_update")
+def bump_auth_version(mapper, connection, target):
+    """Bump auth_version when a user is (de)activated or changes role."""
+    state = inspect(target)
+    if not any(state.attrs[name].history.has_changes() for name in ("active", "role_id", "role")):
+        return
+    
+    # Remember the superseded version so caches can drop it after commit
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("revoked_auth_versions", set()).add((target.id, target.auth_version))
+    
+    target.auth_version = (target.auth_version or 0) + 1
         
 class Role(Base):
     """Role model for user permissions."""
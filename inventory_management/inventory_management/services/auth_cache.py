@@ -0,0 +1,212 @@
+import logging
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import event, select
+from inventory_management.models.user import User, Role
+from inventory_management.services.permissions import get_role_permissions
+from inventory_management.utils.cache import TTLCache
+from inventory_management.utils.database import get_database
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "user_cache"
+
+class CachedUser(namedtuple("CachedUser", ["id", "username", "active", "role_id", "role_name", "auth_version"])):
+    """Immutable identity of an authenticated user, safe to share across requests."""
+
+    __slots__ = ()
+
+    @property
+    def permissions(self):
+        """Permission names of the user's role, from the role permission registry."""
+        return get_role_permissions(self.role_id)
+
+    def has_permission(self, permission_name):
+        """Check if user has a specific permission."""
+        return permission_name in self.permissions
+
+class AuthVersions:
+    """
+    Latest known auth_version of the users changed within the token lifetime.
+
+    Tokens that embed the user's identity are accepted without loading the
+    user as long as their version is not older than the one recorded here.
+    Revocations committed by this process are recorded immediately; those
+    made by other processes are picked up by reloading the users updated
+    since the previous refresh, at most every refresh_interval seconds. A
+    user changed longer than one token lifetime ago needs no entry, since
+    every token issued before the change has expired, so each refresh drops
+    the entries recorded more than token_lifetime ago.
+    """
+
+    # Reload slightly more than the time since the last refresh, so a write
+    # stamped before it but committed after it is not missed
+    REFRESH_OVERLAP = timedelta(seconds=60)
+
+    def __init__(self, token_lifetime, refresh_interval=5, clock=time.monotonic):
+        self.token_lifetime = token_lifetime
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._versions_lock = threading.Lock()
+        # user id -> (auth_version, clock time it was recorded)
+        self._versions = {}
+        self._since = None
+        self._next_refresh = 0.0
+        self.refreshes = 0
+
+    def is_current(self, db, user_id, auth_version):
+        """Return whether a token carrying auth_version has not been revoked."""
+        if self._clock() >= self._next_refresh:
+            # Only the first load blocks; later refreshes are skipped while
+            # another thread runs one
+            self.refresh(db, blocking=self._since is None)
+        entry = self._versions.get(user_id)
+        return entry is None or auth_version >= entry[0]
+
+    def refresh(self, db, blocking=True):
+        """Reload the versions of users updated since the last refresh."""
+        if not self._lock.acquire(blocking=blocking):
+            return
+        try:
+            if self._since is not None and self._clock() < self._next_refresh:
+                return
+
+            started = datetime.utcnow()
+            since = self._since or started - self.token_lifetime
+            rows = db.execute(
+                select(User.id, User.auth_version).where(User.updated_at >= since)
+            ).all()
+            for user_id, auth_version in rows:
+                self.revoke(user_id, auth_version)
+            self.prune()
+
+            self._since = started - self.REFRESH_OVERLAP
+            self._next_refresh = self._clock() + self.refresh_interval
+            self.refreshes += 1
+        finally:
+            self._lock.release()
+
+    def revoke(self, user_id, auth_version):
+        """Reject tokens of user_id older than auth_version."""
+        with self._versions_lock:
+            entry = self._versions.get(user_id)
+            if entry is None or auth_version > entry[0]:
+                self._versions[user_id] = (auth_version, self._clock())
+
+    def prune(self):
+        """Forget versions recorded more than one token lifetime ago."""
+        cutoff = self._clock() - self.token_lifetime.total_seconds()
+        with self._versions_lock:
+            expired = [user_id for user_id, (_, recorded) in self._versions.items() if recorded < cutoff]
+            for user_id in expired:
+                del self._versions[user_id]
+
+    def clear(self):
+        with self._lock, self._versions_lock:
+            self._versions.clear()
+            self._since = None
+            self._next_refresh = 0.0
+
+class UserCache:
+    """
+    Per-process cache of authenticated user identities.
+
+    Entries are keyed by (user_id, auth_version). Deactivating a user or
+    changing their role bumps User.auth_version, and the superseded entry is
+    dropped as soon as that change commits, so the common authenticated
+    request does no auth-related SQL. Other worker processes pick up the
+    change when their entry's TTL expires.
+
+    Permissions are not stored per user; CachedUser resolves them through the
+    role permission registry, so a role's grants change for all its users
+    at once.
+
+    versions tracks revocations for tokens that carry the identity claims
+    themselves (see identity_claims()); those skip the cache entirely.
+    """
+
+    def __init__(self, maxsize=10000, ttl=60, versions=None):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.versions = versions
+
+    def get(self, db, user_id, auth_version):
+        """Return the CachedUser for a token's user id and version, or None."""
+        key = (user_id, auth_version)
+        user = self._cache.get(key)
+        if user is not None:
+            return user
+
+        user = self.load(db, user_id)
+        if user is None or user.auth_version != auth_version:
+            return None
+
+        self._cache.set(key, user)
+        return user
+
+    def load(self, db, user_id):
+        """Load a user's identity from the database."""
+        row = db.execute(
+            select(User.id, User.username, User.active, User.role_id, Role.name, User.auth_version)
+            .join(Role, User.role_id == Role.id, isouter=True)
+            .where(User.id == user_id)
+        ).first()
+        if row is None:
+            return None
+
+        return CachedUser(row.id, row.username, bool(row.active), row.role_id, row.name, row.auth_version)
+
+    def from_claims(self, db, claims):
+        """Return the CachedUser embedded in a token's claims, None if it has none, or False if it was revoked."""
+        if self.versions is None or "role" not in claims:
+            return None
+
+        if not self.versions.is_current(db, claims["user_id"], claims["ver"]):
+            return False
+
+        # Deactivation bumps auth_version, so an unrevoked token's user is active
+        return CachedUser(claims["user_id"], claims["name"], True, claims["role"], claims["role_name"], claims["ver"])
+
+    def invalidate(self, user_id, auth_version):
+        self._cache.pop((user_id, auth_version))
+        if self.versions is not None:
+            self.versions.revoke(user_id, auth_version + 1)
+
+    def clear(self):
+        self._cache.clear()
+        if self.versions is not None:
+            self.versions.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+def identity_claims(username, role_id, role_name):
+    """Token claims that let requests authenticate the user without loading it (see UserCache.from_claims)."""
+    return {"name": username, "role": role_id, "role_name": role_name}
+
+def init_user_cache(app):
+    """Create the app's user cache and drop revoked entries after each commit."""
+    versions = None
+    if app.config["JWT_IDENTITY_CLAIMS"]:
+        versions = AuthVersions(app.config["JWT_EXPIRATION"], refresh_interval=app.config["AUTH_REVOCATION_REFRESH"])
+    cache = UserCache(maxsize=app.config["AUTH_CACHE_SIZE"], ttl=app.config["AUTH_CACHE_TTL"], versions=versions)
+    app.extensions[EXTENSION_KEY] = cache
+    session_factory = get_database(app).session_factory
+
+    @event.listens_for(session_factory, "after_commit")
+    def drop_revoked_users(session):
+        for user_id, auth_version in session.info.pop("revoked_auth_versions", ()):
+            cache.invalidate(user_id, auth_version)
+
+    @event.listens_for(session_factory, "after_rollback")
+    def forget_revoked_users(session):
+        session.info.pop("revoked_auth_versions", None)
+
+    return cache
+
+def get_user_cache():
+    """Get the user cache of the current app."""
+    return current_app.extensions[EXTENSION_KEY]
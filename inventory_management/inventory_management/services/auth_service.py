@@ -1,69 +1,97 @@
-import jwt
 import logging
+from functools import wraps
 from datetime import datetime, timedelta
 from flask import Blueprint, request, jsonify, current_app, g
+from sqlalchemy import inspect, update
 from sqlalchemy.exc import IntegrityError
-from email_validator import validate_email, EmailNotValidError
 from inventory_management.models.user import User, Role
-from inventory_management.utils.database import get_db
+from inventory_management.services.auth_cache import get_user_cache, identity_claims
+from inventory_management.services.tokens import get_token_verifier
+from inventory_management.utils.database import get_db, run_write
+from inventory_management.utils.passwords import PasswordHasherBusy
 from inventory_management.utils.validators import validate_password
 
 auth_bp = Blueprint("auth", __name__)
 logger = logging.getLogger(__name__)
 
-def generate_token(user_id):
-    """Generate a JWT token for the user."""
+@auth_bp.errorhandler(PasswordHasherBusy)
+def password_hasher_busy(e):
+    """Shed login/registration load instead of queueing behind bcrypt."""
+    logger.warning(f"Password hashing unavailable: {e}")
+    return jsonify({"error": "Server busy, please retry"}), 503, {"Retry-After": "1"}
+
+def generate_token(user_id, auth_version=1, identity=None):
+    """Generate a JWT token for the user, optionally embedding identity claims."""
     expiration = datetime.utcnow() + current_app.config["JWT_EXPIRATION"]
     payload = {
         "user_id": user_id,
+        "ver": auth_version,
         "exp": expiration
     }
-    return jwt.encode(payload, current_app.config["SECRET_KEY"], algorithm="HS256")
+    if identity:
+        payload.update(identity)
+    return get_token_verifier().encode(payload)
 
 @auth_bp.route("/register", methods=["POST"])
 def register():
     """Register a new user."""
     data = request.get_json()
     
+    error = registration_error(data)
+    if error:
+        return jsonify({"error": error}), 400
+    
+    # Create new user (hashing the password before taking the writer)
+    user = new_user(data)
+    user.set_password(data["password"])
+    
+    # Add to database
+    try:
+        user_id = run_write(lambda db: add_user(db, user))
+    except IntegrityError:
+        logger.warning(f"Registration failed: Username or email already exists - {data['username']}")
+        return jsonify({"error": "Username or email already exists"}), 409
+    
+    logger.info(f"User registered: {data['username']}")
+    return jsonify({"message": "User registered successfully", "user_id": user_id}), 201
+
+def registration_error(data):
+    """Validate a registration payload; return an error message or None."""
     # Validate required fields
     required_fields = ["username", "email", "password", "role_id"]
     for field in required_fields:
         if field not in data:
-            return jsonify({"error": f"Missing required field: {field}"}), 400
+            return f"Missing required field: {field}"
+    
+    # Validate email format (email_validator is imported here to keep startup light)
+    from email_validator import validate_email, EmailNotValidError
     
-    # Validate email format
     try:
         validate_email(data["email"])
     except EmailNotValidError as e:
-        return jsonify({"error": str(e)}), 400
+        return str(e)
     
     # Validate password strength
     password_validation = validate_password(data["password"])
     if not password_validation["valid"]:
-        return jsonify({"error": password_validation["message"]}), 400
+        return password_validation["message"]
     
-    # Create new user
-    user = User(
+    return None
+
+def new_user(data):
+    """Build a User from a validated registration payload, without its password hash."""
+    return User(
         username=data["username"],
         email=data["email"],
         role_id=data["role_id"],
         first_name=data.get("first_name", ""),
         last_name=data.get("last_name", "")
     )
-    user.set_password(data["password"])
-    
-    # Add to database
-    db = get_db()
-    try:
-        db.add(user)
-        db.commit()
-    except IntegrityError:
-        db.rollback()
-        logger.warning(f"Registration failed: Username or email already exists - {data['username']}")
-        return jsonify({"error": "Username or email already exists"}), 409
-    
-    logger.info(f"User registered: {user.username}")
-    return jsonify({"message": "User registered successfully", "user_id": user.id}), 201
+
+def add_user(db, user):
+    db.add(user)
+    db.flush()
+    return user.id
 
 @auth_bp.route("/login", methods=["POST"])
 def login():
@@ -88,28 +116,33 @@ def login():
         logger.warning(f"Login failed: Account is inactive - {data['username']}")
         return jsonify({"error": "Account is inactive"}), 403
     
-    # Update last login timestamp
-    user.last_login = datetime.utcnow()
-    db.commit()
-    
     # Generate token
-    token = generate_token(user.id)
+    identity = None
+    if current_app.config["JWT_IDENTITY_CLAIMS"]:
+        identity = identity_claims(user.username, user.role_id, user.role.name if user.role else None)
+    token = generate_token(user.id, user.auth_version, identity)
+    
+    # Update last login timestamp (and any password rehash from check_password)
+    rehashed = inspect(user).attrs.password_hash.history.has_changes()
+    run_write(lambda db: record_login(db, user.id, user.password_hash if rehashed else None))
     
     logger.info(f"User logged in: {user.username}")
     return jsonify({"token": token, "user_id": user.id}), 200
 
+def record_login(db, user_id, password_hash=None):
+    """Set a user's last login time, and their password hash if it was upgraded."""
+    values = {"last_login": datetime.utcnow()}
+    if password_hash is not None:
+        values["password_hash"] = password_hash
+    db.execute(update(User).where(User.id == user_id).values(**values))
+
 def verify_token(token):
-    """Verify JWT token and return user ID."""
-    try:
-        payload = jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=["HS256"])
-        return payload["user_id"]
-    except jwt.ExpiredSignatureError:
-        return False
-    except jwt.InvalidTokenError:
-        return None
+    """Verify JWT token and return its claims."""
+    return get_token_verifier().verify(token)
 
 def auth_required(view_func):
     """Decorator for views that require authentication."""
+    @wraps(view_func)
     def wrapped_view(*args, **kwargs):
         auth_header = request.headers.get("Authorization")
         
@@ -117,16 +150,19 @@ def auth_required(view_func):
             return jsonify({"error": "Authorization header is missing or invalid"}), 401
         
         token = auth_header.split(" ")[1]
-        user_id = verify_token(token)
+        claims = verify_token(token)
         
-        if user_id is None or user_id is False:
+        if not claims:
             return jsonify({"error": "Invalid or expired token"}), 401
         
-        # Get user from database
-        db = get_db()
-        user = db.query(User).filter_by(id=user_id).first()
+        # Use the identity embedded in the token unless it was revoked; older
+        # tokens go through the per-process cache, falling back to the database
+        user_cache = get_user_cache()
+        user = user_cache.from_claims(get_db(), claims)
+        if user is None:
+            user = user_cache.get(get_db(), claims["user_id"], claims.get("ver", 1))
         
-        if user is None or not user.active:
+        if not user or not user.active:
             return jsonify({"error": "User not found or inactive"}), 401
         
         # Store user in g for view functions to access
@@ -136,13 +172,36 @@ def auth_required(view_func):
     
     return wrapped_view
 
+def permission_required(permission_name):
+    """Decorator for views that require authentication and a specific permission."""
+    def decorator(view_func):
+        @auth_required
+        @wraps(view_func)
+        def wrapped_view(*args, **kwargs):
+            if not g.user.has_permission(permission_name):
+                logger.warning(f"Permission denied: {g.user.username} lacks {permission_name}")
+                return jsonify({"error": f"Permission required: {permission_name}"}), 403
+            
+            return view_func(*args, **kwargs)
+        
+        return wrapped_view
+    
+    return decorator
+
 @auth_bp.route("/me", methods=["GET"])
 @auth_required
 def get_current_user():
     """Get the current authenticated user."""
-    user = g.user
+    user = get_db().query(User).filter_by(id=g.user.id).first()
+    if user is None:
+        # Deleted after its still-valid token was issued
+        return jsonify({"error": "User not found or inactive"}), 401
     
-    return jsonify({
+    return jsonify(serialize_user(user)), 200
+
+def serialize_user(user):
+    """Serialize the current user for /me."""
+    return {
         "id": user.id,
         "username": user.username,
         "email": user.email,
@@ -150,4 +209,4 @@ def get_current_user():
         "last_name": user.last_name,
         "role": user.role.name,
         "last_login": user.last_login.isoformat() if user.last_login else None,
-    }), 200
+    }
@@ -0,0 +1,283 @@
+"""
+Bulk product import from CSV or JSONL files.
+
+The file is streamed in chunks of rows. Each chunk is validated (in worker
+processes when workers > 1), then its categories and products are upserted
+with a few executemany statements and committed as one transaction, so
+memory use and transaction size stay bounded however large the file is.
+Rows that fail validation are written to a JSONL rejects file with their
+line number and error instead of aborting the import.
+"""
+import csv
+import json
+import logging
+import time
+from collections import defaultdict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+from sqlalchemy import bindparam, insert, select, update
+from inventory_management.models.inventory import Category, Product
+from inventory_management.services.stock_service import StockChange, apply_stock_changes
+from inventory_management.utils.validators import validate_sku
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+# Columns an imported row may overwrite on an existing SKU, when the row has
+# them; a quantity is applied as a recorded adjustment instead
+UPDATE_COLUMNS = ("name", "description", "price", "low_stock_threshold", "category_id", "active")
+
+# Values of optional columns a new product gets when its row leaves them out
+INSERT_DEFAULTS = {"description": "", "quantity": 0, "low_stock_threshold": 10, "category_id": None, "active": True}
+
+IMPORT_REFERENCE = "import"
+
+products_table = Product.__table__
+categories_table = Category.__table__
+
+ImportResult = namedtuple("ImportResult", ["rows", "inserted", "updated", "rejected", "seconds"])
+
+def import_format(path, fmt=None):
+    """Return the import format, inferred from the file extension if not given."""
+    fmt = fmt or path.rsplit(".", 1)[-1].lower()
+    if fmt == "ndjson":
+        fmt = "jsonl"
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+    return fmt
+
+def read_rows(f, fmt):
+    """Yield (line number, raw row) pairs from an open CSV or JSONL file."""
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    for line_number, line in enumerate(f, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = line.rstrip("\n")
+        yield line_number, row
+
+def optional_int(value, field, default):
+    if value is None or value == "":
+        return default
+    if isinstance(value, bool):
+        raise ValueError(f"{field} must be a non-negative integer")
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field} must be a non-negative integer") from None
+    if number < 0 or number != float(value):
+        raise ValueError(f"{field} must be a non-negative integer")
+    return number
+
+def parse_row(raw):
+    """
+    Validate one raw row and return a product record; raise ValueError with the reason.
+
+    Optional columns the row leaves out or empty are None in the record.
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("Row must be an object")
+
+    sku = str(raw.get("sku") or "").strip()
+    if not sku:
+        raise ValueError("Missing required field: sku")
+    sku_validation = validate_sku(sku)
+    if not sku_validation["valid"]:
+        raise ValueError(sku_validation["message"])
+
+    name = str(raw.get("name") or "").strip()
+    if not name:
+        raise ValueError("Missing required field: name")
+    if len(name) > 200:
+        raise ValueError("name must be at most 200 characters")
+
+    try:
+        price = float(raw.get("price"))
+    except (TypeError, ValueError):
+        raise ValueError("price must be a number") from None
+    if not price >= 0:
+        raise ValueError("price must be a non-negative number")
+
+    category = str(raw.get("category") or "").strip() or None
+    if category is not None and len(category) > 100:
+        raise ValueError("category must be at most 100 characters")
+
+    active = raw.get("active")
+    if isinstance(active, str):
+        active = active.strip().lower()
+        active = None if active == "" else active not in ("0", "false", "no")
+
+    return {
+        "sku": sku,
+        "name": name,
+        "description": raw.get("description") or None,
+        "price": price,
+        "quantity": optional_int(raw.get("quantity"), "quantity", None),
+        "low_stock_threshold": optional_int(raw.get("low_stock_threshold"), "low_stock_threshold", None),
+        "category": category,
+        "active": None if active is None else bool(active),
+    }
+
+def parse_batch(rows):
+    """Validate a batch of (line number, raw row) pairs; return (records, rejects)."""
+    records = []
+    rejects = []
+    for line_number, raw in rows:
+        try:
+            records.append(parse_row(raw))
+        except ValueError as e:
+            rejects.append({"line": line_number, "error": str(e), "row": raw})
+    return records, rejects
+
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def parsed_batches(batches, workers):
+    """Parse batches in order, in up to workers processes with a bounded number in flight."""
+    if workers <= 1:
+        for batch in batches:
+            yield parse_batch(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(parse_batch, batch))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def lookup(db, column, key_column, keys):
+    """Map key -> column value for the given keys, in chunks."""
+    keys = list(keys)
+    found = {}
+    for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+        chunk = keys[start:start + LOOKUP_CHUNK_SIZE]
+        found.update(db.execute(select(key_column, column).where(key_column.in_(chunk))).all())
+    return found
+
+def upsert_categories(db, names):
+    """Return a name -> id map for the given category names, creating missing ones."""
+    ids = lookup(db, Category.id, Category.name, names)
+    missing = [name for name in names if name not in ids]
+    if missing:
+        now = datetime.utcnow()
+        db.execute(insert(categories_table), [
+            {"name": name, "description": "", "created_at": now, "updated_at": now} for name in missing
+        ])
+        ids.update(lookup(db, Category.id, Category.name, missing))
+    return ids
+
+def upsert_products(db, records):
+    """
+    Insert new products and update existing ones (matched on SKU).
+
+    New products get INSERT_DEFAULTS for the optional columns their row
+    leaves out. Existing products only have the columns their row gives
+    overwritten, with one executemany per set of columns. A quantity
+    given for an existing product is applied as a relative change with
+    an InventoryTransaction, so stock history stays complete.
+
+    Does not commit. Returns (inserted, updated).
+    """
+    # The last row for a SKU within the chunk wins
+    by_sku = {record["sku"]: record for record in records}
+    category_ids = upsert_categories(db, {r["category"] for r in by_sku.values() if r["category"]})
+    existing = lookup(db, Product.id, Product.sku, by_sku)
+
+    now = datetime.utcnow()
+    inserts = []
+    updates = defaultdict(list)
+    quantities = {}
+    for sku, record in by_sku.items():
+        row = {key: value for key, value in record.items() if key not in ("sku", "category")}
+        row["category_id"] = category_ids.get(record["category"])
+        if sku in existing:
+            product_id = existing[sku]
+            if row["quantity"] is not None:
+                quantities[product_id] = row["quantity"]
+            columns = tuple(column for column in UPDATE_COLUMNS if row[column] is not None)
+            updates[columns].append({"product_id": product_id, **{f"new_{column}": row[column] for column in columns}})
+        else:
+            row = {**row, **{key: value for key, value in INSERT_DEFAULTS.items() if row[key] is None}}
+            inserts.append({"sku": sku, **row, "created_at": now, "updated_at": now})
+
+    if inserts:
+        db.execute(insert(products_table), inserts)
+    for columns, params in updates.items():
+        # Bind names must differ from column names in an executemany UPDATE
+        values = {column: bindparam(f"new_{column}") for column in columns}
+        db.execute(
+            update(products_table)
+            .where(products_table.c.id == bindparam("product_id"))
+            .values(updated_at=now, **values),
+            params
+        )
+    if quantities:
+        set_quantities(db, quantities, now)
+
+    return len(inserts), sum(len(params) for params in updates.values())
+
+def set_quantities(db, quantities, now):
+    """Bring existing products to the given quantities with relative updates and recorded transactions."""
+    current = lookup(db, Product.quantity, Product.id, quantities)
+    changes = [
+        StockChange(pid, quantity - current[pid], IMPORT_REFERENCE, "Stock level set by product import", None)
+        for pid, quantity in quantities.items() if quantity != current[pid]
+    ]
+    apply_stock_changes(db, changes, current, now)
+
+def import_products(db, path, fmt=None, chunk_size=1000, workers=1, rejects_path=None):
+    """
+    Stream products from a CSV or JSONL file into the database.
+
+    Columns: sku, name, price (required), description, quantity,
+    low_stock_threshold, category (a name; created if missing) and active.
+    Products are matched on SKU and updated if they already exist, in the
+    columns the row gives (see upsert_products). Each
+    chunk is committed on its own; rejected rows go to rejects_path
+    (default: <path>.rejects.jsonl). Returns an ImportResult.
+    """
+    fmt = import_format(path, fmt)
+    rejects_path = rejects_path or f"{path}.rejects.jsonl"
+    rows = inserted = updated = rejected = 0
+    start = time.perf_counter()
+
+    with open(path, newline="", encoding="utf-8") as f, open(rejects_path, "w", encoding="utf-8") as rejects_file:
+        for records, rejects in parsed_batches(chunked(read_rows(f, fmt), chunk_size), workers):
+            if records:
+                try:
+                    chunk_inserted, chunk_updated = upsert_products(db, records)
+                    db.commit()
+                except Exception:
+                    db.rollback()
+                    raise
+                inserted += chunk_inserted
+                updated += chunk_updated
+
+            for reject in rejects:
+                rejects_file.write(json.dumps(reject, default=str) + "\n")
+            rows += len(records) + len(rejects)
+            rejected += len(rejects)
+
+    seconds = time.perf_counter() - start
+    logger.info(f"Imported {rows} rows from {path}: {inserted} inserted, {updated} updated, {rejected} rejected")
+    return ImportResult(rows, inserted, updated, rejected, seconds)
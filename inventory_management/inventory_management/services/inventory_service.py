@@ -1,58 +1,515 @@
-# Update product quantity
-    old_quantity = product.quantity
-    product.quantity += quantity_change
+import logging
+from datetime import datetime, timezone
+from flask import Blueprint, request, jsonify, current_app, g
+from sqlalchemy import and_, or_, select
+from sqlalchemy.exc import IntegrityError
+from inventory_management.models.inventory import Product, Category, InventoryTransaction
+from inventory_management.models.user import User
+from inventory_management.services.auth_service import auth_required, permission_required
+from inventory_management.services.ledger import get_ledger
+from inventory_management.services.notification_service import send_low_stock_notification
+from inventory_management.services.response_cache import cached_response
+from inventory_management.services.search_service import search_products
+from inventory_management.services.snapshot_service import stock_as_of
+from inventory_management.services.stock_service import (
+    apply_stock_adjustments,
+    adjust_quantity,
+    ProductNotFoundError,
+    InsufficientStockError,
+)
+from inventory_management.utils.database import get_db, run_write
+from inventory_management.utils.pagination import InvalidCursor, decode_cursor, encode_cursor, page_size, paginate
+from inventory_management.utils.streaming import EXPORT_FORMATS, stream_query
+from inventory_management.utils.validators import validate_sku
+
+inventory_bp = Blueprint("inventory", __name__)
+logger = logging.getLogger(__name__)
+
+def serialize_product(product):
+    """Serialize a product for JSON responses."""
+    return {
+        "id": product.id,
+        "sku": product.sku,
+        "name": product.name,
+        "description": product.description,
+        "price": product.price,
+        "quantity": product.quantity,
+        "category_id": product.category_id,
+        "low_stock_threshold": product.low_stock_threshold,
+        "active": product.active,
+    }
+
+@inventory_bp.route("/categories", methods=["GET"])
+@auth_required
+@cached_response(Category.__tablename__)
+def get_categories():
+    """Get all product categories."""
+    return jsonify(list_categories(get_db())), 200
+
+def list_categories(db):
+    """Serialize every category, ordered by name."""
+    categories = db.query(Category).order_by(Category.name).all()
+    
+    return [{
+        "id": c.id,
+        "name": c.name,
+        "description": c.description
+    } for c in categories]
+
+def add_category(db, data):
+    """Insert a category from a validated request payload; return it serialized."""
+    category = Category(name=data["name"], description=data.get("description", ""))
+    db.add(category)
+    db.flush()
+    return {"id": category.id, "name": category.name}
+
+@inventory_bp.route("/categories", methods=["POST"])
+@permission_required("manage_products")
+def create_category():
+    """Create a new product category."""
+    data = request.get_json()
+    
+    if "name" not in data:
+        return jsonify({"error": "Missing required field: name"}), 400
+    
+    try:
+        category = run_write(lambda db: add_category(db, data))
+    except IntegrityError:
+        return jsonify({"error": "Category already exists"}), 409
+    
+    logger.info(f"Category created: {category['name']}")
+    return jsonify(category), 201
+
+@inventory_bp.route("/products", methods=["GET"])
+@auth_required
+@cached_response(Product.__tablename__)
+def get_products():
+    """Get a page of products ordered by id (keyset pagination)."""
+    try:
+        page = product_page(
+            get_db(),
+            page_size(request.args),
+            request.args.get("category_id", type=int),
+            request.args.get("cursor")
+        )
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
+    
+    return jsonify(page), 200
+
+def product_page(db, limit, category_id=None, cursor=None):
+    """Serialize a page of products after cursor; raises InvalidCursor."""
+    query = db.query(Product)
+    
+    if category_id is not None:
+        query = query.filter(Product.category_id == category_id)
+    
+    if cursor:
+        (last_id,) = decode_cursor(cursor, int)
+        query = query.filter(Product.id > last_id)
+    
+    products = query.order_by(Product.id).limit(limit + 1).all()
+    page, next_cursor = paginate(products, limit, lambda p: (p.id,))
+    
+    return {
+        "items": [serialize_product(p) for p in page],
+        "next_cursor": next_cursor
+    }
+
+@inventory_bp.route("/products/search", methods=["GET"])
+@auth_required
+@cached_response(Product.__tablename__)
+def search():
+    """Search products by SKU prefix and words of their name and description."""
+    query = request.args.get("q", "")
+    if not query.strip():
+        return jsonify({"error": "Missing required parameter: q"}), 400
+    
+    products = search_products(
+        get_db(),
+        query,
+        page_size(request.args),
+        request.args.get("category_id", type=int),
+        current_app.config["SEARCH_MAX_CANDIDATES"]
+    )
+    return jsonify({"items": [serialize_product(p) for p in products]}), 200
+
+def low_stock_query(db, limit, after_id=None, category_id=None):
+    """Select a page of low stock products using the partial low stock index."""
+    p = Product
+    stmt = select(p.id, p.sku, p.name, p.quantity, p.low_stock_threshold, p.category_id).where(p.low_stock_condition())
+    if category_id is not None:
+        stmt = stmt.where(p.category_id == category_id)
+    if after_id is not None:
+        stmt = stmt.where(p.id > after_id)
+    
+    return db.execute(stmt.order_by(p.id).limit(limit)).all()
+
+@inventory_bp.route("/low-stock", methods=["GET"])
+@auth_required
+@cached_response(Product.__tablename__)
+def get_low_stock_products():
+    """Get a page of active products at or below their low stock threshold."""
+    try:
+        page = low_stock_page(
+            get_db(),
+            page_size(request.args),
+            request.args.get("category_id", type=int),
+            request.args.get("cursor")
+        )
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
+    
+    return jsonify(page), 200
+
+def low_stock_page(db, limit, category_id=None, cursor=None):
+    """Serialize a page of low stock products after cursor; raises InvalidCursor."""
+    after_id = None
+    if cursor:
+        (after_id,) = decode_cursor(cursor, int)
+    
+    rows = low_stock_query(db, limit + 1, after_id, category_id)
+    page, next_cursor = paginate(rows, limit, lambda r: (r.id,))
+    
+    return {
+        "items": [{
+            "id": r.id,
+            "sku": r.sku,
+            "name": r.name,
+            "quantity": r.quantity,
+            "low_stock_threshold": r.low_stock_threshold,
+            "category_id": r.category_id
+        } for r in page],
+        "next_cursor": next_cursor
+    }
+
+@inventory_bp.route("/products/<int:product_id>", methods=["GET"])
+@auth_required
+@cached_response(Product.__tablename__)
+def get_product(product_id):
+    """Get a single product."""
+    db = get_db()
+    product = db.query(Product).filter_by(id=product_id).first()
+    if not product:
+        return jsonify({"error": "Product not found"}), 404
+    
+    return jsonify(serialize_product(product)), 200
+
+def product_payload_error(data):
+    """Validate a new product payload; return an error message or None."""
+    # Validate required fields
+    required_fields = ["sku", "name", "price"]
+    for field in required_fields:
+        if field not in data:
+            return f"Missing required field: {field}"
+    
+    # Validate SKU format
+    sku_validation = validate_sku(data["sku"])
+    if not sku_validation["valid"]:
+        return sku_validation["message"]
+    
+    return None
+
+def add_product(db, data):
+    """Insert a product from a validated request payload; return it serialized."""
+    product = Product(
+        sku=data["sku"],
+        name=data["name"],
+        description=data.get("description", ""),
+        price=data["price"],
+        quantity=data.get("quantity", 0),
+        category_id=data.get("category_id"),
+        low_stock_threshold=data.get("low_stock_threshold", 10)
+    )
+    db.add(product)
+    db.flush()
+    return serialize_product(product)
+
+@inventory_bp.route("/products", methods=["POST"])
+@permission_required("manage_products")
+def create_product():
+    """Create a new product."""
+    data = request.get_json()
+    
+    error = product_payload_error(data)
+    if error:
+        return jsonify({"error": error}), 400
+    
+    try:
+        product = run_write(lambda db: add_product(db, data))
+    except IntegrityError:
+        logger.warning(f"Product creation failed: SKU already exists - {data['sku']}")
+        return jsonify({"error": "SKU already exists"}), 409
+    
+    logger.info(f"Product created: {product['name']} ({product['sku']})")
+    return jsonify(product), 201
+
+@inventory_bp.route("/products/<int:product_id>/adjust", methods=["POST"])
+@permission_required("adjust_stock")
+def adjust_stock(product_id):
+    """Adjust the stock level of a product."""
+    data = request.get_json()
+    
+    error = adjustment_payload_error(data)
+    if error:
+        return jsonify({"error": error}), 400
+    
+    user_id = g.user.id
+    ledger = get_ledger()
+    try:
+        if ledger is not None:
+            # Queued and group-committed with other adjustments
+            product = ledger.adjust(product_id, data["quantity_change"], data.get("reference", ""),
+                                    data.get("notes", ""), user_id)
+        else:
+            product = run_write(lambda db: record_adjustment(db, product_id, data, user_id))
+    except ProductNotFoundError:
+        return jsonify({"error": "Product not found"}), 404
+    except InsufficientStockError:
+        return jsonify({"error": "Insufficient stock"}), 400
+    
+    return jsonify(adjustment_applied(product, data["quantity_change"])), 200
+
+def adjustment_payload_error(data):
+    """Validate a single stock adjustment payload; return an error message or None."""
+    if "quantity_change" not in data:
+        return "Missing required field: quantity_change"
+    
+    quantity_change = data["quantity_change"]
+    if not isinstance(quantity_change, int) or isinstance(quantity_change, bool) or quantity_change == 0:
+        return "quantity_change must be a non-zero integer"
+    
+    return None
+
+def record_adjustment(db, product_id, data, user_id):
+    """Apply a validated adjustment payload and record its transaction; return the StockLevel."""
+    quantity_change = data["quantity_change"]
+    
+    # Update product quantity atomically in the database
+    product = adjust_quantity(db, product_id, quantity_change)
     
     # Create transaction record
-    transaction_type = "addition" if quantity_change > 0 else "removal"
-    transaction = InventoryTransaction(
+    db.add(InventoryTransaction(
         product_id=product.id,
         quantity_change=quantity_change,
-        transaction_type=transaction_type,
+        transaction_type="addition" if quantity_change > 0 else "removal",
         reference=data.get("reference", ""),
         notes=data.get("notes", ""),
-        user_id=g.user.id
-    )
-    
-    db.add(transaction)
-    db.commit()
-    
-    # Check for low stock and send notification if needed
-    if not product.is_low_stock() and product.quantity <= product.low_stock_threshold:
+        user_id=user_id
+    ))
+    return product
+
+def adjustment_applied(product, quantity_change):
+    """Notify if a committed adjustment crossed the low stock threshold; return the response body."""
+    threshold = product.low_stock_threshold
+    if threshold is not None and product.old_quantity > threshold >= product.quantity:
         if current_app.config["NOTIFICATION_ENABLED"]:
             send_low_stock_notification(product)
     
-    logger.info(f"Stock adjusted for {product.name}: {old_quantity} -> {product.quantity}")
-    return jsonify({
+    logger.info(f"Stock adjusted for {product.name}: {product.old_quantity} -> {product.quantity}")
+    return {
         "id": product.id,
         "sku": product.sku,
         "name": product.name,
-        "old_quantity": old_quantity,
+        "old_quantity": product.old_quantity,
         "new_quantity": product.quantity,
         "change": quantity_change
-    }), 200
+    }
+
+@inventory_bp.route("/stock/bulk-adjust", methods=["POST"])
+@permission_required("adjust_stock")
+def bulk_adjust_stock():
+    """Apply many stock adjustments, identified by SKU, in one transaction."""
+    data = request.get_json()
+    
+    error = bulk_adjustment_payload_error(data)
+    if error:
+        return jsonify({"error": error[0]}), error[1]
+    
+    user_id = g.user.id
+    results, crossed = run_write(lambda db: apply_stock_adjustments(db, data["adjustments"], user_id=user_id))
+    
+    # Notify for products that crossed their low stock threshold
+    if crossed and current_app.config["NOTIFICATION_ENABLED"]:
+        for product in get_db().query(Product).filter(Product.id.in_(crossed)):
+            send_low_stock_notification(product)
+    
+    return jsonify(bulk_adjustment_summary(results)), 200
+
+def bulk_adjustment_payload_error(data):
+    """Validate a bulk adjustment payload; return (error message, status) or None."""
+    adjustments = data.get("adjustments") if isinstance(data, dict) else None
+    if not isinstance(adjustments, list) or not adjustments:
+        return "adjustments must be a non-empty list", 400
+    
+    max_records = current_app.config["BULK_ADJUST_MAX_RECORDS"]
+    if len(adjustments) > max_records:
+        return f"At most {max_records} adjustments per request", 413
+    
+    return None
+
+def bulk_adjustment_summary(results):
+    applied = sum(1 for r in results if r["status"] == "applied")
+    return {
+        "applied": applied,
+        "rejected": len(results) - applied,
+        "results": results
+    }
+
+def export_product_row(row):
+    """Serialize a product row for exports."""
+    return {
+        "id": row.id,
+        "sku": row.sku,
+        "name": row.name,
+        "price": row.price,
+        "quantity": row.quantity,
+        "category_id": row.category_id,
+        "low_stock_threshold": row.low_stock_threshold,
+        "active": row.active,
+    }
+
+def export_transaction_row(row):
+    """Serialize a transaction row for exports."""
+    return {
+        "id": row.id,
+        "product_id": row.product_id,
+        "quantity_change": row.quantity_change,
+        "transaction_type": row.transaction_type,
+        "reference": row.reference,
+        "user_id": row.user_id,
+        "timestamp": row.timestamp.isoformat() if row.timestamp else None,
+    }
+
+def export_format(args):
+    """Read and validate ?format= for export endpoints."""
+    fmt = args.get("format", "jsonl")
+    return fmt if fmt in EXPORT_FORMATS else None
+
+def export_products_query():
+    p = Product
+    return select(p.id, p.sku, p.name, p.price, p.quantity, p.category_id, p.low_stock_threshold, p.active).order_by(p.id)
+
+def export_transactions_query(product_id=None):
+    t = InventoryTransaction
+    stmt = select(t.id, t.product_id, t.quantity_change, t.transaction_type, t.reference, t.user_id, t.timestamp)
+    if product_id is not None:
+        stmt = stmt.where(t.product_id == product_id)
+    return stmt.order_by(t.id)
+
+@inventory_bp.route("/export/products", methods=["GET"])
+@auth_required
+def export_products():
+    """Stream every product as JSON Lines (default) or a JSON array."""
+    fmt = export_format(request.args)
+    if fmt is None:
+        return jsonify({"error": "format must be one of: " + ", ".join(EXPORT_FORMATS)}), 400
+    
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+    return stream_query(get_db(), export_products_query(), export_product_row, fmt, batch_size, filename="products")
+
+@inventory_bp.route("/export/transactions", methods=["GET"])
+@auth_required
+def export_transactions():
+    """Stream inventory transactions (optionally for one product) as JSON Lines or a JSON array."""
+    fmt = export_format(request.args)
+    if fmt is None:
+        return jsonify({"error": "format must be one of: " + ", ".join(EXPORT_FORMATS)}), 400
+    
+    stmt = export_transactions_query(request.args.get("product_id", type=int))
+    batch_size = current_app.config["EXPORT_BATCH_SIZE"]
+    return stream_query(get_db(), stmt, export_transaction_row, fmt, batch_size, filename="transactions")
 
 @inventory_bp.route("/products/<int:product_id>/transactions", methods=["GET"])
 @auth_required
+@cached_response(Product.__tablename__, InventoryTransaction.__tablename__, User.__tablename__)
 def get_product_transactions(product_id):
-    """Get transaction history for a product."""
-    db = get_db()
-    
-    # Get product
-    product = db.query(Product).filter_by(id=product_id).first()
-    if not product:
+    """Get a page of transaction history for a product."""
+    try:
+        page = transaction_page(get_db(), product_id, page_size(request.args), request.args.get("cursor"))
+    except ProductNotFoundError:
         return jsonify({"error": "Product not found"}), 404
+    except InvalidCursor:
+        return jsonify({"error": "Invalid cursor"}), 400
     
-    # Get transactions
-    transactions = db.query(InventoryTransaction).filter_by(product_id=product_id).order_by(InventoryTransaction.timestamp.desc()).all()
+    return jsonify(page), 200
+
+def transaction_page(db, product_id, limit, cursor=None):
+    """Serialize a page of a product's transactions, newest first; raises ProductNotFoundError or InvalidCursor."""
+    # Check the product exists
+    if db.execute(select(Product.id).where(Product.id == product_id)).first() is None:
+        raise ProductNotFoundError(product_id)
     
-    result = [{
-        "id": t.id,
-        "quantity_change": t.quantity_change,
-        "transaction_type": t.transaction_type,
-        "reference": t.reference,
-        "notes": t.notes,
-        "user": t.user.username if t.user else None,
-        "timestamp": t.timestamp.isoformat()
-    } for t in transactions]
+    # Select only the serialized columns, joined to the username, in one query
+    t = InventoryTransaction
+    stmt = (
+        select(t.id, t.quantity_change, t.transaction_type, t.reference, t.notes, User.username, t.timestamp)
+        .outerjoin(User, t.user_id == User.id)
+        .where(t.product_id == product_id)
+    )
+    
+    # Page newest first, keyed on (timestamp, id)
+    if cursor:
+        last_timestamp, last_id = decode_cursor(cursor, datetime, int)
+        stmt = stmt.where(or_(
+            t.timestamp < last_timestamp,
+            and_(t.timestamp == last_timestamp, t.id < last_id)
+        ))
+    
+    stmt = stmt.order_by(t.timestamp.desc(), t.id.desc()).limit(limit + 1)
+    
+    # Serialize rows straight from the cursor without building ORM objects
+    result = []
+    next_cursor = None
+    for row in db.execute(stmt):
+        if len(result) == limit:
+            last = result[-1]
+            next_cursor = encode_cursor(last["timestamp"], last["id"])
+            break
+        result.append({
+            "id": row.id,
+            "quantity_change": row.quantity_change,
+            "transaction_type": row.transaction_type,
+            "reference": row.reference,
+            "notes": row.notes,
+            "user": row.username,
+            "timestamp": row.timestamp.isoformat()
+        })
+    
+    return {"items": result, "next_cursor": next_cursor}
+
+@inventory_bp.route("/products/<int:product_id>/stock", methods=["GET"])
+@auth_required
+def get_product_stock(product_id):
+    """Get the quantity of a product now or at a past time (?as_of=ISO 8601, UTC)."""
+    try:
+        as_of = parse_as_of(request.args.get("as_of"))
+    except ValueError:
+        return jsonify({"error": "as_of must be an ISO 8601 timestamp"}), 400
+    
+    try:
+        stock = stock_as_of(get_db(), product_id, as_of)
+    except ProductNotFoundError:
+        return jsonify({"error": "Product not found"}), 404
     
-    return jsonify(result), 200
+    return jsonify(serialize_stock(stock)), 200
+
+def parse_as_of(value):
+    """Parse ?as_of= into a naive UTC datetime (now if empty); raises ValueError."""
+    if not value:
+        return datetime.utcnow()
+    
+    as_of = datetime.fromisoformat(value)
+    if as_of.tzinfo is not None:
+        as_of = as_of.astimezone(timezone.utc).replace(tzinfo=None)
+    return as_of
+
+def serialize_stock(stock):
+    """Serialize a StockAsOf for JSON responses."""
+    return {
+        "product_id": stock.product_id,
+        "as_of": stock.as_of.isoformat(),
+        "quantity": stock.quantity,
+        "snapshot_at": stock.snapshot_at.isoformat() if stock.snapshot_at else None,
+        "replayed_transactions": stock.replayed
+    }
@@ -0,0 +1,254 @@
+"""
+Buffered, group-committed writer for single stock adjustments.
+
+Committing every adjustment on its own pays one commit (an fsync on
+most databases) per InventoryTransaction row. LedgerWriter queues
+adjustments instead; a worker thread takes what has queued, waiting up to
+flush_interval seconds after the first entry for up to batch_size
+entries, and applies the batch in one transaction with the same
+stock_service helpers as apply_stock_adjustments: one SELECT of the
+products' stock levels (FOR UPDATE where supported), one guarded UPDATE
+of the net change per product (quantity = quantity + delta), one
+multi-row INSERT of the ledger rows and a single commit.
+
+An entry that targets a missing product or would take stock below zero
+fails alone. The guard keeps stock from going negative when another
+process's writer or a bulk adjustment changes a product after it was
+read (see apply_stock_changes); then all of that product's entries in
+the batch fail.
+
+Durability modes:
+
+- "sync" (the default): an adjustment is acknowledged once the commit
+  that contains it has returned, so an acknowledged change is as durable
+  as any other committed write.
+- "async": an adjustment is acknowledged once it has been applied in the
+  batch's transaction, before the commit. Acknowledged changes can be
+  lost if that commit fails or the process dies first (at most one batch
+  per process); such failures are logged and counted as "lost".
+
+With the SQLite write queue (SQLITE_SINGLE_WRITER) batches are run and
+committed by the queue's writer, so acknowledgements always follow the
+commit whatever the mode.
+"""
+import logging
+import queue
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+from flask import current_app
+from inventory_management.services.stock_service import (
+    InsufficientStockError,
+    ProductNotFoundError,
+    StockChange,
+    apply_stock_changes,
+    load_stock_levels,
+    products_table,
+)
+from inventory_management.utils.database import get_database, is_memory_sqlite, wait_for_write
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "ledger_writer"
+
+DURABILITY_MODES = ("sync", "async")
+
+LedgerEntry = namedtuple("LedgerEntry", ["product_id", "quantity_change", "reference", "notes", "user_id", "future"])
+
+class LedgerWriter:
+    """Applies queued stock adjustments in batches that share one commit."""
+
+    def __init__(self, session_factory, write_queue=None, batch_size=1000, flush_interval=0.002,
+                 durability="sync", timeout=30):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"Unknown ledger durability mode: {durability}")
+        self.session_factory = session_factory
+        self.write_queue = write_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.durability = durability
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.entries = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.lost = 0
+        self.flush_seconds = 0.0
+        # Optional callable(batch_size, seconds) told about every flushed batch
+        self.observer = None
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="ledger-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        """Flush what is queued and stop the worker."""
+        self._queue.put(None)
+
+    def submit(self, product_id, quantity_change, reference="", notes="", user_id=None):
+        """Queue an adjustment and return a Future of its StockLevel."""
+        self.start()
+        future = Future()
+        self._queue.put(LedgerEntry(product_id, quantity_change, reference, notes, user_id, future))
+        return future
+
+    def adjust(self, product_id, quantity_change, reference="", notes="", user_id=None):
+        """
+        Queue an adjustment and wait until it is acknowledged; return its StockLevel.
+
+        Raises WriteTimeout after timeout seconds, with pending set if the
+        adjustment was already being written and may still be applied.
+        """
+        future = self.submit(product_id, quantity_change, reference, notes, user_id)
+        return wait_for_write(future, self.timeout, reference=reference or None)
+
+    def flush(self, timeout=None):
+        """Block until every queued adjustment has been written (for tests and shutdown)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.001)
+        return True
+
+    def _take_batch(self):
+        """Wait for an entry, then collect more until batch_size or flush_interval after the first."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while batch[-1] is not None and len(batch) < self.batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            stopping = batch[-1] is None
+            entries = [entry for entry in batch if entry is not None]
+            try:
+                if entries:
+                    self._flush_batch(entries)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stopping:
+                return
+
+    def apply(self, session, entries):
+        """Apply entries on session without committing; return one (StockLevel, error) per entry."""
+        levels = load_stock_levels(session, {entry.product_id for entry in entries}, key_column=products_table.c.id)
+        quantities = {product_id: level.quantity for product_id, level in levels.items()}
+        changes = [
+            StockChange(entry.product_id, entry.quantity_change, entry.reference, entry.notes, entry.user_id)
+            for entry in entries
+        ]
+        outcomes = []
+        for entry, applied in zip(entries, apply_stock_changes(session, changes, quantities)):
+            if applied is not None:
+                old_quantity, quantity = applied
+                outcomes.append((levels[entry.product_id]._replace(old_quantity=old_quantity, quantity=quantity), None))
+            elif entry.product_id in levels:
+                outcomes.append((None, InsufficientStockError(entry.product_id)))
+            else:
+                outcomes.append((None, ProductNotFoundError(entry.product_id)))
+        return outcomes
+
+    def _flush_batch(self, entries):
+        entries = [entry for entry in entries if entry.future.set_running_or_notify_cancel()]
+        if not entries:
+            return
+
+        start = time.perf_counter()
+        acknowledged = False
+        try:
+            if self.write_queue is not None:
+                # No timeout: a batch given up on here could still commit later
+                outcomes = self.write_queue.submit(lambda session: self.apply(session, entries)).result()
+            else:
+                session = self.session_factory()
+                try:
+                    outcomes = self.apply(session, entries)
+                    if self.durability == "async":
+                        self._resolve(entries, outcomes)
+                        acknowledged = True
+                    session.commit()
+                except Exception:
+                    session.rollback()
+                    raise
+                finally:
+                    session.close()
+        except Exception as e:
+            self.failed_batches += 1
+            if acknowledged:
+                lost = sum(1 for _, error in outcomes if error is None)
+                self.lost += lost
+                logger.error(f"Ledger commit failed after acknowledging {lost} adjustments: {str(e)}")
+            else:
+                logger.exception("Ledger batch failed")
+                for entry in entries:
+                    entry.future.set_exception(e)
+            return
+        finally:
+            seconds = time.perf_counter() - start
+            self.entries += len(entries)
+            self.batches += 1
+            self.flush_seconds += seconds
+            if self.observer is not None:
+                self.observer(len(entries), seconds)
+
+        if not acknowledged:
+            self._resolve(entries, outcomes)
+
+    @staticmethod
+    def _resolve(entries, outcomes):
+        for entry, (level, error) in zip(entries, outcomes):
+            if error is None:
+                entry.future.set_result(level)
+            else:
+                entry.future.set_exception(error)
+
+    def stats(self):
+        return {
+            "durability": self.durability,
+            "pending": self._queue.qsize(),
+            "entries": self.entries,
+            "batches": self.batches,
+            "entries_per_batch": round(self.entries / self.batches, 2) if self.batches else 0.0,
+            "mean_flush_ms": round(self.flush_seconds / self.batches * 1000, 3) if self.batches else 0.0,
+            "failed_batches": self.failed_batches,
+            "lost": self.lost,
+        }
+
+def init_ledger(app):
+    """Create the app's ledger writer if LEDGER_ENABLED; its worker starts on the first adjustment."""
+    if not app.config["LEDGER_ENABLED"]:
+        return None
+
+    database = get_database(app)
+    if is_memory_sqlite(database.engine.url):
+        # Each thread would see its own empty in-memory database
+        logger.warning("LEDGER_ENABLED is ignored for in-memory SQLite")
+        return None
+
+    ledger = LedgerWriter(
+        database.session_factory,
+        write_queue=database.write_queue,
+        batch_size=app.config["LEDGER_BATCH_SIZE"],
+        flush_interval=app.config["LEDGER_FLUSH_INTERVAL"],
+        durability=app.config["LEDGER_DURABILITY"],
+        timeout=app.config["DB_POOL_TIMEOUT"]
+    )
+    app.extensions[EXTENSION_KEY] = ledger
+    return ledger
+
+def get_ledger():
+    """Get the ledger writer of the current app, or None if it is disabled."""
+    return current_app.extensions.get(EXTENSION_KEY)
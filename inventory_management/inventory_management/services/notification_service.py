@@ -1,61 +1,275 @@
 import logging
+import os
+import queue
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import threading
+import time
+from collections import namedtuple
 from flask import current_app
 
 logger = logging.getLogger(__name__)
 
+EXTENSION_KEY = "notification_dispatcher"
+
+LowStockAlert = namedtuple("LowStockAlert", ["sku", "name", "quantity", "low_stock_threshold"])
+
+class SMTPConnection:
+    """A single reusable SMTP connection that reconnects when it goes stale."""
+
+    def __init__(self, host, port, username=None, password=None, use_tls=False, timeout=30):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._server = None
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            server.starttls()
+        if self.username:
+            server.login(self.username, self.password)
+        return server
+
+    def _alive(self):
+        try:
+            return self._server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def send(self, msg):
+        """Send a message, reconnecting once if the pooled connection was dropped."""
+        if self._server is None or not self._alive():
+            self.close()
+            self._server = self._connect()
+
+        try:
+            self._server.send_message(msg)
+        except (smtplib.SMTPServerDisconnected, OSError):
+            self.close()
+            self._server = self._connect()
+            self._server.send_message(msg)
+
+    def close(self):
+        if self._server is not None:
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._server = None
+
+class NotificationDispatcher:
+    """
+    Background sender for low stock alerts.
+
+    Requests only enqueue an alert and return. A worker thread collects
+    alerts for up to batch_interval seconds (or batch_size alerts), sends
+    them as one digest email over a pooled SMTP connection, and drops
+    repeated alerts for the same SKU within dedup_window seconds.
+    """
+
+    def __init__(self, connection, sender, recipients, dedup_window=900, batch_size=20,
+                 batch_interval=5.0, queue_size=1000, clock=time.monotonic):
+        self.connection = connection
+        self.sender = sender
+        self.recipients = recipients
+        self.dedup_window = dedup_window
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval
+        self._clock = clock
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._recent = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.sent_emails = 0
+        self.sent_alerts = 0
+        self.deduplicated = 0
+        self.dropped = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="notification-dispatcher", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, product):
+        """Queue a low stock alert for product; return False if it was deduplicated or dropped."""
+        now = self._clock()
+        alert = LowStockAlert(product.sku, product.name, product.quantity, product.low_stock_threshold)
+        with self._lock:
+            last = self._recent.get(product.sku)
+            if last is not None and now - last < self.dedup_window:
+                self.deduplicated += 1
+                return False
+            try:
+                self._queue.put_nowait(alert)
+            except queue.Full:
+                self.dropped += 1
+                queued = False
+            else:
+                # Only an alert that was queued suppresses the next one
+                self._recent[product.sku] = now
+                queued = True
+
+        if not queued:
+            logger.error(f"Notification queue full: dropping low stock alert for {product.sku}")
+            return False
+
+        self.start()
+        return True
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = self._clock() + self.batch_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self.connection.send(self.build_digest(batch))
+                self.sent_emails += 1
+                self.sent_alerts += len(batch)
+                logger.info(f"Low stock digest sent for {len(batch)} products")
+            except Exception as e:
+                logger.error(f"Failed to send notification: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def build_digest(self, alerts):
+        """Build one email listing every alert in the batch."""
+        from email.mime.multipart import MIMEMultipart
+        from email.mime.text import MIMEText
+
+        msg = MIMEMultipart()
+        msg["From"] = self.sender
+        msg["To"] = ", ".join(self.recipients)
+        if len(alerts) == 1:
+            msg["Subject"] = f"Low Stock Alert: {alerts[0].name}"
+        else:
+            msg["Subject"] = f"Low Stock Alert: {len(alerts)} products"
+
+        lines = ["Low Stock Alert", ""]
+        for alert in alerts:
+            lines.append(f"- {alert.name} (SKU {alert.sku}): {alert.quantity} left, threshold {alert.low_stock_threshold}")
+        lines.extend(["", "Please restock these items soon."])
+
+        msg.attach(MIMEText("\n".join(lines), "plain"))
+        return msg
+
+    def flush(self, timeout=None):
+        """Block until every queued alert has been handled (for tests and shutdown)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stats(self):
+        return {
+            "queued": self._queue.qsize(),
+            "sent_emails": self.sent_emails,
+            "sent_alerts": self.sent_alerts,
+            "deduplicated": self.deduplicated,
+            "dropped": self.dropped,
+        }
+
+def smtp_connection(config):
+    """Create an SMTPConnection from the app's SMTP settings."""
+    return SMTPConnection(
+        config["SMTP_HOST"],
+        config["SMTP_PORT"],
+        username=config["SMTP_USERNAME"],
+        password=config["SMTP_PASSWORD"],
+        use_tls=config["SMTP_USE_TLS"]
+    )
+
+def init_notifications(app):
+    """Create the app's notification dispatcher; its worker starts on the first alert."""
+    config = app.config
+    dispatcher = NotificationDispatcher(
+        smtp_connection(config),
+        sender=config["NOTIFICATION_SENDER"],
+        recipients=config["NOTIFICATION_RECIPIENTS"],
+        dedup_window=config["NOTIFICATION_DEDUP_WINDOW"],
+        batch_size=config["NOTIFICATION_BATCH_SIZE"],
+        batch_interval=config["NOTIFICATION_BATCH_INTERVAL"]
+    )
+    app.extensions[EXTENSION_KEY] = dispatcher
+    return dispatcher
+
+def get_dispatcher():
+    """Get the notification dispatcher of the current app."""
+    return current_app.extensions[EXTENSION_KEY]
+
 def send_low_stock_notification(product):
-    """Send notification when product stock is low."""
+    """Queue a notification when product stock is low; returns immediately."""
     if not current_app.config["NOTIFICATION_ENABLED"]:
         logger.info(f"Notifications disabled: Skipping low stock alert for {product.name}")
         return False
-    
-    smtp_server = "smtp.example.com"
-    smtp_port = 587
-    smtp_username = "inventory@example.com"
-    smtp_password = "password123"  # Security issue: Hardcoded password
-    
-    sender = "inventory@example.com"
-    recipients = ["manager@example.com"]
-    
-    # Create message
+
+    return get_dispatcher().enqueue(product)
+
+def build_report_email(sender, recipient, report):
+    """Build an email with the report summary in the body and the report files attached."""
+    from email.mime.application import MIMEApplication
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     msg = MIMEMultipart()
     msg["From"] = sender
-    msg["To"] = ", ".join(recipients)
-    msg["Subject"] = f"Low Stock Alert: {product.name}"
-    
-    body = f"""
-    Low Stock Alert
-    
-    Product: {product.name}
-    SKU: {product.sku}
-    Current Quantity: {product.quantity}
-    Low Stock Threshold: {product.low_stock_threshold}
-    
-    Please restock this item soon.
-    """
-    
-    msg.attach(MIMEText(body, "plain"))
-    
-    try:
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.login(smtp_username, smtp_password)
-        server.send_message(msg)
-        server.quit()
-        
-        logger.info(f"Low stock notification sent for {product.name}")
-        return True
-    except Exception as e:
-        logger.error(f"Failed to send notification: {str(e)}")
-        return False
+    msg["To"] = recipient
+    msg["Subject"] = f"Inventory Report: {report.generated_at:%Y-%m-%d}"
+
+    summary = report.summary
+    lines = [
+        f"Inventory report for the {report.period_days} days to {report.generated_at:%Y-%m-%d %H:%M} UTC",
+        "",
+        f"Products: {summary['products']}",
+        f"Units on hand: {summary['quantity']}",
+        f"Stock valuation: {summary['valuation']:.2f}",
+        f"Units out: {summary['units_out']}",
+        "",
+        "Top categories by valuation:",
+    ]
+    for row in report.categories.head(10).itertuples():
+        lines.append(f"- {row.category}: {row.valuation:.2f} ({row.quantity} units)")
+
+    msg.attach(MIMEText("\n".join(lines), "plain"))
+
+    for path in report.files:
+        with open(path, "rb") as f:
+            attachment = MIMEApplication(f.read(), Name=os.path.basename(path))
+        attachment["Content-Disposition"] = f'attachment; filename="{os.path.basename(path)}"'
+        msg.attach(attachment)
+
+    return msg
 
 def send_inventory_report(recipient, report_data):
-    """Send inventory report to specified recipient."""
+    """Send an InventoryReport (see services.reporting) to the specified recipient."""
     if not current_app.config["NOTIFICATION_ENABLED"]:
         logger.info("Notifications disabled: Skipping inventory report")
         return False
-    
-    logger.warning("send_inventory_report not implemented")
-    return False
+
+    connection = smtp_connection(current_app.config)
+    try:
+        connection.send(build_report_email(current_app.config["NOTIFICATION_SENDER"], recipient, report_data))
+        logger.info(f"Inventory report sent to {recipient}")
+        return True
+    except Exception as e:
+        logger.error(f"Failed to send inventory report: {str(e)}")
+        return False
+    finally:
+        connection.close()
@@ -0,0 +1,130 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+from flask import current_app, has_app_context
+from sqlalchemy import event, select
+from inventory_management.models.user import Role, Permission, RolePermission
+from inventory_management.utils.database import get_database, get_db
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "role_permissions"
+
+# Permissions checked by the blueprints in services/
+DEFAULT_PERMISSIONS = {
+    "manage_products": "Create and edit products and categories",
+    "adjust_stock": "Adjust product stock levels",
+}
+
+# Roles created by `flask seed-db`, with their permission names
+DEFAULT_ROLES = {
+    "admin": ("Administrator", ("manage_products", "adjust_stock")),
+    "manager": ("Inventory manager", ("manage_products", "adjust_stock")),
+    "clerk": ("Warehouse clerk", ("adjust_stock",)),
+    "viewer": ("Read-only access", ()),
+}
+
+class RolePermissionRegistry:
+    """
+    Per-process map of role id to the frozenset of its permission names.
+
+    All roles are loaded with one query on first use, so a permission check
+    is a set lookup. The map is dropped whenever a commit touches roles,
+    permissions or role_permissions, and re-read after ttl seconds so
+    changes made by other processes are picked up too.
+    """
+
+    def __init__(self, ttl=300, clock=time.monotonic):
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._roles = None
+        self._loaded_at = 0.0
+
+    def get(self, db, role_id):
+        """Return the frozenset of permission names granted to a role."""
+        roles = self._roles
+        if roles is None or self._clock() - self._loaded_at > self.ttl:
+            roles = self.load(db)
+        return roles.get(role_id, frozenset())
+
+    def load(self, db):
+        """Read every role's permissions from the database."""
+        grouped = defaultdict(set)
+        rows = db.execute(
+            select(RolePermission.role_id, Permission.name)
+            .join(Permission, RolePermission.permission_id == Permission.id)
+        )
+        for role_id, name in rows:
+            grouped[role_id].add(name)
+
+        roles = {role_id: frozenset(names) for role_id, names in grouped.items()}
+        with self._lock:
+            self._roles = roles
+            self._loaded_at = self._clock()
+        return roles
+
+    def invalidate(self):
+        with self._lock:
+            self._roles = None
+
+def init_role_permissions(app):
+    """Create the app's role permission registry and refresh it on relevant commits."""
+    registry = RolePermissionRegistry(ttl=app.config["ROLE_PERMISSION_TTL"])
+    app.extensions[EXTENSION_KEY] = registry
+    session_factory = get_database(app).session_factory
+
+    @event.listens_for(session_factory, "after_flush")
+    def track_permission_changes(session, flush_context):
+        changed = session.new | session.dirty | session.deleted
+        if any(isinstance(obj, (Role, Permission, RolePermission)) for obj in changed):
+            session.info["role_permissions_changed"] = True
+
+    @event.listens_for(session_factory, "after_commit")
+    def refresh_role_permissions(session):
+        if session.info.pop("role_permissions_changed", False):
+            registry.invalidate()
+
+    @event.listens_for(session_factory, "after_rollback")
+    def forget_permission_changes(session):
+        session.info.pop("role_permissions_changed", None)
+
+    return registry
+
+def get_role_permissions(role_id, db=None):
+    """Return the permission names of a role, using the app registry when available."""
+    if has_app_context() and EXTENSION_KEY in current_app.extensions:
+        return current_app.extensions[EXTENSION_KEY].get(db or get_db(), role_id)
+
+    # Outside an app (scripts, shells) read the role directly
+    return frozenset(db.scalars(
+        select(Permission.name)
+        .join(RolePermission, RolePermission.permission_id == Permission.id)
+        .where(RolePermission.role_id == role_id)
+    ))
+
+def seed_roles_and_permissions(db):
+    """Create the default permissions and roles if they do not exist yet."""
+    permissions = {p.name: p for p in db.query(Permission).all()}
+    for name, description in DEFAULT_PERMISSIONS.items():
+        if name not in permissions:
+            permissions[name] = Permission(name=name, description=description)
+            db.add(permissions[name])
+
+    roles = {r.name: r for r in db.query(Role).all()}
+    for name, (description, permission_names) in DEFAULT_ROLES.items():
+        role = roles.get(name)
+        if role is None:
+            role = roles[name] = Role(name=name, description=description)
+            db.add(role)
+        db.flush()
+
+        granted = {rp.permission_id for rp in role.permissions}
+        for permission_name in permission_names:
+            permission = permissions[permission_name]
+            if permission.id not in granted:
+                db.add(RolePermission(role_id=role.id, permission_id=permission.id))
+
+    db.commit()
+    return roles
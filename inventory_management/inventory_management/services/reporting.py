@@ -0,0 +1,172 @@
+"""
+Inventory reporting with pandas.
+
+The report is built from chunked reads (pd.read_sql(chunksize=...)) so
+memory stays bounded by the chunk size rather than the catalog size:
+
+- transactions are reduced in SQL to units sold per product over the
+  period, and those per-product totals are read in chunks;
+- products are read in chunks, and each chunk gets its valuation,
+  turnover and days of cover with vectorized operations before it is
+  appended to the output file and folded into the per-category totals.
+
+Turnover is units removed during the period divided by the quantity on
+hand, and days of cover is the quantity on hand divided by the average
+units removed per day; both are empty when undefined (no stock, no sales).
+
+pandas is an optional dependency (the "reporting" extra) and is imported
+when a report is built, not when this module is, so the app starts
+without it.
+"""
+import logging
+import os
+from collections import namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy import case, func, select
+from inventory_management.models.inventory import Category, InventoryTransaction, Product
+
+logger = logging.getLogger(__name__)
+
+REPORT_FORMATS = ("csv", "parquet")
+
+PRODUCT_COLUMNS = [
+    "id", "sku", "name", "category_id", "active", "price", "quantity",
+    "valuation", "units_out", "turnover", "days_of_cover",
+]
+CATEGORY_COLUMNS = ["category_id", "category", "products", "quantity", "valuation", "units_out", "turnover", "days_of_cover"]
+
+InventoryReport = namedtuple("InventoryReport", ["generated_at", "period_days", "summary", "categories", "files"])
+
+class ReportWriter:
+    """Append DataFrame chunks to one CSV or Parquet file."""
+
+    def __init__(self, path, fmt):
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unsupported report format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self._parquet = None
+        self._header = True
+
+    def write(self, frame):
+        if self.fmt == "csv":
+            frame.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+            return
+
+        # pyarrow is only needed for Parquet output
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        if self._parquet is None:
+            self._parquet = pq.ParquetWriter(self.path, table.schema)
+        self._parquet.write_table(table.cast(self._parquet.schema))
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+def import_pandas():
+    """Import pandas, raising ImportError with install instructions if it is missing."""
+    try:
+        import pandas
+    except ImportError as e:
+        raise ImportError('Inventory reports need pandas: pip install -e ".[reporting]"') from e
+    return pandas
+
+def ratio(numerator, denominator):
+    """Element-wise numerator / denominator with NaN where the denominator is zero."""
+    return numerator / denominator.where(denominator != 0)
+
+def add_metrics(frame, period_days):
+    """Add turnover and days of cover to a frame with quantity and units_out columns."""
+    frame["turnover"] = ratio(frame["units_out"], frame["quantity"]).round(4)
+    frame["days_of_cover"] = ratio(frame["quantity"], frame["units_out"] / period_days).round(1)
+    return frame
+
+def units_out_query(since):
+    """Units removed per product since a point in time, aggregated in the database."""
+    t = InventoryTransaction
+    removed = case((t.quantity_change < 0, -t.quantity_change), else_=0)
+    return (
+        select(t.product_id, func.sum(removed).label("units_out"))
+        .where(t.timestamp >= since)
+        .group_by(t.product_id)
+    )
+
+def load_units_out(connection, since, chunksize):
+    """Read per-product units removed in chunks into a Series indexed by product id."""
+    pd = import_pandas()
+    chunks = [
+        chunk.set_index("product_id")["units_out"]
+        for chunk in pd.read_sql(units_out_query(since), connection, chunksize=chunksize)
+    ]
+    if not chunks:
+        return pd.Series(dtype="int64")
+    return pd.concat(chunks).astype("int64")
+
+def build_inventory_report(engine, output_dir, fmt="csv", period_days=30, chunksize=100_000, now=None):
+    """
+    Build the inventory report and write products.<fmt> and categories.<fmt> to output_dir.
+
+    Returns an InventoryReport with the overall summary, the per-category
+    DataFrame and the paths of the written files.
+    """
+    pd = import_pandas()
+    generated_at = now or datetime.utcnow()
+    since = generated_at - timedelta(days=period_days)
+    os.makedirs(output_dir, exist_ok=True)
+    products_path = os.path.join(output_dir, f"products.{fmt}")
+    categories_path = os.path.join(output_dir, f"categories.{fmt}")
+
+    p = Product
+    products_stmt = select(p.id, p.sku, p.name, p.category_id, p.active, p.price, p.quantity).order_by(p.id)
+    category_totals = []
+
+    with engine.connect() as connection:
+        units_out = load_units_out(connection, since, chunksize)
+        categories = pd.read_sql(select(Category.id.label("category_id"), Category.name.label("category")), connection)
+
+        writer = ReportWriter(products_path, fmt)
+        try:
+            for chunk in pd.read_sql(products_stmt, connection, chunksize=chunksize):
+                chunk["category_id"] = chunk["category_id"].astype("Int64")
+                chunk["valuation"] = (chunk["price"] * chunk["quantity"]).round(2)
+                chunk["units_out"] = chunk["id"].map(units_out).fillna(0).astype("int64")
+                writer.write(add_metrics(chunk, period_days)[PRODUCT_COLUMNS])
+
+                category_totals.append(
+                    chunk.groupby("category_id", dropna=False)
+                    .agg(products=("id", "size"), quantity=("quantity", "sum"),
+                         valuation=("valuation", "sum"), units_out=("units_out", "sum"))
+                )
+        finally:
+            writer.close()
+
+    if category_totals:
+        by_category = pd.concat(category_totals).groupby(level=0, dropna=False).sum().reset_index()
+    else:
+        by_category = pd.DataFrame(columns=["category_id", "products", "quantity", "valuation", "units_out"])
+    by_category["category_id"] = by_category["category_id"].astype("Int64")
+    categories["category_id"] = categories["category_id"].astype("Int64")
+    by_category = by_category.merge(categories, on="category_id", how="left")
+    by_category["category"] = by_category["category"].fillna("Uncategorized")
+    by_category["valuation"] = by_category["valuation"].astype("float64").round(2)
+    by_category = add_metrics(by_category, period_days)[CATEGORY_COLUMNS].sort_values("valuation", ascending=False)
+
+    writer = ReportWriter(categories_path, fmt)
+    try:
+        writer.write(by_category)
+    finally:
+        writer.close()
+
+    summary = {
+        "products": int(by_category["products"].sum()),
+        "quantity": int(by_category["quantity"].sum()),
+        "valuation": round(float(by_category["valuation"].sum()), 2),
+        "units_out": int(by_category["units_out"].sum()),
+    }
+    logger.info(f"Inventory report written to {output_dir}: {summary['products']} products, valuation {summary['valuation']}")
+
+    return InventoryReport(generated_at, period_days, summary, by_category, [products_path, categories_path])
@@ -0,0 +1,151 @@
+import logging
+import threading
+import time
+import uuid
+from collections import defaultdict, namedtuple
+from functools import wraps
+from flask import Response, current_app, request
+from sqlalchemy import event
+from inventory_management.utils.cache import TTLCache
+from inventory_management.utils.database import get_database
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "response_cache"
+
+CachedResponse = namedtuple("CachedResponse", ["body", "mimetype"])
+
+class TableVersions:
+    """Per-process write counters, one per table name, bumped after each commit that writes the table."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._versions = defaultdict(int)
+
+    def get(self, tables):
+        with self._lock:
+            return tuple(self._versions[table] for table in tables)
+
+    def bump(self, tables):
+        with self._lock:
+            for table in tables:
+                self._versions[table] += 1
+
+class ResponseCache:
+    """
+    Per-process read-through cache of rendered GET responses.
+
+    Each cached body is keyed by its URL and the versions of the tables its
+    route reads, so it is served until one of those tables is written (the
+    version is bumped when the writing session commits) or its TTL
+    expires, which bounds staleness when another process did the write.
+
+    The ETag is built from those table versions, so a matching
+    If-None-Match is answered with 304 before the view runs or the cache is
+    looked up. It also names this cache instance, since another process's
+    counters say nothing about the data this one has seen, and the current
+    TTL period, so a client revalidates at least once per TTL.
+    """
+
+    def __init__(self, maxsize=1024, ttl=30, clock=time.time):
+        self.versions = TableVersions()
+        self.ttl = ttl
+        self._clock = clock
+        self._instance = uuid.uuid4().hex[:12]
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.not_modified = 0
+
+    def etag(self, versions):
+        period = int(self._clock() // self.ttl) if self.ttl else 0
+        return "-".join([self._instance, str(period), *(str(version) for version in versions)])
+
+    def respond(self, tables, render):
+        """Return the cached response for the current request, calling render() on a miss."""
+        # Versions are read before rendering, so a write that commits
+        # meanwhile makes the entry unreachable rather than wrongly fresh
+        versions = self.versions.get(tables)
+        etag = self.etag(versions)
+        if request.if_none_match.contains(etag):
+            self.not_modified += 1
+            response = Response(status=304)
+            response.set_etag(etag)
+            response.headers["Cache-Control"] = "private, no-cache"
+            return response
+
+        # Entries written before the last write to one of the tables are
+        # never looked up again and age out of the LRU
+        key = (request.full_path, versions)
+        entry = self._cache.get(key)
+        if entry is None:
+            response = current_app.make_response(render())
+            if response.status_code != 200 or response.is_streamed:
+                return response
+
+            entry = CachedResponse(response.get_data(), response.mimetype)
+            self._cache.set(key, entry)
+
+        response = Response(entry.body, status=200, mimetype=entry.mimetype)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "private, no-cache"
+        return response
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        stats = self._cache.stats()
+        stats["not_modified"] = self.not_modified
+        return stats
+
+def written_table(orm_execute_state):
+    """Name of the table an INSERT, UPDATE or DELETE run through the session writes, if any."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        return getattr(table, "name", None)
+    return None
+
+def init_response_cache(app):
+    """Create the app's response cache and bump table versions after each commit that writes them."""
+    cache = ResponseCache(maxsize=app.config["RESPONSE_CACHE_SIZE"], ttl=app.config["RESPONSE_CACHE_TTL"])
+    app.extensions[EXTENSION_KEY] = cache
+    session_factory = get_database(app).session_factory
+
+    @event.listens_for(session_factory, "after_flush")
+    def track_flushed_tables(session, flush_context):
+        changed = session.new | session.dirty | session.deleted
+        if changed:
+            session.info.setdefault("written_tables", set()).update(obj.__table__.name for obj in changed)
+
+    @event.listens_for(session_factory, "do_orm_execute")
+    def track_executed_tables(orm_execute_state):
+        table = written_table(orm_execute_state)
+        if table is not None:
+            orm_execute_state.session.info.setdefault("written_tables", set()).add(table)
+
+    @event.listens_for(session_factory, "after_commit")
+    def bump_table_versions(session):
+        tables = session.info.pop("written_tables", None)
+        if tables:
+            cache.versions.bump(tables)
+
+    @event.listens_for(session_factory, "after_rollback")
+    def forget_written_tables(session):
+        session.info.pop("written_tables", None)
+
+    return cache
+
+def get_response_cache():
+    """Get the response cache of the current app, or None if it is disabled."""
+    return current_app.extensions.get(EXTENSION_KEY)
+
+def cached_response(*tables):
+    """Serve a GET view from the response cache until one of the tables it reads is written."""
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            cache = get_response_cache()
+            if cache is None:
+                return f(*args, **kwargs)
+            return cache.respond(tables, lambda: f(*args, **kwargs))
+        return decorated
+    return decorator
@@ -0,0 +1,179 @@
+"""
+Product search over SKU, name and description.
+
+On SQLite, products_fts is an FTS5 index of sku, name, description and
+category_id, created by migration 6 as an external content table (the
+text is stored once, in products) and kept in sync by triggers. Only
+changes to those columns touch the index, so stock adjustments do not.
+
+Every query term matches as a prefix. The index keeps prefixes of 2 to 8
+characters, so a prefix term reads one doclist incrementally instead of
+merging the doclists of every word it starts. Longer terms are matched by
+their first 8 characters and the candidates checked for the whole term.
+The category filter is a term on the category_id column, so FTS
+intersects it with the query terms.
+
+Ranking does not use bm25: its statistics need every match of every term
+on each query, which costs more than the search at a million rows.
+Instead the first max_candidates matches (in rowid order) are scored by
+the column each term matches, weighting SKU over name over description,
+and shorter names win ties. A query matching half the catalog costs about
+the same as one matching a hundred products, at the price of not ranking
+matches past the window.
+
+A query that looks like a SKU also matches products whose SKU starts with
+it, as a range scan on the unique SKU index; those rank first.
+
+Other databases fall back to LIKE prefix matching, which is not indexed.
+"""
+import logging
+import re
+from sqlalchemy import column, literal_column, or_, select, table
+from inventory_management.models.inventory import Product
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "products_fts"
+
+# Prefix lengths with their own index in products_fts
+PREFIX_LENGTHS = range(2, 9)
+LONGEST_PREFIX = PREFIX_LENGTHS[-1]
+
+# Score of a term by the column it matches a word of
+SKU_WEIGHT, NAME_WEIGHT, DESCRIPTION_WEIGHT = 10, 5, 1
+
+# Runs of letters and digits, which is how FTS5's unicode61 tokenizer splits text
+TERM_PATTERN = re.compile(r"[^\W_]+")
+
+SKU_PREFIX_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9-]*")
+
+products_fts = table(FTS_TABLE, column("rowid"))
+
+def create_search_index(connection):
+    """Create products_fts and its sync triggers if missing, and index existing products."""
+    if connection.dialect.name != "sqlite":
+        return
+
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first()
+    if exists:
+        return
+
+    columns = "sku, name, description, category_id"
+    connection.exec_driver_sql(
+        f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5({columns}, content='products', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='{' '.join(map(str, PREFIX_LENGTHS))}')"
+    )
+    insert_row = (
+        f"INSERT INTO {FTS_TABLE}(rowid, {columns}) "
+        "VALUES (new.id, new.sku, new.name, new.description, new.category_id);"
+    )
+    delete_row = (
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {columns}) "
+        "VALUES ('delete', old.id, old.sku, old.name, old.description, old.category_id);"
+    )
+    connection.exec_driver_sql(f"CREATE TRIGGER products_fts_insert AFTER INSERT ON products BEGIN {insert_row} END")
+    connection.exec_driver_sql(f"CREATE TRIGGER products_fts_delete AFTER DELETE ON products BEGIN {delete_row} END")
+    connection.exec_driver_sql(
+        f"CREATE TRIGGER products_fts_update AFTER UPDATE OF {columns} ON products "
+        f"BEGIN {delete_row} {insert_row} END"
+    )
+    connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+def search_terms(query):
+    """Split a search query into lowercase terms."""
+    return TERM_PATTERN.findall(query.lower())
+
+def fts_match(terms, category_id=None):
+    """FTS5 query matching products that contain every term as a prefix (in the category, if given)."""
+    match = "{sku name description} : (" + " AND ".join(f'"{term[:LONGEST_PREFIX]}"*' for term in terms) + ")"
+    if category_id is not None:
+        match = f'category_id : "{int(category_id)}" AND {match}'
+    return match
+
+def word_prefix_patterns(terms):
+    """Compile one pattern per term matching it at the start of a word."""
+    return [re.compile(rf"(?<![^\W_]){re.escape(term)}", re.IGNORECASE) for term in terms]
+
+def match_score(row, patterns):
+    """Score an FTS match by the best column each term is a prefix of a word in."""
+    score = 0
+    for pattern in patterns:
+        if pattern.search(row.sku):
+            score += SKU_WEIGHT
+        elif pattern.search(row.name):
+            score += NAME_WEIGHT
+        else:
+            # FTS matched it, so it is in the description
+            score += DESCRIPTION_WEIGHT
+    return score
+
+def sku_prefix_matches(db, query, limit, category_id=None):
+    """Products whose SKU starts with query, as typed or uppercased, in SKU order."""
+    prefix = query.strip()
+    if not SKU_PREFIX_PATTERN.fullmatch(prefix):
+        return []
+
+    # One index range scan per spelling; an OR of ranges would sort every match
+    products = []
+    for value in sorted({prefix, prefix.upper()}):
+        upper = value[:-1] + chr(ord(value[-1]) + 1)
+        stmt = select(Product).where(Product.sku >= value, Product.sku < upper)
+        if category_id is not None:
+            stmt = stmt.where(Product.category_id == category_id)
+        products.extend(db.scalars(stmt.order_by(Product.sku).limit(limit)))
+    return sorted(products, key=lambda p: p.sku)[:limit]
+
+def ranked_matches(db, terms, limit, category_id, exclude, max_candidates):
+    """Up to limit FTS matches, ranked by match_score."""
+    candidates = (
+        select(Product.id, Product.sku, Product.name, Product.description)
+        .select_from(products_fts)
+        .join(Product, Product.id == products_fts.c.rowid)
+        .where(literal_column(FTS_TABLE).op("MATCH")(fts_match(terms, category_id)))
+    )
+    if exclude:
+        candidates = candidates.where(products_fts.c.rowid.not_in(exclude))
+    rows = db.execute(candidates.limit(max_candidates)).all()
+    if not rows:
+        return []
+
+    patterns = word_prefix_patterns(terms)
+    truncated = [pattern for term, pattern in zip(terms, patterns) if len(term) > LONGEST_PREFIX]
+    if truncated:
+        rows = [
+            row for row in rows
+            if all(p.search(row.sku) or p.search(row.name) or p.search(row.description or "") for p in truncated)
+        ]
+    ranked = sorted(rows, key=lambda row: (-match_score(row, patterns), len(row.name), row.id))[:limit]
+
+    products = {p.id: p for p in db.scalars(select(Product).where(Product.id.in_([row.id for row in ranked])))}
+    return [products[row.id] for row in ranked]
+
+def search_products(db, query, limit, category_id=None, max_candidates=250):
+    """Return up to limit products matching query, best matches first."""
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    products = sku_prefix_matches(db, query, limit, category_id)
+    remaining = limit - len(products)
+    if remaining <= 0:
+        return products
+
+    seen = [product.id for product in products]
+    if db.get_bind().dialect.name == "sqlite":
+        products.extend(ranked_matches(db, terms, remaining, category_id, seen, max(max_candidates, remaining)))
+        return products
+
+    stmt = select(Product).where(*(
+        or_(Product.sku.ilike(f"{term}%"), Product.name.ilike(f"{term}%"), Product.name.ilike(f"% {term}%"))
+        for term in terms
+    ))
+    if category_id is not None:
+        stmt = stmt.where(Product.category_id == category_id)
+    if seen:
+        stmt = stmt.where(Product.id.not_in(seen))
+    products.extend(db.scalars(stmt.order_by(Product.name).limit(remaining)))
+    return products
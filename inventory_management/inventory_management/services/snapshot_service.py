@@ -0,0 +1,147 @@
+"""
+Stock snapshots and point-in-time stock queries.
+
+InventoryTransaction is an append-only ledger, but products are created
+with an opening quantity that has no transaction, so history cannot be
+replayed from zero. Instead a snapshot records a product's quantity at a
+checkpoint, and the quantity at any other time is the nearest snapshot
+plus (or minus) the transactions between the two. With the
+(product_id, timestamp, id) index that costs O(transactions since the
+snapshot), not O(history).
+"""
+import logging
+from collections import namedtuple
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, insert, select
+from inventory_management.models.inventory import Product, InventoryTransaction, StockSnapshot
+from inventory_management.services.stock_service import ProductNotFoundError
+
+logger = logging.getLogger(__name__)
+
+snapshots_table = StockSnapshot.__table__
+
+StockAsOf = namedtuple("StockAsOf", ["product_id", "as_of", "quantity", "snapshot_at", "replayed"])
+
+def snapshot_cutoff(settle_seconds, now=None):
+    """Return the default snapshot time: now minus the settle period for in-flight writes."""
+    return (now or datetime.utcnow()) - timedelta(seconds=settle_seconds)
+
+def sum_changes(db, product_ids, after=None, until=None):
+    """Return {product_id: (sum of quantity_change, count)} for after < timestamp <= until."""
+    t = InventoryTransaction
+    stmt = select(t.product_id, func.sum(t.quantity_change), func.count()).where(t.product_id.in_(product_ids))
+    if after is not None:
+        stmt = stmt.where(t.timestamp > after)
+    if until is not None:
+        stmt = stmt.where(t.timestamp <= until)
+
+    return {row[0]: (row[1], row[2]) for row in db.execute(stmt.group_by(t.product_id))}
+
+def take_stock_snapshots(db, taken_at, batch_size=1000):
+    """
+    Snapshot every product whose stock changed since its last snapshot.
+
+    Works through products in id batches, committing each. A product that
+    already has a snapshot gets a new one only if transactions were added
+    since, computed as that snapshot plus the new transactions; a product
+    without one is anchored on its current quantity minus any transactions
+    after taken_at. Re-running is therefore cheap and only touches
+    products with new activity. Returns the number of snapshots written.
+    """
+    p, s = Product, StockSnapshot
+    written = 0
+    after_id = 0
+
+    while True:
+        products = db.execute(
+            select(p.id, p.quantity, p.created_at).where(p.id > after_id).order_by(p.id).limit(batch_size)
+        ).all()
+        if not products:
+            break
+        first_id, after_id = products[0].id, products[-1].id
+
+        # Latest snapshot at or before taken_at of each product in the batch
+        latest_at = (
+            select(s.product_id, func.max(s.taken_at).label("taken_at"))
+            .where(s.product_id.between(first_id, after_id), s.taken_at <= taken_at)
+            .group_by(s.product_id)
+            .subquery()
+        )
+        latest = {
+            row.product_id: row for row in db.execute(
+                select(s.product_id, s.taken_at, s.quantity)
+                .join(latest_at, and_(s.product_id == latest_at.c.product_id, s.taken_at == latest_at.c.taken_at))
+            )
+        }
+
+        # Transactions since each product's snapshot, in one grouped query
+        t = InventoryTransaction
+        since_snapshot = {
+            row[0]: (row[1], row[2]) for row in db.execute(
+                select(t.product_id, func.sum(t.quantity_change), func.count())
+                .join(latest_at, t.product_id == latest_at.c.product_id)
+                .where(t.timestamp > latest_at.c.taken_at, t.timestamp <= taken_at)
+                .group_by(t.product_id)
+            )
+        }
+
+        unanchored = [
+            row.id for row in products
+            if row.id not in latest and (row.created_at is None or row.created_at <= taken_at)
+        ]
+        after_cutoff = sum_changes(db, unanchored, after=taken_at) if unanchored else {}
+
+        values = []
+        for product_id, snapshot in latest.items():
+            change, count = since_snapshot.get(product_id, (0, 0))
+            if count:
+                values.append({"product_id": product_id, "taken_at": taken_at, "quantity": snapshot.quantity + change})
+        for row in products:
+            if row.id in unanchored:
+                change, _ = after_cutoff.get(row.id, (0, 0))
+                values.append({"product_id": row.id, "taken_at": taken_at, "quantity": row.quantity - change})
+
+        if values:
+            db.execute(insert(snapshots_table).values(created_at=datetime.utcnow()), values)
+            written += len(values)
+        db.commit()
+
+    logger.info(f"Wrote {written} stock snapshots at {taken_at.isoformat()}")
+    return written
+
+def stock_as_of(db, product_id, as_of):
+    """
+    Return the quantity of a product at as_of as a StockAsOf.
+
+    Starts from the latest snapshot at or before as_of and applies the
+    later transactions. Before the first snapshot it works backwards from
+    the earliest later snapshot, or from the current quantity if the
+    product has never been snapshotted.
+    """
+    p, s = Product, StockSnapshot
+    product = db.execute(select(p.id, p.quantity, p.created_at).where(p.id == product_id)).first()
+    if product is None:
+        raise ProductNotFoundError(product_id)
+
+    if product.created_at is not None and as_of < product.created_at:
+        return StockAsOf(product_id, as_of, 0, None, 0)
+
+    before = db.execute(
+        select(s.taken_at, s.quantity)
+        .where(s.product_id == product_id, s.taken_at <= as_of)
+        .order_by(s.taken_at.desc())
+        .limit(1)
+    ).first()
+    if before is not None:
+        change, count = sum_changes(db, [product_id], after=before.taken_at, until=as_of).get(product_id, (0, 0))
+        return StockAsOf(product_id, as_of, before.quantity + change, before.taken_at, count)
+
+    after = db.execute(
+        select(s.taken_at, s.quantity)
+        .where(s.product_id == product_id, s.taken_at > as_of)
+        .order_by(s.taken_at)
+        .limit(1)
+    ).first()
+    anchor_at, anchor_quantity = (after.taken_at, after.quantity) if after is not None else (None, product.quantity)
+    change, count = sum_changes(db, [product_id], after=as_of, until=anchor_at).get(product_id, (0, 0))
+    return StockAsOf(product_id, as_of, anchor_quantity - change, anchor_at, count)
@@ -0,0 +1,261 @@
+import logging
+from collections import defaultdict, namedtuple
+from datetime import datetime
+from sqlalchemy import bindparam, insert, select, update
+from inventory_management.models.inventory import Product, InventoryTransaction
+
+logger = logging.getLogger(__name__)
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+SKU_LOOKUP_CHUNK_SIZE = 500
+
+products_table = Product.__table__
+transactions_table = InventoryTransaction.__table__
+
+# Result of an atomic adjustment; attribute names match Product so it can be
+# handed to send_low_stock_notification() without loading the ORM object.
+StockLevel = namedtuple("StockLevel", ["id", "sku", "name", "old_quantity", "quantity", "low_stock_threshold"])
+
+# One change for apply_stock_changes(), recorded as an InventoryTransaction
+StockChange = namedtuple("StockChange", ["product_id", "quantity_change", "reference", "notes", "user_id"])
+
+class ProductNotFoundError(Exception):
+    """Raised when an adjustment targets a product that does not exist."""
+
+class InsufficientStockError(Exception):
+    """Raised when an adjustment would take stock below zero."""
+
+def adjust_quantity(db, product_id, quantity_change):
+    """
+    Atomically add quantity_change to a product's stock.
+
+    The change runs in the database as one conditional statement,
+    UPDATE products SET quantity = quantity + :d WHERE id = :id AND
+    quantity + :d >= 0 RETURNING ..., so concurrent adjustments never lose
+    updates and no ORM load is needed. Backends without UPDATE ... RETURNING
+    lock the row with SELECT ... FOR UPDATE first.
+
+    Does not commit. Returns a StockLevel with the old and new quantity.
+    """
+    stmt = (
+        update(products_table)
+        .where(products_table.c.id == product_id)
+        .where(products_table.c.quantity + quantity_change >= 0)
+        .values(quantity=products_table.c.quantity + quantity_change, updated_at=datetime.utcnow())
+    )
+    columns = (products_table.c.sku, products_table.c.name, products_table.c.quantity, products_table.c.low_stock_threshold)
+
+    if db.get_bind().dialect.update_returning:
+        row = db.execute(stmt.returning(*columns)).first()
+    else:
+        row = db.execute(
+            select(*columns).where(products_table.c.id == product_id).with_for_update()
+        ).first()
+        if row is not None and row.quantity + quantity_change >= 0:
+            db.execute(stmt)
+            row = row._replace(quantity=row.quantity + quantity_change)
+        else:
+            row = None
+
+    if row is None:
+        exists = db.execute(select(products_table.c.id).where(products_table.c.id == product_id)).first()
+        if exists is None:
+            raise ProductNotFoundError(product_id)
+        raise InsufficientStockError(product_id)
+
+    return StockLevel(
+        id=product_id,
+        sku=row.sku,
+        name=row.name,
+        old_quantity=row.quantity - quantity_change,
+        quantity=row.quantity,
+        low_stock_threshold=row.low_stock_threshold
+    )
+
+def validate_adjustment(record):
+    """Validate one bulk adjustment record; return an error message or None."""
+    if not isinstance(record, dict):
+        return "Adjustment must be an object"
+
+    if not isinstance(record.get("sku"), str) or not record["sku"]:
+        return "Missing required field: sku"
+
+    quantity_change = record.get("quantity_change")
+    if not isinstance(quantity_change, int) or isinstance(quantity_change, bool) or quantity_change == 0:
+        return "quantity_change must be a non-zero integer"
+
+    reference = record.get("reference")
+    if reference is not None and (not isinstance(reference, str) or len(reference) > 100):
+        return "reference must be a string of at most 100 characters"
+
+    return None
+
+def load_stock_levels(db, keys, key_column=products_table.c.sku):
+    """
+    Map key -> StockLevel for the products whose key_column (SKU by default)
+    is in keys, locking their rows where SELECT ... FOR UPDATE is supported.
+    """
+    keys = list(keys)
+    p = products_table.c
+    levels = {}
+    for start in range(0, len(keys), SKU_LOOKUP_CHUNK_SIZE):
+        chunk = keys[start:start + SKU_LOOKUP_CHUNK_SIZE]
+        rows = db.execute(
+            select(key_column.label("key"), p.id, p.sku, p.name, p.quantity, p.low_stock_threshold)
+            .where(key_column.in_(chunk))
+            .with_for_update()
+        )
+        for row in rows:
+            levels[row.key] = StockLevel(row.id, row.sku, row.name, row.quantity, row.quantity, row.low_stock_threshold)
+
+    return levels
+
+def apply_stock_changes(db, changes, quantities, now=None):
+    """
+    Apply StockChanges in order, starting from quantities (product id -> stock).
+
+    A change to a product missing from quantities, or one that would take
+    its stock below zero, is skipped without affecting the others.
+
+    quantities may be stale: SQLite ignores FOR UPDATE, so another writer
+    can change a product between the read and the write. Each product's
+    net change is therefore written with a relative UPDATE guarded like
+    adjust_quantity's (quantity + lowest running change >= 0), and if the
+    guard fails every change to that product is skipped. Where UPDATE ...
+    RETURNING is supported the old and new quantities are worked out from
+    the stock the UPDATE actually changed. The applied changes are written
+    with one executemany INSERT of InventoryTransaction rows. Does not
+    commit.
+
+    Returns one (old_quantity, new_quantity) per change, or None where it was
+    skipped; quantities is left holding the new stock levels.
+    """
+    now = now or datetime.utcnow()
+    accepted = defaultdict(list)
+    running = {}
+    lowest = {}
+    for index, change in enumerate(changes):
+        old_quantity = running.get(change.product_id, quantities.get(change.product_id))
+        if old_quantity is None or old_quantity + change.quantity_change < 0:
+            continue
+
+        running[change.product_id] = old_quantity + change.quantity_change
+        accepted[change.product_id].append(index)
+        delta = running[change.product_id] - quantities[change.product_id]
+        lowest[change.product_id] = min(lowest.get(change.product_id, 0), delta)
+
+    returning = db.get_bind().dialect.update_returning
+    p = products_table.c
+    stmt = (
+        update(products_table)
+        .where(p.id == bindparam("product_id"))
+        .where(p.quantity + bindparam("lowest") >= 0)
+        .values(quantity=p.quantity + bindparam("delta"), updated_at=bindparam("now"))
+    )
+    results = [None] * len(changes)
+    for product_id, indexes in accepted.items():
+        delta = running[product_id] - quantities[product_id]
+        params = {"product_id": product_id, "lowest": lowest[product_id], "delta": delta, "now": now}
+        if returning:
+            row = db.execute(stmt.returning(p.quantity), params).first()
+            quantity = None if row is None else row.quantity - delta
+        else:
+            quantity = quantities[product_id] if db.execute(stmt, params).rowcount else None
+        if quantity is None:
+            logger.warning(f"Stock of product {product_id} changed concurrently; rejecting {len(indexes)} adjustments")
+            continue
+
+        for index in indexes:
+            results[index] = (quantity, quantity + changes[index].quantity_change)
+            quantity += changes[index].quantity_change
+        quantities[product_id] = quantity
+
+    transaction_rows = [
+        {
+            "product_id": change.product_id,
+            "quantity_change": change.quantity_change,
+            "transaction_type": "addition" if change.quantity_change > 0 else "removal",
+            "reference": change.reference,
+            "notes": change.notes,
+            "user_id": change.user_id,
+            "timestamp": now,
+        }
+        for change, result in zip(changes, results) if result is not None
+    ]
+    if transaction_rows:
+        db.execute(insert(transactions_table), transaction_rows)
+
+    return results
+
+def apply_stock_adjustments(db, records, user_id=None):
+    """
+    Apply a batch of stock adjustments in a single transaction.
+
+    Each record is a dict with 'sku', 'quantity_change' and an optional
+    'reference'. Records are applied in order; a record that is invalid,
+    names an unknown SKU or would take stock below zero is rejected without
+    affecting the others.
+
+    Product quantities are changed with one guarded relative UPDATE per
+    product (quantity = quantity + delta) and the InventoryTransaction rows
+    are written with one executemany INSERT, by apply_stock_changes. Does
+    not commit.
+    Rows are locked while stock levels are read on backends that support
+    SELECT ... FOR UPDATE; elsewhere the guarded UPDATE still keeps
+    concurrent batches from losing each other's changes or taking stock
+    below zero.
+
+    Returns (results, crossed) where results has one entry per input record
+    and crossed is the list of product ids that fell to or below their low
+    stock threshold.
+    """
+    results = [None] * len(records)
+    pending = []
+    for index, record in enumerate(records):
+        error = validate_adjustment(record)
+        if error:
+            sku = record.get("sku") if isinstance(record, dict) else None
+            results[index] = {"index": index, "sku": sku, "status": "rejected", "error": error}
+        else:
+            pending.append(index)
+
+    levels = load_stock_levels(db, {records[i]["sku"] for i in pending})
+    found = [index for index in pending if records[index]["sku"] in levels]
+    for index in pending:
+        if records[index]["sku"] not in levels:
+            results[index] = {"index": index, "sku": records[index]["sku"], "status": "rejected", "error": "Product not found"}
+
+    quantities = {level.id: level.quantity for level in levels.values()}
+    changes = [
+        StockChange(levels[records[i]["sku"]].id, records[i]["quantity_change"], records[i].get("reference") or "", "", user_id)
+        for i in found
+    ]
+    applied = 0
+    # Stock of each changed product before its first applied change
+    started = {}
+    for index, change, outcome in zip(found, changes, apply_stock_changes(db, changes, quantities)):
+        record = records[index]
+        if outcome is None:
+            results[index] = {"index": index, "sku": record["sku"], "status": "rejected", "error": "Insufficient stock"}
+            continue
+
+        applied += 1
+        started.setdefault(change.product_id, outcome[0])
+        results[index] = {
+            "index": index,
+            "sku": record["sku"],
+            "status": "applied",
+            "old_quantity": outcome[0],
+            "new_quantity": outcome[1],
+            "change": record["quantity_change"],
+        }
+
+    thresholds = {level.id: level.low_stock_threshold for level in levels.values()}
+    crossed = [
+        product_id
+        for product_id, quantity in started.items()
+        if thresholds[product_id] is not None and quantity > thresholds[product_id] >= quantities[product_id]
+    ]
+
+    logger.info(f"Bulk stock adjustment: {applied} applied, {len(records) - applied} rejected")
+    return results, crossed
@@ -0,0 +1,116 @@
+import binascii
+import hashlib
+import hmac
+import json
+import logging
+import re
+import time
+from types import MappingProxyType
+import jwt
+from jwt.algorithms import HMACAlgorithm
+from jwt.utils import base64url_decode
+from flask import current_app
+from inventory_management.utils.cache import TTLCache
+from inventory_management.utils.metrics import observe
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "token_verifier"
+
+ALGORITHM = "HS256"
+
+# header.payload.signature, each strictly base64url without padding
+TOKEN_PATTERN = re.compile(r"([A-Za-z0-9_-]+)\.([A-Za-z0-9_-]+)\.([A-Za-z0-9_-]+)")
+
+class TokenVerifier:
+    """
+    Issues and verifies the app's HS256 tokens.
+
+    Verification checks the HMAC-SHA256 signature directly with a key
+    prepared once per app; jwt.decode re-prepares the key and re-validates
+    the encoding on every call, which costs more than the HMAC itself. Only
+    the claims these tokens use are checked: exp, and nbf if present.
+
+    The claims of each verified token are kept in an LRU until the token
+    expires, so a client sending the same token on every request pays for
+    the signature check once. Only valid tokens are cached, and a cached
+    token is the exact string that was verified.
+    """
+
+    def __init__(self, secret_key, maxsize=10000):
+        self._key = HMACAlgorithm(HMACAlgorithm.SHA256).prepare_key(secret_key)
+        self._cache = TTLCache(maxsize=maxsize, ttl=0)
+
+    def encode(self, payload):
+        return jwt.encode(payload, self._key, algorithm=ALGORITHM)
+
+    def verify(self, token):
+        """Return the token's read-only claims, False if it has expired, or None if it is invalid."""
+        claims = self._cache.get(token)
+        if claims is not None:
+            return claims
+
+        started = time.perf_counter()
+        try:
+            claims = self._decode(token)
+        finally:
+            observe("jwt_decode_duration_seconds", time.perf_counter() - started)
+        if not claims:
+            return claims
+
+        ttl = claims["exp"] - time.time() if "exp" in claims else None
+        if ttl is not None and ttl > 0:
+            self._cache.set(token, claims, ttl=ttl)
+        return claims
+
+    def _decode(self, token):
+        match = TOKEN_PATTERN.fullmatch(token) if isinstance(token, str) else None
+        if match is None:
+            return None
+
+        header_segment, payload_segment, signature_segment = match.groups()
+        signing_input = token[:match.end(2)].encode("ascii")
+        try:
+            signature = base64url_decode(signature_segment)
+            expected = hmac.new(self._key, signing_input, hashlib.sha256).digest()
+            if not hmac.compare_digest(signature, expected):
+                return None
+
+            header = json.loads(base64url_decode(header_segment))
+            claims = json.loads(base64url_decode(payload_segment))
+        except (binascii.Error, ValueError):
+            return None
+
+        if not isinstance(header, dict) or header.get("alg") != ALGORITHM or "crit" in header:
+            return None
+        if not isinstance(claims, dict):
+            return None
+
+        now = time.time()
+        exp = claims.get("exp")
+        if exp is not None:
+            if not isinstance(exp, (int, float)):
+                return None
+            if exp <= now:
+                return False
+        nbf = claims.get("nbf")
+        if nbf is not None and (not isinstance(nbf, (int, float)) or nbf > now):
+            return None
+
+        return MappingProxyType(claims)
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
+
+def init_token_verifier(app):
+    """Create the app's token verifier from SECRET_KEY."""
+    verifier = TokenVerifier(app.config["SECRET_KEY"], maxsize=app.config["TOKEN_CACHE_SIZE"])
+    app.extensions[EXTENSION_KEY] = verifier
+    return verifier
+
+def get_token_verifier():
+    """Get the token verifier of the current app."""
+    return current_app.extensions[EXTENSION_KEY]
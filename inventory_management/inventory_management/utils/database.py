@@ -1,35 +1,391 @@
 import logging
-from sqlalchemy import create_engine
+import queue
+import threading
+import time
+from concurrent.futures import Future, wait
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
 from flask import g, current_app
 
 logger = logging.getLogger(__name__)
 Base = declarative_base()
 
+EXTENSION_KEY = "inventory_db"
+
+class PoolStats:
+    """Connection pool counters collected from engine pool events."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.checkouts = 0
+        self.checked_out = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connections_opened += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+
+    def on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.wait_count += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+
+    def snapshot(self, pool):
+        """Return the current counters merged with the pool's own gauges."""
+        with self._lock:
+            stats = {
+                "pool_class": type(pool).__name__,
+                "connections_opened": self.connections_opened,
+                "checkouts": self.checkouts,
+                "checked_out": self.checked_out,
+                "wait_count": self.wait_count,
+                "wait_total_ms": round(self.wait_total * 1000, 3),
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "wait_avg_ms": round(self.wait_total * 1000 / self.wait_count, 3) if self.wait_count else 0.0,
+            }
+
+        if isinstance(pool, QueuePool):
+            stats.update({
+                "pool_size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "idle": pool.checkedin(),
+                "overflow": pool.overflow(),
+            })
+
+        return stats
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers wait for a connection."""
+
+    stats = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.stats is not None:
+                self.stats.record_wait(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+class WriteTimeout(Exception):
+    """
+    A queued write did not finish within its timeout.
+
+    If pending is False the write was cancelled before it started and is
+    safe to retry. If pending is True it was already running and may still
+    commit, so retrying it blindly could apply it twice.
+    """
+
+    def __init__(self, pending, reference=None):
+        super().__init__("Write still in progress" if pending else "Write cancelled before it started")
+        self.pending = pending
+        self.reference = reference
+
+def wait_for_write(future, timeout, reference=None):
+    """
+    Return the result of a queued write, waiting at most timeout seconds.
+
+    On timeout the write is cancelled if it has not started yet; either
+    way WriteTimeout is raised, saying whether it may still be applied.
+    """
+    if not wait([future], timeout=timeout).done:
+        if future.cancel():
+            raise WriteTimeout(pending=False, reference=reference)
+        if not future.done():
+            raise WriteTimeout(pending=True, reference=reference)
+    return future.result()
+
+def write_timeout_response(e):
+    """(body, status, headers) for a WriteTimeout: 202 if the write may still apply, else 503."""
+    if e.pending:
+        body = {"status": "pending", "message": "The write is still being applied; check its outcome before retrying"}
+        if e.reference:
+            body["reference"] = e.reference
+        return body, 202, {}
+    return {"error": "Server busy, please retry"}, 503, {"Retry-After": "1"}
+
+class WriteQueue:
+    """
+    Runs a process's writes one at a time on a single writer thread.
+
+    SQLite allows one writer per database, so concurrent writing
+    transactions otherwise wait on each other's locks and fail with
+    "database is locked" once busy_timeout runs out. Here each write is a
+    function of a session, queued and run by the writer in its own
+    SAVEPOINT; whatever queued up while the previous group was committing
+    (up to max_batch writes) shares a single commit. A write that raises
+    is rolled back to its savepoint without affecting the others.
+
+    The writer's transactions start with BEGIN IMMEDIATE (see
+    sqlite_engine_events), so it holds the write lock from the start
+    instead of upgrading a read lock.
+    """
+
+    def __init__(self, session_factory, bind, max_batch=100, timeout=30):
+        self.session_factory = session_factory
+        self.bind = bind
+        self.max_batch = max_batch
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self.writes = 0
+        self.commits = 0
+
+    def start(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._queue.put(None)
+
+    def submit(self, func):
+        """Queue func(session) and return a Future of its result."""
+        self.start()
+        future = Future()
+        self._queue.put((func, future))
+        return future
+
+    def run(self, func):
+        """Run func(session) on the writer and return its result once committed (see wait_for_write)."""
+        return wait_for_write(self.submit(func), self.timeout)
+
+    def _take_batch(self):
+        batch = [self._queue.get()]
+        while batch[-1] is not None and len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            stopping = batch[-1] is None
+            jobs = [job for job in batch if job is not None]
+            if jobs:
+                self._commit_group(jobs)
+            if stopping:
+                return
+
+    def _commit_group(self, jobs):
+        outcomes = []
+        session = self.session_factory(bind=self.bind)
+        try:
+            for func, future in jobs:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    with session.begin_nested():
+                        result = func(session)
+                    outcomes.append((future, result, None))
+                except Exception as e:
+                    outcomes.append((future, None, e))
+            session.commit()
+        except Exception as e:
+            logger.exception("Group commit failed")
+            session.rollback()
+            outcomes = [(future, None, error or e) for future, _, error in outcomes]
+        finally:
+            session.close()
+
+        self.writes += len(outcomes)
+        self.commits += 1
+        for future, result, error in outcomes:
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
+
+    def stats(self):
+        return {
+            "pending": self._queue.qsize(),
+            "writes": self.writes,
+            "commits": self.commits,
+            "writes_per_commit": round(self.writes / self.commits, 2) if self.commits else 0.0,
+        }
+
+class Database:
+    """Per-application engine, session factory, pool statistics and optional SQLite write queue."""
+
+    def __init__(self, engine, session_factory, pool_stats, write_queue=None):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.pool_stats = pool_stats
+        self.write_queue = write_queue
+
+def is_memory_sqlite(url):
+    """Whether url is an in-memory SQLite database, which each connection sees on its own."""
+    return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+def is_file_sqlite(url):
+    """Whether url is a SQLite database file."""
+    return url.get_backend_name() == "sqlite" and not is_memory_sqlite(url)
+
+def sqlite_pragmas(config):
+    """PRAGMA statements run on every new connection in tuned SQLite mode."""
+    return (
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT'])}",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE'])}",
+        # Negative cache_size is in KiB rather than pages
+        f"PRAGMA cache_size={-int(config['SQLITE_CACHE_SIZE_KB'])}",
+        "PRAGMA temp_store=MEMORY",
+    )
+
+def sqlite_engine_events(engine, pragmas):
+    """
+    Apply the pragmas to each new connection and take over transaction control.
+
+    pysqlite starts transactions lazily and ends them on its own, which
+    breaks SAVEPOINT and makes every transaction upgrade from a read lock.
+    Its implicit handling is turned off so that SQLAlchemy's begin emits
+    BEGIN, or BEGIN IMMEDIATE on connections with the sqlite_write
+    execution option (the write queue's).
+    """
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def begin_sqlite_transaction(conn):
+        conn.exec_driver_sql("BEGIN IMMEDIATE" if conn.get_execution_options().get("sqlite_write") else "BEGIN")
+
+def engine_options(config):
+    """Build create_engine() keyword arguments from the app config."""
+    url = make_url(config["DATABASE_URI"])
+    options = {"pool_pre_ping": config.get("DB_POOL_PRE_PING", True)}
+
+    # An in-memory SQLite database only exists inside its connection, so keep
+    # SQLAlchemy's default single-connection pool for it.
+    if is_memory_sqlite(url):
+        return options
+
+    options.update({
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": config.get("DB_POOL_SIZE", 5),
+        "max_overflow": config.get("DB_MAX_OVERFLOW", 10),
+        "pool_timeout": config.get("DB_POOL_TIMEOUT", 30),
+        "pool_recycle": config.get("DB_POOL_RECYCLE", -1),
+    })
+    return options
+
+def init_engine(app):
+    """Create the application's engine and session factory once at startup."""
+    engine = create_engine(app.config["DATABASE_URI"], **engine_options(app.config))
+
+    pool_stats = PoolStats()
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.stats = pool_stats
+    event.listen(engine, "connect", pool_stats.on_connect)
+    event.listen(engine, "checkout", pool_stats.on_checkout)
+    event.listen(engine, "checkin", pool_stats.on_checkin)
+
+    # WAL, pragmas and a single writer only make sense for SQLite files
+    session_factory = sessionmaker(bind=engine)
+    write_queue = None
+    if is_file_sqlite(engine.url) and app.config.get("SQLITE_TUNED"):
+        sqlite_engine_events(engine, sqlite_pragmas(app.config))
+        if app.config.get("SQLITE_SINGLE_WRITER"):
+            write_queue = WriteQueue(
+                session_factory,
+                engine.execution_options(sqlite_write=True),
+                max_batch=app.config["SQLITE_WRITE_BATCH"],
+                timeout=app.config["DB_POOL_TIMEOUT"]
+            )
+
+    database = Database(engine, session_factory, pool_stats, write_queue)
+    app.extensions[EXTENSION_KEY] = database
+
+    logger.info(f"Database engine created: {engine.url.render_as_string(hide_password=True)}")
+    return database
+
+def get_database(app=None):
+    """Get the Database registered on the app by init_engine()."""
+    app = app or current_app
+    return app.extensions[EXTENSION_KEY]
+
 def get_engine():
-    """Get SQLAlchemy engine from app config."""
-    return create_engine(current_app.config["DATABASE_URI"])
+    """Get the SQLAlchemy engine for the current app."""
+    return get_database().engine
 
 def get_db():
-    """Get or create database session."""
+    """Get or create the database session for the current app context."""
     if "db" not in g:
-        engine = get_engine()
-        session_factory = sessionmaker(bind=engine)
-        g.db = scoped_session(session_factory)
-    
+        g.db = get_database().session_factory()
+
     return g.db
 
-def init_db():
-    """Initialize database if needed."""
-    # Only create tables in development/testing
-    if current_app.config.get("TESTING") or current_app.config.get("DEBUG"):
-        engine = get_engine()
-        Base.metadata.create_all(engine)
+def run_write(func):
+    """
+    Run func(session) as a write transaction and return its result.
+
+    With a write queue (tuned SQLite with SQLITE_SINGLE_WRITER) func runs on
+    the writer thread and is group-committed; otherwise it runs on the
+    request session, which is committed, or rolled back if func raises.
+    Either way func should return plain data rather than ORM objects.
+    """
+    write_queue = get_database().write_queue
+    if write_queue is not None:
+        return write_queue.run(func)
+
+    db = get_db()
+    try:
+        result = func(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result
+
+def get_pool_stats():
+    """Get connection pool statistics for the current app."""
+    database = get_database()
+    stats = database.pool_stats.snapshot(database.engine.pool)
+    if database.write_queue is not None:
+        stats["write_queue"] = database.write_queue.stats()
+    return stats
+
+def init_db(app=None):
+    """Bring the database schema up to date; return the migrations applied."""
+    from inventory_management.utils.migrations import upgrade
+
+    return upgrade(get_database(app).engine)
 
 def close_db(e=None):
     """Close database session at the end of request."""
     db = g.pop("db", None)
-    
+
     if db is not None:
         db.close()
@@ -0,0 +1,219 @@
+"""
+Opt-in request instrumentation exposed in the Prometheus text format.
+
+init_metrics() registers request hooks and engine events that record,
+per endpoint, request latency and the number and total time of SQL
+statements each request ran. bcrypt and JWT decode times are reported
+through observe(), ledger batch sizes and flush times through the ledger
+writer's observer. With PROFILE_SLOW_REQUESTS on, a SamplingProfiler
+writes folded stacks of requests slower than PROFILE_SLOW_THRESHOLD.
+"""
+import bisect
+import logging
+import threading
+import time
+from flask import Response, current_app, g, has_app_context, request
+from sqlalchemy import event
+from inventory_management.utils.database import get_database
+from inventory_management.utils.profiler import SamplingProfiler
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "metrics"
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 500)
+BATCH_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def format_labels(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+def format_number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Histogram:
+    """Thread-safe Prometheus histogram with a fixed set of label names."""
+
+    def __init__(self, name, documentation, label_names=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def observe(self, value, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * len(self.buckets), 0.0, 0]
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def collect(self):
+        """Return {label values: (cumulative bucket counts, sum, count)}."""
+        with self._lock:
+            snapshot = {labels: (list(counts), total, count) for labels, (counts, total, count) in self._series.items()}
+
+        result = {}
+        for labels, (counts, total, count) in snapshot.items():
+            cumulative = []
+            running = 0
+            for bucket_count in counts:
+                running += bucket_count
+                cumulative.append(running)
+            result[labels] = (cumulative, total, count)
+        return result
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (cumulative, total, count) in sorted(self.collect().items()):
+            for bound, value in zip(self.buckets, cumulative):
+                lines.append(f"{self.name}_bucket{format_labels(self.label_names, labels, ('le', format_number(bound)))} {value}")
+            lines.append(f"{self.name}_bucket{format_labels(self.label_names, labels, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{format_labels(self.label_names, labels)} {format_number(total)}")
+            lines.append(f"{self.name}_count{format_labels(self.label_names, labels)} {count}")
+        return lines
+
+class Metrics:
+    """The app's histograms plus the per-thread SQL counters of the request being served."""
+
+    def __init__(self):
+        self.histograms = {
+            "http_request_duration_seconds": Histogram(
+                "http_request_duration_seconds", "Request latency by endpoint.", ("endpoint", "method", "status")),
+            "http_request_sql_statements": Histogram(
+                "http_request_sql_statements", "SQL statements executed per request.", ("endpoint",), COUNT_BUCKETS),
+            "http_request_sql_duration_seconds": Histogram(
+                "http_request_sql_duration_seconds", "Total SQL time per request.", ("endpoint",)),
+            "password_hash_duration_seconds": Histogram(
+                "password_hash_duration_seconds", "Time spent in bcrypt, excluding queueing.", ("operation",)),
+            "jwt_decode_duration_seconds": Histogram(
+                "jwt_decode_duration_seconds", "Time spent decoding and verifying JWTs."),
+            "ledger_flush_duration_seconds": Histogram(
+                "ledger_flush_duration_seconds", "Time to apply and commit one batch of stock adjustments."),
+            "ledger_batch_size": Histogram(
+                "ledger_batch_size", "Stock adjustments per ledger commit.", buckets=BATCH_BUCKETS),
+        }
+        self._local = threading.local()
+
+    def observe(self, name, value, *label_values):
+        self.histograms[name].observe(value, *label_values)
+
+    def start_request(self):
+        self._local.sql = [0, 0.0]
+
+    def end_request(self):
+        """Return (statements, seconds) of SQL run by this thread since start_request()."""
+        sql = getattr(self._local, "sql", None)
+        self._local.sql = None
+        return tuple(sql) if sql else (0, 0.0)
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        # A connection runs one statement at a time, so one start time suffices
+        conn.info["metrics_query_start"] = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self._record_statement(conn)
+
+    def handle_error(self, exception_context):
+        """Count a failed statement too, and clear its start time."""
+        if exception_context.connection is not None:
+            self._record_statement(exception_context.connection)
+
+    def _record_statement(self, conn):
+        started = conn.info.pop("metrics_query_start", None)
+        sql = getattr(self._local, "sql", None)
+        if started is not None and sql is not None:
+            sql[0] += 1
+            sql[1] += time.perf_counter() - started
+
+    def observe_password_hash(self, operation, seconds):
+        self.observe("password_hash_duration_seconds", seconds, operation)
+
+    def observe_ledger_flush(self, batch_size, seconds):
+        self.observe("ledger_batch_size", batch_size)
+        self.observe("ledger_flush_duration_seconds", seconds)
+
+    def render(self):
+        lines = []
+        for histogram in self.histograms.values():
+            lines.extend(histogram.render())
+        return "\n".join(lines) + "\n"
+
+def observe(name, value, *label_values):
+    """Record value on the current app's histogram name, if metrics are enabled."""
+    if has_app_context():
+        metrics = current_app.extensions.get(EXTENSION_KEY)
+        if metrics is not None:
+            metrics.observe(name, value, *label_values)
+
+def init_metrics(app):
+    """Register request hooks, engine events and the /metrics endpoint (plus the slow-request profiler if enabled)."""
+    metrics = Metrics()
+    app.extensions[EXTENSION_KEY] = metrics
+
+    engine = get_database(app).engine
+    event.listen(engine, "before_cursor_execute", metrics.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", metrics.after_cursor_execute)
+    event.listen(engine, "handle_error", metrics.handle_error)
+
+    hasher = app.extensions.get("password_hasher")
+    if hasher is not None:
+        hasher.observer = metrics.observe_password_hash
+
+    ledger = app.extensions.get("ledger_writer")
+    if ledger is not None:
+        ledger.observer = metrics.observe_ledger_flush
+
+    profiler = None
+    if app.config["PROFILE_SLOW_REQUESTS"]:
+        profiler = SamplingProfiler(
+            app.config["PROFILE_DIR"],
+            threshold=app.config["PROFILE_SLOW_THRESHOLD"],
+            interval=app.config["PROFILE_SAMPLE_INTERVAL"]
+        )
+        app.extensions["profiler"] = profiler
+
+    @app.before_request
+    def start_instrumentation():
+        g.request_started = time.perf_counter()
+        metrics.start_request()
+        if profiler is not None:
+            profiler.begin()
+
+    @app.after_request
+    def record_instrumentation(response):
+        started = g.pop("request_started", None)
+        if started is None:
+            return response
+
+        seconds = time.perf_counter() - started
+        statements, sql_seconds = metrics.end_request()
+        endpoint = request.endpoint or "unmatched"
+        metrics.observe("http_request_duration_seconds", seconds, endpoint, request.method, str(response.status_code))
+        metrics.observe("http_request_sql_statements", statements, endpoint)
+        metrics.observe("http_request_sql_duration_seconds", sql_seconds, endpoint)
+
+        if profiler is not None:
+            profiler.end(seconds, endpoint)
+        return response
+
+    if app.config["METRICS_ENABLED"]:
+        @app.route("/metrics")
+        def prometheus_metrics():
+            """Request, SQL, bcrypt, JWT and ledger metrics in the Prometheus text format."""
+            return Response(metrics.render(), mimetype=None, content_type=PROMETHEUS_CONTENT_TYPE)
+
+    return metrics
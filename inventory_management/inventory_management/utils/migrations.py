@@ -0,0 +1,124 @@
+"""
+Versioned schema migrations.
+
+Each migration is a function that receives a Connection inside the upgrade
+transaction and is registered with the @migration decorator. Applied
+versions are recorded in the schema_version table so every migration runs
+exactly once per database.
+
+Migration 1 creates the full schema from the models, so a fresh database
+already has everything later migrations add. Later migrations must
+therefore be idempotent (checkfirst=True, or inspect before ALTER).
+"""
+import logging
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, inspect, select, text
+from inventory_management.utils.database import Base
+
+logger = logging.getLogger(__name__)
+
+version_metadata = MetaData()
+schema_version = Table(
+    "schema_version",
+    version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+MIGRATIONS = []
+
+def migration(version, description):
+    """Register a migration function under a schema version."""
+    def decorator(func):
+        if any(existing[0] == version for existing in MIGRATIONS):
+            raise ValueError(f"Duplicate migration version: {version}")
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+    return decorator
+
+@migration(1, "Create initial schema")
+def create_initial_schema(connection):
+    # Import the models so every table is registered on Base.metadata
+    import inventory_management.models.inventory  # noqa: F401
+    import inventory_management.models.user  # noqa: F401
+
+    Base.metadata.create_all(connection)
+
+def column_names(connection, table_name):
+    """Return the set of column names of an existing table."""
+    return {column["name"] for column in inspect(connection).get_columns(table_name)}
+
+@migration(2, "Add users.auth_version")
+def add_user_auth_version(connection):
+    if "auth_version" not in column_names(connection, "users"):
+        connection.execute(text("ALTER TABLE users ADD COLUMN auth_version INTEGER NOT NULL DEFAULT 1"))
+
+def create_indexes(connection, table, *names):
+    """Create the named indexes declared on a model's table if they are missing."""
+    for index in table.indexes:
+        if index.name in names:
+            index.create(connection, checkfirst=True)
+
+@migration(3, "Add keyset pagination indexes")
+def add_pagination_indexes(connection):
+    from inventory_management.models.inventory import Product, InventoryTransaction
+
+    create_indexes(connection, Product.__table__, "ix_products_category_id_id")
+    create_indexes(connection, InventoryTransaction.__table__, "ix_inventory_transactions_product_id_timestamp_id")
+
+@migration(4, "Add partial index of low stock products")
+def add_low_stock_index(connection):
+    from inventory_management.models.inventory import Product
+
+    create_indexes(connection, Product.__table__, "ix_products_low_stock")
+
+@migration(5, "Add stock_snapshots table")
+def add_stock_snapshots(connection):
+    from inventory_management.models.inventory import StockSnapshot
+
+    StockSnapshot.__table__.create(connection, checkfirst=True)
+
+@migration(6, "Add product search index")
+def add_product_search_index(connection):
+    from inventory_management.models.inventory import Product
+    from inventory_management.services.search_service import create_search_index
+
+    create_indexes(connection, Product.__table__, "ix_products_category_id_sku")
+    create_search_index(connection)
+
+@migration(7, "Add users.updated_at index")
+def add_user_updated_at_index(connection):
+    from inventory_management.models.user import User
+
+    create_indexes(connection, User.__table__, "ix_users_updated_at")
+
+def applied_versions(connection):
+    """Return the set of migration versions already applied."""
+    version_metadata.create_all(connection)
+    return set(connection.scalars(select(schema_version.c.version)))
+
+def current_version(engine):
+    """Return the highest applied migration version (0 for an empty database)."""
+    with engine.begin() as connection:
+        return max(applied_versions(connection), default=0)
+
+def upgrade(engine):
+    """Apply all pending migrations in one transaction; return the applied versions."""
+    applied = []
+    with engine.begin() as connection:
+        done = applied_versions(connection)
+        for version, description, func in MIGRATIONS:
+            if version in done:
+                continue
+            logger.info(f"Applying migration {version}: {description}")
+            func(connection)
+            connection.execute(insert(schema_version).values(
+                version=version,
+                description=description,
+                applied_at=datetime.utcnow()
+            ))
+            applied.append(version)
+
+    return applied
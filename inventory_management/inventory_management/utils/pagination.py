@@ -0,0 +1,47 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from flask import current_app
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+def encode_cursor(*values):
+    """Encode the sort key of the last row on a page as an opaque cursor."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor, *types):
+    """Decode a cursor into a tuple of values converted with the given types."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise InvalidCursor("Malformed cursor")
+        return tuple(
+            datetime.fromisoformat(value) if kind is datetime else kind(value)
+            for kind, value in zip(types, payload)
+        )
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, TypeError, ValueError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+def page_size(args):
+    """Read ?limit= from request args, bounded by MAX_ITEMS_PER_PAGE."""
+    default = current_app.config["ITEMS_PER_PAGE"]
+    try:
+        limit = int(args.get("limit", default))
+    except (TypeError, ValueError):
+        limit = default
+    return max(1, min(limit, current_app.config["MAX_ITEMS_PER_PAGE"]))
+
+def paginate(rows, limit, cursor_for):
+    """
+    Split rows fetched with LIMIT limit + 1 into (page, next_cursor).
+
+    cursor_for maps the last row of the page to its cursor values.
+    """
+    page = rows[:limit]
+    next_cursor = encode_cursor(*cursor_for(page[-1])) if len(rows) > limit else None
+    return page, next_cursor
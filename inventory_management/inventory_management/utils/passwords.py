@@ -0,0 +1,126 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = "password_hasher"
+
+class PasswordHasherBusy(Exception):
+    """Raised when a bcrypt job cannot be started within the queue timeout."""
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, size-limited thread pool.
+
+    bcrypt releases the GIL, so worker threads hash in parallel while the
+    number of concurrent hashes stays capped at max_workers. At most
+    max_pending further jobs may wait; a caller that cannot get a slot, or
+    whose job is still queued after queue_timeout seconds, gets
+    PasswordHasherBusy instead of tying up its request thread indefinitely.
+    The *_async methods, for event loops, never wait for a slot: a full
+    queue raises PasswordHasherBusy at once.
+    """
+
+    def __init__(self, rounds=12, max_workers=2, max_pending=16, queue_timeout=5.0):
+        self.rounds = rounds
+        self.queue_timeout = queue_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        # Optional callable(operation, seconds) told how long each bcrypt call took
+        self.observer = None
+
+    def _run(self, operation, func, *args):
+        return self._submit(operation, func, *args).result()
+
+    def _submit(self, operation, func, *args, block=True):
+        """Queue func(*args) and return its Future; without block a full queue fails at once."""
+        deadline = time.monotonic() + self.queue_timeout
+        acquired = self._slots.acquire(timeout=self.queue_timeout) if block else self._slots.acquire(blocking=False)
+        if not acquired:
+            raise PasswordHasherBusy("Password hashing queue is full")
+
+        def job():
+            if time.monotonic() > deadline:
+                raise PasswordHasherBusy("Password hashing job timed out in the queue")
+            started = time.perf_counter()
+            result = func(*args)
+            if self.observer is not None:
+                self.observer(operation, time.perf_counter() - started)
+            return result
+
+        try:
+            future = self._executor.submit(job)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._slots.release())
+        return future
+
+    def hash_password(self, password):
+        """Hash a password with the configured work factor."""
+        # bcrypt is imported on first use to keep app startup light
+        import bcrypt
+
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        return self._run("hash", bcrypt.hashpw, password.encode("utf-8"), salt).decode("utf-8")
+
+    def check_password(self, password, password_hash):
+        """Verify a password against a bcrypt hash."""
+        import bcrypt
+
+        return self._run("check", bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"))
+
+    async def hash_password_async(self, password):
+        """hash_password() for event loops: awaits the pool rather than blocking the loop's thread."""
+        import bcrypt
+
+        salt = bcrypt.gensalt(rounds=self.rounds)
+        future = self._submit("hash", bcrypt.hashpw, password.encode("utf-8"), salt, block=False)
+        return (await asyncio.wrap_future(future)).decode("utf-8")
+
+    async def check_password_async(self, password, password_hash):
+        """check_password() for event loops: awaits the pool rather than blocking the loop's thread."""
+        import bcrypt
+
+        future = self._submit("check", bcrypt.checkpw, password.encode("utf-8"), password_hash.encode("utf-8"), block=False)
+        return await asyncio.wrap_future(future)
+
+    def needs_rehash(self, password_hash):
+        """Return True if the hash was made with a different work factor."""
+        try:
+            return int(password_hash.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+_default_hasher = None
+_default_lock = threading.Lock()
+
+def init_password_hasher(app):
+    """Create the app's password hasher from config."""
+    hasher = PasswordHasher(
+        rounds=app.config["BCRYPT_ROUNDS"],
+        max_workers=app.config["PASSWORD_HASHER_WORKERS"],
+        max_pending=app.config["PASSWORD_HASHER_MAX_PENDING"],
+        queue_timeout=app.config["PASSWORD_HASHER_TIMEOUT"]
+    )
+    app.extensions[EXTENSION_KEY] = hasher
+    return hasher
+
+def get_password_hasher():
+    """Get the current app's hasher, or a process default outside an app."""
+    global _default_hasher
+
+    if has_app_context() and EXTENSION_KEY in current_app.extensions:
+        return current_app.extensions[EXTENSION_KEY]
+
+    with _default_lock:
+        if _default_hasher is None:
+            _default_hasher = PasswordHasher()
+        return _default_hasher
@@ -0,0 +1,89 @@
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+def collapse_stack(frame):
+    """Render a frame's stack root-first in the folded format used by flamegraph.pl and speedscope."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+class SamplingProfiler:
+    """
+    Low-overhead sampling profiler for slow requests.
+
+    One background thread wakes every interval seconds and records the
+    stack of each thread that is currently serving a request. When a
+    request finishes, its samples are discarded, or written as folded
+    stacks ("frame;frame;frame count" per line) if it took at least
+    threshold seconds. The output can be fed to flamegraph.pl or opened in
+    speedscope.
+    """
+
+    def __init__(self, output_dir, threshold=0.5, interval=0.005):
+        self.output_dir = output_dir
+        self.threshold = threshold
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._active = {}
+        self._thread = None
+        self._stopped = threading.Event()
+        self.dumped = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+
+    def begin(self):
+        """Start collecting samples for the calling thread."""
+        with self._lock:
+            self._active[threading.get_ident()] = Counter()
+        self.start()
+
+    def end(self, seconds, name):
+        """Stop sampling the calling thread; dump its stacks if the request was slow. Returns the path or None."""
+        with self._lock:
+            samples = self._active.pop(threading.get_ident(), None)
+        if not samples or seconds < self.threshold:
+            return None
+        return self.dump(samples, seconds, name)
+
+    def dump(self, samples, seconds, name):
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", name or "request")
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        path = os.path.join(self.output_dir, f"{stamp}_{safe_name}_{int(seconds * 1000)}ms.folded")
+        with open(path, "w") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        self.dumped += 1
+        logger.info(f"Slow request {name} took {seconds:.3f}s; wrote profile to {path}")
+        return path
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, samples in self._active.items():
+                    frame = frames.get(thread_id)
+                    if frame is not None and thread_id != own_id:
+                        samples[collapse_stack(frame)] += 1
+            del frames
@@ -0,0 +1,82 @@
+import json
+from flask import Response, stream_with_context
+
+EXPORT_FORMATS = {
+    "jsonl": "application/x-ndjson",
+    "json": "application/json",
+}
+
+def iter_json(rows, serialize, fmt="jsonl", chunk_rows=500):
+    """
+    Serialize rows lazily as JSON Lines or as one JSON array.
+
+    Output is yielded in chunks of chunk_rows rows, so memory stays constant
+    however many rows the iterable produces.
+    """
+    buffer = []
+    first = True
+
+    if fmt == "json":
+        yield "["
+
+    for row in rows:
+        encoded = json.dumps(serialize(row), separators=(",", ":"))
+        if fmt == "json":
+            encoded = encoded if first else "," + encoded
+            first = False
+        else:
+            encoded += "\n"
+        buffer.append(encoded)
+
+        if len(buffer) >= chunk_rows:
+            yield "".join(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield "".join(buffer)
+
+    if fmt == "json":
+        yield "]"
+
+async def aiter_json(batches, serialize, fmt="jsonl"):
+    """
+    iter_json() for an async iterable of row batches, such as
+    AsyncResult.partitions(); yields one chunk per batch.
+    """
+    first = True
+
+    if fmt == "json":
+        yield "["
+
+    async for rows in batches:
+        encoded = [json.dumps(serialize(row), separators=(",", ":")) for row in rows]
+        if not encoded:
+            continue
+        if fmt == "json":
+            yield ("" if first else ",") + ",".join(encoded)
+            first = False
+        else:
+            yield "\n".join(encoded) + "\n"
+
+    if fmt == "json":
+        yield "]"
+
+def stream_query(db, stmt, serialize, fmt="jsonl", batch_size=1000, filename=None):
+    """
+    Stream the rows of a Core select as a JSON response.
+
+    The statement runs with yield_per, so rows are fetched from a
+    server-side cursor in batches rather than loaded up front.
+    """
+    def generate():
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        try:
+            yield from iter_json(result, serialize, fmt, chunk_rows=batch_size)
+        finally:
+            result.close()
+
+    headers = {}
+    if filename:
+        headers["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+
+    return Response(stream_with_context(generate()), mimetype=EXPORT_FORMATS[fmt], headers=headers)
@@ -1,4 +1,44 @@
 import re
+from types import MappingProxyType
+
+def _result(valid, message):
+    """Build an immutable validation result; supports result["valid"] and result["message"]."""
+    return MappingProxyType({"valid": valid, "message": message})
+
+# Password rules, checked in order; the first one that fails is reported
+PASSWORD_MIN_LENGTH = 8
+PASSWORD_RULES = (
+    (re.compile(r"[A-Z]"), _result(False, "Password must contain at least one uppercase letter")),
+    (re.compile(r"[a-z]"), _result(False, "Password must contain at least one lowercase letter")),
+    (re.compile(r"\d"), _result(False, "Password must contain at least one digit")),
+    (re.compile(r"[!@#$%^&*(),.?\":{}|<>]"), _result(False, "Password must contain at least one special character")),
+)
+PASSWORD_TOO_SHORT = _result(False, "Password must be at least 8 characters long")
+PASSWORD_VALID = _result(True, "Password meets requirements")
+
+# All password rules in one pattern, so a valid password is a single match
+PASSWORD_PATTERN = re.compile(r"(?=.*[A-Z])(?=.*[a-z])(?=.*\d)(?=.*[!@#$%^&*(),.?\":{}|<>]).{8,}", re.DOTALL)
+
+# SKU error codes, as returned by validate_skus()
+SKU_OK = 0
+SKU_BAD_LENGTH = 1
+SKU_BAD_START = 2
+SKU_TRAILING_HYPHEN = 3
+SKU_BAD_CHARACTERS = 4
+SKU_NOT_A_STRING = 5
+
+SKU_RESULTS = (
+    _result(True, "SKU format is valid"),
+    _result(False, "SKU must be between 5 and 20 characters long"),
+    _result(False, "SKU must start with a letter"),
+    _result(False, "SKU must not end with a hyphen"),
+    _result(False, "SKU must contain only letters, numbers, and hyphens"),
+    _result(False, "SKU must be a string"),
+)
+
+# A valid SKU is a single match of this pattern; the error code of an
+# invalid one is worked out by sku_error_code() in the documented order
+SKU_PATTERN = re.compile(r"[A-Za-z][A-Za-z0-9-]{3,18}[A-Za-z0-9]")
 
 def validate_password(password):
     """
@@ -11,47 +51,38 @@ def validate_password(password):
     - Contains at least one digit
     - Contains at least one special character
     
-    Returns a dict with 'valid' (bool) and 'message' (str) keys.
+    Returns a read-only mapping with 'valid' (bool) and 'message' (str) keys.
     """
-    # Check length
-    if len(password) < 8:
-        return {
-            "valid": False,
-            "message": "Password must be at least 8 characters long"
-        }
-    
-    # Check for uppercase letter
-    if not re.search(r"[A-Z]", password):
-        return {
-            "valid": False,
-            "message": "Password must contain at least one uppercase letter"
-        }
-    
-    # Check for lowercase letter
-    if not re.search(r"[a-z]", password):
-        return {
-            "valid": False,
-            "message": "Password must contain at least one lowercase letter"
-        }
-    
-    # Check for digit
-    if not re.search(r"\d", password):
-        return {
-            "valid": False,
-            "message": "Password must contain at least one digit"
-        }
-    
-    # Check for special character
-    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
-        return {
-            "valid": False,
-            "message": "Password must contain at least one special character"
-        }
-    
-    return {
-        "valid": True,
-        "message": "Password meets requirements"
-    }
+    if PASSWORD_PATTERN.match(password):
+        return PASSWORD_VALID
+
+    if len(password) < PASSWORD_MIN_LENGTH:
+        return PASSWORD_TOO_SHORT
+
+    for pattern, failure in PASSWORD_RULES:
+        if not pattern.search(password):
+            return failure
+
+    return PASSWORD_VALID
+
+def sku_error_code(sku):
+    """Return the SKU_* error code of a SKU (SKU_OK if it is valid)."""
+    if not isinstance(sku, str):
+        return SKU_NOT_A_STRING
+
+    if SKU_PATTERN.fullmatch(sku):
+        return SKU_OK
+
+    if len(sku) < 5 or len(sku) > 20:
+        return SKU_BAD_LENGTH
+
+    if not sku[0].isalpha():
+        return SKU_BAD_START
+
+    if sku.endswith("-"):
+        return SKU_TRAILING_HYPHEN
+
+    return SKU_BAD_CHARACTERS
 
 def validate_sku(sku):
     """
@@ -63,37 +94,47 @@ def validate_sku(sku):
     - Must start with a letter
     - Must not end with a hyphen
     
-    Returns a dict with 'valid' (bool) and 'message' (str) keys.
+    Returns a read-only mapping with 'valid' (bool) and 'message' (str) keys.
     """
-    # Check length
-    if len(sku) < 5 or len(sku) > 20:
-        return {
-            "valid": False,
-            "message": "SKU must be between 5 and 20 characters long"
-        }
-    
-    # Check if starts with a letter
-    if not sku[0].isalpha():
-        return {
-            "valid": False,
-            "message": "SKU must start with a letter"
-        }
-    
-    # Check if ends with a hyphen
-    if sku.endswith("-"):
-        return {
-            "valid": False,
-            "message": "SKU must not end with a hyphen"
-        }
-    
-    # Check for valid characters
-    if not re.match(r"^[a-zA-Z0-9-]+$", sku):
-        return {
-            "valid": False,
-            "message": "SKU must contain only letters, numbers, and hyphens"
-        }
-    
-    return {
-        "valid": True,
-        "message": "SKU format is valid"
-    }
+    return SKU_RESULTS[sku_error_code(sku)]
+
+def validate_skus(skus):
+    """
+    Validate many SKUs in one pass.
+
+    Accepts a list (or any iterable) of SKUs or a pandas Series. Returns
+    (mask, codes): mask is True where the SKU is valid and codes holds the
+    SKU_* error code of each SKU (see SKU_RESULTS for the messages). For a
+    Series both are Series on the same index, computed with vectorized
+    string operations; otherwise both are lists.
+    """
+    if _is_series(skus):
+        return _validate_sku_series(skus)
+
+    codes = [sku_error_code(sku) for sku in skus]
+    return [code == SKU_OK for code in codes], codes
+
+def _is_series(obj):
+    cls = type(obj)
+    return cls.__name__ == "Series" and cls.__module__.startswith("pandas")
+
+def _validate_sku_series(skus):
+    if skus.dtype == object:
+        is_string = skus.map(lambda value: isinstance(value, str)).astype(bool)
+    else:
+        # String dtypes only hold strings and missing values
+        is_string = skus.notna().astype(bool)
+    text = skus.where(is_string, "").astype(str)
+
+    mask = is_string & text.str.fullmatch(SKU_PATTERN.pattern)
+
+    # Assign codes in reverse order of precedence so earlier rules win
+    codes = mask.map({True: SKU_OK, False: SKU_BAD_CHARACTERS}).astype("int8")
+    invalid = ~mask
+    length = text.str.len()
+    codes = codes.mask(invalid & text.str.endswith("-"), SKU_TRAILING_HYPHEN)
+    codes = codes.mask(invalid & ~text.str[:1].str.isalpha(), SKU_BAD_START)
+    codes = codes.mask(invalid & ((length < 5) | (length > 20)), SKU_BAD_LENGTH)
+    codes = codes.mask(~is_string, SKU_NOT_A_STRING)
+
+    return mask, codes
@@ -9,12 +9,31 @@ setup(
         "Flask>=2.3.3",
         "SQLAlchemy>=2.0.20",
         "pyjwt>=2.8.0",
-        "pandas>=2.1.0",
         "marshmallow>=3.20.1",
         "click>=8.1.7",
         "python-dotenv>=1.0.0",
         "bcrypt>=4.0.1",
         "email-validator>=2.0.0",
     ],
+    extras_require={
+        "reporting": [
+            "pandas>=2.1.0",
+        ],
+        "parquet": [
+            "pandas>=2.1.0",
+            "pyarrow>=14.0.0",
+        ],
+        "asgi": [
+            "starlette>=0.37.0",
+            "aiosqlite>=0.19.0",
+            "greenlet>=3.0.0",
+            "uvicorn>=0.29.0",
+        ],
+        "test": [
+            "pytest>=7.4.0",
+            "aiosmtpd>=1.4.4",
+            "httpx>=0.27.0",
+        ],
+    },
     python_requires=">=3.9",
 )
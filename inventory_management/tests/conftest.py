@@ -1,8 +1,39 @@
 import os
 import tempfile
 import pytest
+from sqlalchemy import event
 from inventory_management.app import create_app
-from inventory_management.utils.database import Base, get_engine
+from inventory_management.models.user import User
+from inventory_management.services.auth_service import generate_token
+from inventory_management.services.permissions import seed_roles_and_permissions
+from inventory_management.utils.database import Base, get_engine, get_db
+
+class QueryCounter:
+    """Record the SQL statements an engine executes while the block runs."""
+    
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+    
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+    
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+    
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+    
+    @property
+    def count(self):
+        return len(self.statements)
+    
+    def assert_at_most(self, expected):
+        """Fail with the recorded statements if more than expected ran."""
+        assert self.count <= expected, (
+            f"Expected at most {expected} queries, got {self.count}:\n" + "\n".join(self.statements)
+        )
 
 @pytest.fixture
 def app():
@@ -31,3 +62,30 @@ def client(app):
 def runner(app):
     """A test CLI runner for the app."""
     return app.test_cli_runner()
+
+@pytest.fixture
+def auth_headers(app):
+    """Authorization headers for a freshly created test user."""
+    with app.app_context():
+        db = get_db()
+        role = seed_roles_and_permissions(db)["admin"]
+        
+        user = User(username="tester", email="tester@example.com", role_id=role.id)
+        user.set_password("Password1!")
+        db.add(user)
+        db.commit()
+        
+        token = generate_token(user.id)
+    
+    return {"Authorization": f"Bearer {token}"}
+
+@pytest.fixture
+def count_queries(app):
+    """Return a factory for QueryCounter context managers on the app's engine.
+    
+    Usage: with count_queries() as queries: ...; queries.assert_at_most(2)
+    """
+    with app.app_context():
+        engine = get_engine()
+    
+    return lambda: QueryCounter(engine)
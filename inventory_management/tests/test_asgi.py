@@ -0,0 +1,118 @@
+import pytest
+from inventory_management.models.inventory import Product
+from inventory_management.models.user import User
+from inventory_management.services.permissions import seed_roles_and_permissions
+from inventory_management.utils.database import get_db
+
+pytest.importorskip("starlette")
+pytest.importorskip("aiosqlite")
+pytest.importorskip("httpx")
+
+from starlette.testclient import TestClient
+from inventory_management.asgi import create_asgi_app
+
+def seed(flask_app):
+    with flask_app.app_context():
+        db = get_db()
+        role = seed_roles_and_permissions(db)["admin"]
+        user = User(username="async", email="async@example.com", role_id=role.id)
+        user.set_password("Password1!")
+        product = Product(sku="ASYNC-001", name="Async", price=2.5, quantity=20, low_stock_threshold=5)
+        db.add_all([user, product])
+        db.commit()
+        return product.id
+
+@pytest.fixture(params=[False, True], ids=["default", "single-writer"])
+def asgi_app(request, tmp_path):
+    app = create_asgi_app("testing", {
+        "DATABASE_URI": f"sqlite:///{tmp_path}/asgi.db",
+        "SQLITE_TUNED": request.param,
+        "SQLITE_SINGLE_WRITER": request.param,
+    })
+    app.state.product_id = seed(app.state.flask_app)
+    with TestClient(app) as client:
+        app.state.client = client
+        yield app
+
+def login(client):
+    response = client.post("/api/auth/login", json={"username": "async", "password": "Password1!"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['token']}"}
+
+def test_auth_routes(asgi_app):
+    """Test login, /me and rejection of missing or bad credentials."""
+    client = asgi_app.state.client
+    assert client.post("/api/auth/login", json={"username": "async", "password": "wrong"}).status_code == 401
+    assert client.get("/api/auth/me").status_code == 401
+
+    me = client.get("/api/auth/me", headers=login(client)).json()
+
+    assert (me["username"], me["role"]) == ("async", "admin")
+    assert me["last_login"] is not None
+
+def test_me_for_deleted_user(asgi_app):
+    """Test that /me answers 401 when a still-valid token's user has been deleted."""
+    client = asgi_app.state.client
+    headers = login(client)
+
+    with asgi_app.state.flask_app.app_context():
+        db = get_db()
+        db.delete(db.query(User).filter_by(username="async").one())
+        db.commit()
+
+    assert client.get("/api/auth/me", headers=headers).status_code == 401
+
+def test_register(asgi_app, monkeypatch):
+    """Test registration, including validation and duplicates."""
+    # Deliverability checks need DNS
+    monkeypatch.setattr("email_validator.validate_email", lambda email: None)
+    client = asgi_app.state.client
+    payload = {"username": "new", "email": "new@example.com", "password": "Password1!", "role_id": 1}
+
+    assert client.post("/api/auth/register", json={**payload, "password": "weak"}).status_code == 400
+    assert client.post("/api/auth/register", json=payload).status_code == 201
+    assert client.post("/api/auth/register", json=payload).status_code == 409
+
+def test_inventory_routes_match_wsgi(asgi_app):
+    """Test that the ASGI routes return what the Flask routes return."""
+    client = asgi_app.state.client
+    wsgi = asgi_app.state.flask_app.test_client()
+    headers = login(client)
+    product_id = asgi_app.state.product_id
+
+    response = client.post(f"/api/inventory/products/{product_id}/adjust", headers=headers, json={"quantity_change": -16})
+    assert response.json()["new_quantity"] == 4
+    assert client.post(f"/api/inventory/products/{product_id}/adjust", headers=headers,
+                       json={"quantity_change": -5}).status_code == 400
+    assert client.post("/api/inventory/products", headers=headers, json={"sku": "ASYNC-002", "name": "B", "price": 1}).status_code == 201
+
+    for url in (
+        "/api/inventory/products?limit=1",
+        f"/api/inventory/products/{product_id}",
+        "/api/inventory/low-stock",
+        "/api/inventory/products/search?q=asy",
+        f"/api/inventory/products/{product_id}/transactions",
+        "/api/inventory/categories",
+    ):
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert response.json() == wsgi.get(url, headers=headers).get_json(), url
+
+    assert client.get("/api/inventory/products/999", headers=headers).status_code == 404
+    assert client.get("/api/inventory/products?cursor=bad", headers=headers).status_code == 400
+    assert client.get(f"/api/inventory/products/{product_id}/stock", headers=headers).json()["quantity"] == 4
+
+def test_bulk_adjust_and_export(asgi_app):
+    """Test bulk adjustments and a streamed export."""
+    client = asgi_app.state.client
+    headers = login(client)
+
+    response = client.post("/api/inventory/stock/bulk-adjust", headers=headers, json={"adjustments": [
+        {"sku": "ASYNC-001", "quantity_change": 3},
+        {"sku": "MISSING-1", "quantity_change": 1},
+    ]})
+    assert (response.json()["applied"], response.json()["rejected"]) == (1, 1)
+
+    export = client.get("/api/inventory/export/transactions?format=json", headers=headers)
+    assert export.headers["content-type"].startswith("application/json")
+    assert [row["quantity_change"] for row in export.json()] == [3]
@@ -0,0 +1,203 @@
+import jwt
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from inventory_management.models.user import Permission, Role, RolePermission, User
+from inventory_management.services.auth_cache import AuthVersions, get_user_cache
+from inventory_management.services.auth_service import generate_token, verify_token
+from inventory_management.services.tokens import get_token_verifier
+from inventory_management.services.permissions import seed_roles_and_permissions
+from inventory_management.utils.database import get_db
+
+def create_user(app, username="alice", password="Password1!"):
+    with app.app_context():
+        db = get_db()
+        role = Role(name=f"{username}-role")
+        db.add(role)
+        db.flush()
+
+        user = User(username=username, email=f"{username}@example.com", role_id=role.id)
+        user.set_password(password)
+        db.add(user)
+        db.commit()
+        return user.id
+
+def login(client, username="alice", password="Password1!"):
+    response = client.post("/api/auth/login", json={"username": username, "password": password})
+    return {"Authorization": f"Bearer {response.get_json()['token']}"}
+
+def test_login_and_me(client, app):
+    """Test logging in and fetching the current user."""
+    create_user(app)
+    headers = login(client)
+
+    response = client.get("/api/auth/me", headers=headers)
+
+    assert response.status_code == 200
+    assert response.get_json()["username"] == "alice"
+    assert response.get_json()["role"] == "alice-role"
+
+def test_login_rejects_bad_password(client, app):
+    """Test that a wrong password is rejected."""
+    create_user(app)
+
+    response = client.post("/api/auth/login", json={"username": "alice", "password": "wrong"})
+
+    assert response.status_code == 401
+
+def test_cached_user_needs_no_auth_sql(client, app, count_queries):
+    """Test that repeated authenticated requests hit the user cache."""
+    user_id = create_user(app)
+    with app.app_context():
+        headers = {"Authorization": f"Bearer {generate_token(user_id)}"}
+    client.get("/api/inventory/categories", headers=headers)
+
+    with count_queries() as queries:
+        client.get("/api/inventory/categories", headers=headers)
+
+    assert not [s for s in queries.statements if "FROM users" in s]
+    with app.app_context():
+        assert get_user_cache().stats()["hits"] >= 1
+
+def test_deactivation_revokes_cached_user(client, app):
+    """Test that deactivating a user takes effect despite the cache."""
+    user_id = create_user(app)
+    headers = login(client)
+    assert client.get("/api/inventory/categories", headers=headers).status_code == 200
+
+    with app.app_context():
+        db = get_db()
+        user = db.query(User).filter_by(id=user_id).first()
+        user.active = False
+        db.commit()
+        assert user.auth_version == 2
+
+    assert client.get("/api/inventory/categories", headers=headers).status_code == 401
+
+def test_me_for_deleted_user(client, app):
+    """Test that /me answers 401 when a still-valid token's user has been deleted."""
+    user_id = create_user(app)
+    headers = login(client)
+    assert client.get("/api/auth/me", headers=headers).status_code == 200
+
+    with app.app_context():
+        db = get_db()
+        db.delete(db.get(User, user_id))
+        db.commit()
+
+    response = client.get("/api/auth/me", headers=headers)
+    assert response.status_code == 401
+    assert response.get_json()["error"] == "User not found or inactive"
+
+def test_identity_claims_skip_user_lookup(client, app, count_queries):
+    """Test that a login token carrying identity claims authenticates without loading the user."""
+    create_user(app)
+    headers = login(client)
+    client.get("/api/inventory/categories", headers=headers)
+
+    with count_queries() as queries:
+        response = client.get("/api/auth/me", headers=headers)
+        client.get("/api/inventory/categories", headers=headers)
+
+    assert response.get_json()["role"] == "alice-role"
+    # Only /me itself loads the user
+    assert len([s for s in queries.statements if "FROM users" in s]) == 1
+    with app.app_context():
+        assert get_user_cache().stats()["hits"] == 0
+        assert get_token_verifier().stats()["hits"] >= 2
+
+def test_auth_versions_pick_up_other_processes(app):
+    """Test that revocations committed elsewhere are seen after the refresh interval."""
+    user_id = create_user(app)
+    now = [0.0]
+    versions = AuthVersions(timedelta(hours=1), refresh_interval=5, clock=lambda: now[0])
+
+    with app.app_context():
+        db = get_db()
+        assert versions.is_current(db, user_id, 1)
+
+        # Another process deactivates the user, bypassing this one's session events
+        db.execute(
+            update(User).where(User.id == user_id)
+            .values(active=False, auth_version=2, updated_at=datetime.utcnow())
+        )
+        db.commit()
+        assert versions.is_current(db, user_id, 1)
+
+        now[0] = 5
+        assert not versions.is_current(db, user_id, 1)
+        assert versions.is_current(db, user_id, 2)
+
+def test_auth_versions_forget_after_token_lifetime(app):
+    """Test that revocations are dropped once every token they could reject has expired."""
+    now = [0.0]
+    versions = AuthVersions(timedelta(hours=1), refresh_interval=5, clock=lambda: now[0])
+
+    with app.app_context():
+        db = get_db()
+        versions.revoke(42, 2)
+        assert not versions.is_current(db, 42, 1)
+
+        now[0] = 3601
+        assert versions.is_current(db, 42, 1)
+        assert versions._versions == {}
+
+def test_verify_token(app):
+    """Test that valid tokens are cached and expired or tampered ones rejected."""
+    with app.app_context():
+        token = generate_token(1)
+        assert verify_token(token)["user_id"] == 1
+        assert verify_token(token)["user_id"] == 1
+        assert get_token_verifier().stats()["hits"] == 1
+
+        assert verify_token(token[:-2] + "xx") is None
+        payload = {"user_id": 1, "ver": 1, "exp": datetime.utcnow() + timedelta(hours=1)}
+        assert verify_token(jwt.encode(payload, app.config["SECRET_KEY"], algorithm="HS512")) is None
+
+        app.config["JWT_EXPIRATION"] = timedelta(seconds=-1)
+        assert verify_token(generate_token(1)) is False
+
+def test_has_permission_uses_role_permissions(app):
+    """Test that permission checks resolve through the role's permissions."""
+    with app.app_context():
+        db = get_db()
+        roles = seed_roles_and_permissions(db)
+        user = User(username="clerk", email="clerk@example.com", role_id=roles["clerk"].id)
+        user.set_password("Password1!")
+        db.add(user)
+        db.commit()
+
+        assert user.has_permission("adjust_stock")
+        assert not user.has_permission("manage_products")
+
+def test_permission_required(client, app):
+    """Test that views guarded by permission_required return 403 without it."""
+    create_user(app)
+    headers = login(client)
+
+    response = client.post("/api/inventory/categories", headers=headers, json={"name": "Tools"})
+
+    assert response.status_code == 403
+
+def test_role_permission_change_takes_effect(client, app):
+    """Test that granting a permission refreshes the per-role permission sets."""
+    create_user(app)
+    headers = login(client)
+    assert client.post("/api/inventory/categories", headers=headers, json={"name": "Tools"}).status_code == 403
+
+    with app.app_context():
+        db = get_db()
+        seed_roles_and_permissions(db)
+        role = db.query(Role).filter_by(name="alice-role").first()
+        permission = db.query(Permission).filter_by(name="manage_products").first()
+        db.add(RolePermission(role_id=role.id, permission_id=permission.id))
+        db.commit()
+
+    assert client.post("/api/inventory/categories", headers=headers, json={"name": "Tools"}).status_code == 201
+
+def test_seed_db_command(runner):
+    """Test that seed-db creates the default roles idempotently."""
+    result = runner.invoke(args=["seed-db"])
+    assert "admin" in result.output
+
+    result = runner.invoke(args=["seed-db"])
+    assert "Seeded the database." in result.output
@@ -0,0 +1,187 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+from inventory_management.app import create_app
+from inventory_management.models.inventory import Category, Product
+from inventory_management.models.user import User
+from inventory_management.services.auth_service import generate_token
+from inventory_management.services.permissions import seed_roles_and_permissions
+from inventory_management.utils.database import WriteTimeout, get_database, get_db, get_engine, get_pool_stats
+
+def test_engine_created_once_per_app(app):
+    """Test that every context of an app shares one engine."""
+    with app.app_context():
+        engine = get_engine()
+
+    with app.app_context():
+        assert get_engine() is engine
+
+def test_session_per_app_context(app):
+    """Test that sessions are reused within a context and not across contexts."""
+    with app.app_context():
+        db = get_db()
+        assert get_db() is db
+
+    with app.app_context():
+        assert get_db() is not db
+
+def test_pool_settings_from_config(tmp_path, monkeypatch):
+    """Test that file-backed databases get a sized QueuePool."""
+    monkeypatch.setattr("inventory_management.config.TestingConfig.DATABASE_URI", f"sqlite:///{tmp_path}/pool.db")
+    monkeypatch.setattr("inventory_management.config.TestingConfig.DB_POOL_SIZE", 3)
+    app = create_app("testing")
+
+    with app.app_context():
+        pool = get_engine().pool
+        assert isinstance(pool, QueuePool)
+        assert pool.size() == 3
+
+        with get_engine().connect():
+            stats = get_pool_stats()
+            assert stats["checked_out"] == 1
+            assert stats["wait_count"] >= 1
+
+        assert get_pool_stats()["idle"] == 1
+
+def test_pool_stats_endpoint(client):
+    """Test the pool statistics endpoint."""
+    response = client.get("/health/db")
+
+    assert response.status_code == 200
+    assert "checked_out" in response.get_json()
+
+def test_schema_not_touched_per_request(app):
+    """Test that no schema setup hook runs in the request path."""
+    assert not app.before_request_funcs.get(None)
+
+def test_migrations_recorded_once(app):
+    """Test that migrations run at startup and are not re-applied."""
+    from inventory_management.utils.migrations import MIGRATIONS, current_version, upgrade
+
+    with app.app_context():
+        engine = get_engine()
+        assert current_version(engine) == MIGRATIONS[-1][0]
+        assert upgrade(engine) == []
+
+def test_init_db_command(tmp_path):
+    """Test that the init-db command applies migrations to a fresh database."""
+    app = create_app("production", {"DATABASE_URI": f"sqlite:///{tmp_path}/cli.db"})
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["init-db"])
+    assert "Applied migrations: 1" in result.output
+
+    result = runner.invoke(args=["init-db"])
+    assert "Applied migrations" not in result.output
+    assert "Initialized the database." in result.output
+
+def tuned_app(tmp_path, **overrides):
+    return create_app("testing", {
+        "DATABASE_URI": f"sqlite:///{tmp_path}/tuned.db",
+        "SQLITE_TUNED": True,
+        "SQLITE_SINGLE_WRITER": True,
+        **overrides
+    })
+
+def test_sqlite_tuned_pragmas(tmp_path):
+    """Test that tuned SQLite connections use WAL and the configured pragmas."""
+    app = tuned_app(tmp_path, SQLITE_BUSY_TIMEOUT=1234)
+
+    with app.app_context():
+        with get_engine().connect() as conn:
+            assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+            assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 1234
+            assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1
+
+def test_write_queue_group_commit(tmp_path):
+    """Test that queued writes share a commit and a failing one does not affect the rest."""
+    app = tuned_app(tmp_path)
+    write_queue = get_database(app).write_queue
+    started = threading.Event()
+    release = threading.Event()
+
+    def add_category(name):
+        def write(db):
+            db.add(Category(name=name))
+            db.flush()
+            return name
+        return write
+
+    def blocked(db):
+        started.set()
+        release.wait(5)
+        return "first"
+
+    def failing(db):
+        raise ValueError("bad write")
+
+    # Hold the writer so the next writes queue up behind it
+    first = write_queue.submit(blocked)
+    assert started.wait(5)
+    futures = [write_queue.submit(add_category(f"cat-{i}")) for i in range(5)]
+    failed = write_queue.submit(failing)
+    duplicate = write_queue.submit(add_category("cat-0"))
+    release.set()
+
+    assert first.result(5) == "first"
+    assert [f.result(5) for f in futures] == [f"cat-{i}" for i in range(5)]
+    with pytest.raises(ValueError):
+        failed.result(5)
+    with pytest.raises(Exception):
+        duplicate.result(5)
+
+    assert write_queue.commits == 2
+    with app.app_context():
+        assert get_db().query(Category).count() == 5
+
+def test_concurrent_adjustments_single_writer(tmp_path):
+    """Test that concurrent stock adjustments all succeed through the writer."""
+    app = tuned_app(tmp_path)
+    with app.app_context():
+        db = get_db()
+        role = seed_roles_and_permissions(db)["admin"]
+        user = User(username="writer", email="writer@example.com", role_id=role.id, password_hash="!")
+        product = Product(sku="HOT-001", name="Hot", price=1.0, quantity=0)
+        db.add_all([user, product])
+        db.commit()
+        headers = {"Authorization": f"Bearer {generate_token(user.id)}"}
+        product_id = product.id
+
+    def worker(_):
+        client = app.test_client()
+        return [
+            client.post(f"/api/inventory/products/{product_id}/adjust", headers=headers, json={"quantity_change": 1}).status_code
+            for _ in range(20)
+        ]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = [status for batch in executor.map(worker, range(8)) for status in batch]
+
+    assert set(statuses) == {200}
+    with app.app_context():
+        assert get_db().execute(text("SELECT quantity FROM products WHERE id = :id"), {"id": product_id}).scalar() == 160
+        stats = get_pool_stats()["write_queue"]
+        assert stats["writes"] == 160
+        assert stats["commits"] <= 160
+
+def test_write_queue_timeout(tmp_path):
+    """Test that a timed-out write is cancelled if it has not started and reported pending if it has."""
+    app = tuned_app(tmp_path)
+    write_queue = get_database(app).write_queue
+    write_queue.timeout = 0.1
+    release = threading.Event()
+
+    def blocked(db):
+        release.wait(5)
+        return "done"
+
+    with pytest.raises(WriteTimeout) as running:
+        write_queue.run(blocked)
+    with pytest.raises(WriteTimeout) as queued:
+        write_queue.run(lambda db: "never")
+    release.set()
+
+    assert running.value.pending
+    assert not queued.value.pending
@@ -0,0 +1,109 @@
+import json
+from sqlalchemy import select
+from inventory_management.models.inventory import Category, InventoryTransaction, Product
+from inventory_management.services.importer import import_products
+from inventory_management.utils.database import get_db
+
+CSV_ROWS = """sku,name,price,quantity,category,low_stock_threshold
+IMP-0001,Hammer,9.99,10,Tools,
+IMP-0002,Saw,24.50,,Tools,3
+1BAD-SKU,Bad sku,1.00,1,Tools,
+IMP-0003,No price,,1,Tools,
+IMP-0004,Glue,2.25,100,Supplies,
+IMP-0001,Hammer v2,11.00,12,Tools,
+"""
+
+def test_import_csv(app, tmp_path):
+    """Test importing a CSV with new products, categories, duplicates and rejects."""
+    path = tmp_path / "products.csv"
+    path.write_text(CSV_ROWS)
+
+    with app.app_context():
+        db = get_db()
+        result = import_products(db, str(path), chunk_size=2)
+
+        assert (result.rows, result.rejected) == (6, 2)
+        assert result.inserted + result.updated == 4
+        products = {p.sku: p for p in db.scalars(select(Product))}
+        assert set(products) == {"IMP-0001", "IMP-0002", "IMP-0004"}
+        assert (products["IMP-0001"].name, products["IMP-0001"].quantity) == ("Hammer v2", 12)
+        assert (products["IMP-0002"].quantity, products["IMP-0002"].low_stock_threshold) == (0, 3)
+        assert set(db.scalars(select(Category.name))) == {"Tools", "Supplies"}
+
+    rejects = [json.loads(line) for line in (tmp_path / "products.csv.rejects.jsonl").read_text().splitlines()]
+    assert [(r["line"], r["row"]["sku"]) for r in rejects] == [(4, "1BAD-SKU"), (5, "IMP-0003")]
+    assert rejects[0]["error"] == "SKU must start with a letter"
+
+def test_import_jsonl_updates_existing(app, tmp_path):
+    """Test that a JSONL import updates products with an existing SKU."""
+    with app.app_context():
+        db = get_db()
+        db.add(Product(sku="JSON-001", name="Old", price=1.00, quantity=1))
+        db.commit()
+
+    path = tmp_path / "products.jsonl"
+    path.write_text(
+        '{"sku": "JSON-001", "name": "New", "price": 2.5, "quantity": 7}\n'
+        'not json\n'
+        '{"sku": "JSON-002", "name": "Fresh", "price": 1, "quantity": -1}\n'
+    )
+
+    with app.app_context():
+        db = get_db()
+        result = import_products(db, str(path), rejects_path=str(tmp_path / "rejects.jsonl"))
+
+        assert (result.inserted, result.updated, result.rejected) == (0, 1, 2)
+        product = db.scalars(select(Product).where(Product.sku == "JSON-001")).one()
+        assert (product.name, product.price, product.quantity) == ("New", 2.5, 7)
+
+def test_reimport_keeps_columns_left_out(app, tmp_path):
+    """Test that re-importing a SKU with only sku, name and price leaves stock and settings alone."""
+    with app.app_context():
+        db = get_db()
+        db.add(Product(sku="KEEP-001", name="Old", description="Kept", price=1.00, quantity=50,
+                       low_stock_threshold=5, active=False))
+        db.commit()
+
+    path = tmp_path / "products.csv"
+    path.write_text("sku,name,price\nKEEP-001,Renamed,3.00\n")
+
+    with app.app_context():
+        db = get_db()
+        result = import_products(db, str(path))
+
+        assert (result.inserted, result.updated) == (0, 1)
+        product = db.scalars(select(Product).where(Product.sku == "KEEP-001")).one()
+        assert (product.name, product.price) == ("Renamed", 3.0)
+        assert (product.quantity, product.low_stock_threshold, product.active, product.description) == (50, 5, False, "Kept")
+        assert db.scalars(select(InventoryTransaction)).all() == []
+
+def test_reimport_quantity_records_transaction(app, tmp_path):
+    """Test that an imported quantity for an existing SKU is recorded as a stock change."""
+    with app.app_context():
+        db = get_db()
+        db.add(Product(sku="QTY-001", name="Counted", price=1.00, quantity=50))
+        db.commit()
+
+    path = tmp_path / "products.csv"
+    path.write_text("sku,name,price,quantity\nQTY-001,Counted,1.00,42\n")
+
+    with app.app_context():
+        db = get_db()
+        import_products(db, str(path))
+
+        product = db.scalars(select(Product).where(Product.sku == "QTY-001")).one()
+        assert product.quantity == 42
+        transactions = db.scalars(select(InventoryTransaction)).all()
+        assert [(t.product_id, t.quantity_change, t.reference) for t in transactions] == [(product.id, -8, "import")]
+
+def test_import_products_command_parallel(runner, app, tmp_path):
+    """Test the CLI command with parsing spread over worker processes."""
+    path = tmp_path / "bulk.csv"
+    path.write_text("sku,name,price\n" + "".join(f"BULK-{i:05d},Item {i},1.00\n" for i in range(250)))
+
+    result = runner.invoke(args=["import-products", str(path), "--workers", "2", "--chunk-size", "40"])
+
+    assert "Imported 250 products (250 inserted, 0 updated), 0 rejected" in result.output
+    assert "rows/sec" in result.output
+    with app.app_context():
+        assert len(get_db().scalars(select(Product.id)).all()) == 250
@@ -1,5 +1,8 @@
+import json
 import pytest
+from datetime import datetime, timedelta
 from inventory_management.models.inventory import Product, Category, InventoryTransaction
+from inventory_management.models.user import User
 from inventory_management.utils.database import get_db
 
 def test_category_creation(client, app):
@@ -102,4 +105,322 @@ def test_inventory_transaction(client, app):
         assert saved_transaction is not None
         assert saved_transaction.quantity_change == -5
         assert saved_transaction.transaction_type == "removal"
-    
\ No newline at end of file
+    
+def test_bulk_adjust_stock(client, app, auth_headers):
+    """Test applying a batch of stock adjustments in one request."""
+    with app.app_context():
+        db = get_db()
+        db.add_all([
+            Product(sku="BULK-001", name="Bulk One", price=1.00, quantity=10),
+            Product(sku="BULK-002", name="Bulk Two", price=2.00, quantity=1),
+        ])
+        db.commit()
+    
+    response = client.post("/api/inventory/stock/bulk-adjust", headers=auth_headers, json={
+        "adjustments": [
+            {"sku": "BULK-001", "quantity_change": 5, "reference": "PO-1"},
+            {"sku": "BULK-001", "quantity_change": -3},
+            {"sku": "BULK-002", "quantity_change": -2},
+            {"sku": "MISSING-1", "quantity_change": 1},
+            {"sku": "BULK-002", "quantity_change": 0},
+        ]
+    })
+    
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["applied"] == 2
+    assert data["rejected"] == 3
+    assert [r["status"] for r in data["results"]] == ["applied", "applied", "rejected", "rejected", "rejected"]
+    assert data["results"][1]["old_quantity"] == 15
+    assert data["results"][1]["new_quantity"] == 12
+    assert data["results"][2]["error"] == "Insufficient stock"
+    assert data["results"][3]["error"] == "Product not found"
+    
+    with app.app_context():
+        db = get_db()
+        product = db.query(Product).filter_by(sku="BULK-001").first()
+        assert product.quantity == 12
+        assert db.query(InventoryTransaction).filter_by(product_id=product.id).count() == 2
+        assert db.query(Product).filter_by(sku="BULK-002").first().quantity == 1
+
+def test_bulk_adjust_stock_requires_list(client, auth_headers):
+    """Test that the bulk endpoint rejects malformed payloads."""
+    response = client.post("/api/inventory/stock/bulk-adjust", headers=auth_headers, json={"adjustments": []})
+    assert response.status_code == 400
+
+def test_adjust_stock(client, app, auth_headers):
+    """Test a single stock adjustment reports old and new quantity."""
+    with app.app_context():
+        db = get_db()
+        product = Product(sku="ADJ-001", name="Adjusted", price=1.00, quantity=10)
+        db.add(product)
+        db.commit()
+        product_id = product.id
+    
+    response = client.post(f"/api/inventory/products/{product_id}/adjust", headers=auth_headers,
+                           json={"quantity_change": -4, "reference": "ORDER-1"})
+    assert response.status_code == 200
+    data = response.get_json()
+    assert (data["old_quantity"], data["new_quantity"]) == (10, 6)
+    
+    response = client.post(f"/api/inventory/products/{product_id}/adjust", headers=auth_headers,
+                           json={"quantity_change": -7})
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "Insufficient stock"
+    
+    response = client.post("/api/inventory/products/9999/adjust", headers=auth_headers,
+                           json={"quantity_change": 1})
+    assert response.status_code == 404
+    
+    response = client.post(f"/api/inventory/products/{product_id}/adjust", headers=auth_headers,
+                           json={"quantity_change": True})
+    assert response.status_code == 400
+    assert response.get_json()["error"] == "quantity_change must be a non-zero integer"
+    
+    with app.app_context():
+        db = get_db()
+        assert db.query(Product).filter_by(id=product_id).first().quantity == 6
+        assert db.query(InventoryTransaction).filter_by(product_id=product_id).count() == 1
+
+def test_concurrent_adjustments_lose_no_updates(tmp_path):
+    """Test that threads hammering one SKU never lose an update."""
+    from concurrent.futures import ThreadPoolExecutor
+    from inventory_management.app import create_app
+    from inventory_management.services.stock_service import adjust_quantity
+    
+    app = create_app("testing", {"DATABASE_URI": f"sqlite:///{tmp_path}/stress.db"})
+    with app.app_context():
+        db = get_db()
+        product = Product(sku="HOT-001", name="Hot SKU", price=1.00, quantity=0)
+        db.add(product)
+        db.commit()
+        product_id = product.id
+    
+    def worker(count):
+        for _ in range(count):
+            with app.app_context():
+                db = get_db()
+                adjust_quantity(db, product_id, 1)
+                db.add(InventoryTransaction(product_id=product_id, quantity_change=1, transaction_type="addition"))
+                db.commit()
+    
+    threads, per_thread = 8, 25
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(worker, [per_thread] * threads))
+    
+    with app.app_context():
+        db = get_db()
+        assert db.query(Product).filter_by(id=product_id).first().quantity == threads * per_thread
+        assert db.query(InventoryTransaction).filter_by(product_id=product_id).count() == threads * per_thread
+
+def test_concurrent_bulk_adjustments_never_go_negative(tmp_path):
+    """Test that bulk adjustments racing on one SKU never take its stock below zero."""
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from inventory_management.app import create_app
+    from inventory_management.services.stock_service import apply_stock_adjustments
+
+    app = create_app("testing", {"DATABASE_URI": f"sqlite:///{tmp_path}/bulk-race.db"})
+    with app.app_context():
+        db = get_db()
+        product = Product(sku="RACE-001", name="Race SKU", price=1.00, quantity=5)
+        db.add(product)
+        db.commit()
+        product_id = product.id
+
+    threads = 10
+    barrier = threading.Barrier(threads)
+
+    def worker(_):
+        with app.app_context():
+            db = get_db()
+            barrier.wait()
+            results, _ = apply_stock_adjustments(db, [{"sku": "RACE-001", "quantity_change": -1}])
+            db.commit()
+            return results[0]
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        results = list(executor.map(worker, range(threads)))
+
+    applied = [r for r in results if r["status"] == "applied"]
+    assert len(applied) == 5
+    assert sorted(r["old_quantity"] for r in applied) == [1, 2, 3, 4, 5]
+    with app.app_context():
+        db = get_db()
+        assert db.get(Product, product_id).quantity == 0
+        assert db.query(InventoryTransaction).filter_by(product_id=product_id).count() == 5
+
+def test_products_keyset_pagination(client, app, auth_headers):
+    """Test walking the product list page by page with cursors."""
+    with app.app_context():
+        db = get_db()
+        db.add_all(Product(sku=f"PAGE-{i:03d}", name=f"Paged {i}", price=1.00) for i in range(5))
+        db.commit()
+    
+    skus, cursor = [], None
+    while True:
+        url = "/api/inventory/products?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(url, headers=auth_headers).get_json()
+        assert len(data["items"]) <= 2
+        skus.extend(p["sku"] for p in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert skus == [f"PAGE-{i:03d}" for i in range(5)]
+    
+    response = client.get("/api/inventory/products?cursor=not-a-cursor", headers=auth_headers)
+    assert response.status_code == 400
+
+def test_transactions_keyset_pagination(client, app, auth_headers):
+    """Test that transaction history pages newest first without gaps."""
+    with app.app_context():
+        db = get_db()
+        product = Product(sku="HIST-001", name="History", price=1.00, quantity=100)
+        db.add(product)
+        db.flush()
+        same_time = datetime(2024, 1, 1)
+        db.add_all(
+            InventoryTransaction(product_id=product.id, quantity_change=i + 1, transaction_type="addition",
+                                 timestamp=same_time if i < 3 else same_time + timedelta(hours=i))
+            for i in range(6)
+        )
+        db.commit()
+        product_id = product.id
+    
+    changes, cursor = [], None
+    while True:
+        url = f"/api/inventory/products/{product_id}/transactions?limit=4" + (f"&cursor={cursor}" if cursor else "")
+        data = client.get(url, headers=auth_headers).get_json()
+        changes.extend(t["quantity_change"] for t in data["items"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            break
+    
+    assert changes == [6, 5, 4, 3, 2, 1]
+
+def test_transaction_history_query_count(client, app, auth_headers, count_queries):
+    """Test that history serialization does not lazy-load users per row."""
+    with app.app_context():
+        db = get_db()
+        role_id = db.query(User).first().role_id
+        users = [User(username=f"picker{i}", email=f"picker{i}@example.com", role_id=role_id, password_hash="!")
+                 for i in range(5)]
+        product = Product(sku="NPLUS-001", name="N+1", price=1.00, quantity=100)
+        db.add_all(users + [product])
+        db.flush()
+        db.add_all(
+            InventoryTransaction(product_id=product.id, quantity_change=1, transaction_type="addition",
+                                 user_id=users[i % 5].id)
+            for i in range(20)
+        )
+        db.commit()
+        product_id = product.id
+    
+    url = f"/api/inventory/products/{product_id}/transactions?limit=20"
+    client.get(url, headers=auth_headers)
+    
+    with count_queries() as queries:
+        data = client.get(url, headers=auth_headers).get_json()
+    
+    assert {t["user"] for t in data["items"]} == {f"picker{i}" for i in range(5)}
+    queries.assert_at_most(2)
+
+def test_export_transactions_streams_jsonl_and_json(client, app, auth_headers):
+    """Test the streaming export endpoints in both formats."""
+    with app.app_context():
+        db = get_db()
+        product = Product(sku="EXP-001", name="Exported", price=2.50, quantity=5)
+        db.add(product)
+        db.flush()
+        db.add_all(
+            InventoryTransaction(product_id=product.id, quantity_change=i + 1, transaction_type="addition")
+            for i in range(3)
+        )
+        db.commit()
+    
+    response = client.get("/api/inventory/export/transactions", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.is_streamed
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [t["quantity_change"] for t in lines] == [1, 2, 3]
+    
+    response = client.get("/api/inventory/export/products?format=json", headers=auth_headers)
+    assert [p["sku"] for p in response.get_json()] == ["EXP-001"]
+    
+    response = client.get("/api/inventory/export/products?format=xml", headers=auth_headers)
+    assert response.status_code == 400
+
+def test_low_stock_endpoint(client, app, auth_headers):
+    """Test listing low stock products, kept current as quantities change."""
+    with app.app_context():
+        db = get_db()
+        db.add_all([
+            Product(sku="LOW-001", name="Low", price=1.00, quantity=2, low_stock_threshold=5),
+            Product(sku="LOW-002", name="Fine", price=1.00, quantity=50, low_stock_threshold=5),
+            Product(sku="LOW-003", name="Inactive", price=1.00, quantity=0, low_stock_threshold=5, active=False),
+        ])
+        db.commit()
+        fine_id = db.query(Product).filter_by(sku="LOW-002").first().id
+    
+    data = client.get("/api/inventory/low-stock", headers=auth_headers).get_json()
+    assert [p["sku"] for p in data["items"]] == ["LOW-001"]
+    
+    client.post(f"/api/inventory/products/{fine_id}/adjust", headers=auth_headers, json={"quantity_change": -46})
+    
+    data = client.get("/api/inventory/low-stock", headers=auth_headers).get_json()
+    assert [p["sku"] for p in data["items"]] == ["LOW-001", "LOW-002"]
+
+def test_low_stock_command(runner, app):
+    """Test the low-stock CLI command."""
+    with app.app_context():
+        db = get_db()
+        db.add(Product(sku="CLI-001", name="CLI Low", price=1.00, quantity=1, low_stock_threshold=3))
+        db.commit()
+    
+    result = runner.invoke(args=["low-stock"])
+    
+    assert "CLI-001" in result.output
+    assert "1 low stock products" in result.output
+
+def test_search_products(client, app, auth_headers):
+    """Test prefix search with ranking, SKU prefixes and category filtering."""
+    with app.app_context():
+        db = get_db()
+        tools = Category(name="Tools")
+        db.add(tools)
+        db.flush()
+        db.add_all([
+            Product(sku="HAM-001", name="Claw Hammer", description="Steel", price=1.00, category_id=tools.id),
+            Product(sku="NAIL-100", name="Nails", description="For any hammer", price=1.00, category_id=tools.id),
+            Product(sku="HAMMOCK-1", name="Garden Hammock", price=1.00),
+            Product(sku="SCREW-001", name="Screws", price=1.00),
+            Product(sku="DRV-001", name="Screwdriver", price=1.00),
+            Product(sku="DRV-002", name="Screwdrivers (set of 6)", price=1.00),
+        ])
+        db.commit()
+        nails = db.query(Product).filter_by(sku="NAIL-100").first()
+        nails.name = "Wire Brads"
+        db.commit()
+        tools_id = tools.id
+    
+    def skus(query):
+        response = client.get(f"/api/inventory/products/search?{query}", headers=auth_headers)
+        assert response.status_code == 200
+        return [p["sku"] for p in response.get_json()["items"]]
+    
+    # SKU prefix matches first, then name matches before description matches
+    assert skus("q=hamm") == ["HAMMOCK-1", "HAM-001", "NAIL-100"]
+    assert skus("q=hamm&category_id=" + str(tools_id)) == ["HAM-001", "NAIL-100"]
+    assert skus("q=ham") == ["HAM-001", "HAMMOCK-1", "NAIL-100"]
+    assert skus("q=claw ham") == ["HAM-001"]
+    assert skus("q=nail-1") == ["NAIL-100"]
+    assert skus("q=screwdriver") == ["DRV-001", "DRV-002"]
+    assert skus("q=screwdrivers") == ["DRV-002"]
+    
+    # Renames are reindexed by the triggers
+    assert skus("q=brads") == ["NAIL-100"]
+    assert skus("q=nails") == []
+    assert skus("q=wire&limit=1") == ["NAIL-100"]
+    
+    assert client.get("/api/inventory/products/search?q=", headers=auth_headers).status_code == 400
@@ -0,0 +1,160 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from inventory_management.app import create_app
+from inventory_management.models.inventory import InventoryTransaction, Product
+from inventory_management.models.user import User
+from inventory_management.services.auth_service import generate_token
+from inventory_management.services.ledger import LedgerWriter
+from inventory_management.services.permissions import seed_roles_and_permissions
+from inventory_management.services.stock_service import InsufficientStockError, ProductNotFoundError
+from inventory_management.utils.database import get_database, get_db
+
+def ledger_app(tmp_path, **overrides):
+    return create_app("testing", {
+        "DATABASE_URI": f"sqlite:///{tmp_path}/ledger.db",
+        "LEDGER_ENABLED": True,
+        **overrides
+    })
+
+def add_product(app, quantity):
+    with app.app_context():
+        db = get_db()
+        product = Product(sku="LED-001", name="Ledger", price=1.0, quantity=quantity, low_stock_threshold=2)
+        db.add(product)
+        db.commit()
+        return product.id
+
+def create_user(app):
+    """Create an admin user; return (user id, authorization headers)."""
+    with app.app_context():
+        db = get_db()
+        role = seed_roles_and_permissions(db)["admin"]
+        user = User(username="ledger", email="ledger@example.com", role_id=role.id, password_hash="!")
+        db.add(user)
+        db.commit()
+        return user.id, {"Authorization": f"Bearer {generate_token(user.id)}"}
+
+def test_ledger_batches_adjustments(tmp_path):
+    """Test that queued adjustments share one commit and a rejected one does not affect the rest."""
+    app = ledger_app(tmp_path, LEDGER_FLUSH_INTERVAL=0.2)
+    product_id = add_product(app, 5)
+    ledger = app.extensions["ledger_writer"]
+
+    futures = [ledger.submit(product_id, change, reference=f"r{i}") for i, change in enumerate([-2, -2, -2, 3])]
+    missing = ledger.submit(product_id + 1, 1)
+
+    levels = [future.result(5) if i != 2 else None for i, future in enumerate(futures)]
+    with pytest.raises(InsufficientStockError):
+        futures[2].result(5)
+    with pytest.raises(ProductNotFoundError):
+        missing.result(5)
+
+    assert [(level.old_quantity, level.quantity) for level in levels if level] == [(5, 3), (3, 1), (1, 4)]
+    assert ledger.stats()["batches"] == 1
+    with app.app_context():
+        db = get_db()
+        assert db.get(Product, product_id).quantity == 4
+        rows = db.query(InventoryTransaction).order_by(InventoryTransaction.id).all()
+        assert [(row.quantity_change, row.reference) for row in rows] == [(-2, "r0"), (-2, "r1"), (3, "r3")]
+        assert all(row.timestamp is not None for row in rows)
+
+@pytest.mark.parametrize("overrides", [
+    {"LEDGER_DURABILITY": "sync"},
+    {"LEDGER_DURABILITY": "async"},
+    {"SQLITE_TUNED": True, "SQLITE_SINGLE_WRITER": True},
+], ids=["sync", "async", "single-writer"])
+def test_adjust_endpoint_through_ledger(tmp_path, overrides):
+    """Test that concurrent adjust requests go through the ledger and are all recorded."""
+    app = ledger_app(tmp_path, METRICS_ENABLED=True, **overrides)
+    product_id = add_product(app, 0)
+    user_id, headers = create_user(app)
+
+    def worker(_):
+        client = app.test_client()
+        return [
+            client.post(f"/api/inventory/products/{product_id}/adjust", headers=headers, json={"quantity_change": 1}).status_code
+            for _ in range(10)
+        ]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = [status for batch in executor.map(worker, range(8)) for status in batch]
+    app.extensions["ledger_writer"].flush(5)
+
+    assert set(statuses) == {200}
+    client = app.test_client()
+    stats = client.get("/health/db").get_json()["ledger"]
+    assert stats["entries"] == 80
+    assert stats["batches"] <= 80
+    assert stats["lost"] == 0
+    assert f"ledger_batch_size_count {stats['batches']}" in client.get("/metrics").get_data(as_text=True)
+    with app.app_context():
+        db = get_db()
+        assert db.get(Product, product_id).quantity == 80
+        assert db.query(InventoryTransaction).filter_by(product_id=product_id, user_id=user_id).count() == 80
+
+def test_ledger_disabled_for_memory_sqlite():
+    """Test that the ledger is not used with an in-memory database, which threads do not share."""
+    app = create_app("testing", {"LEDGER_ENABLED": True})
+    assert "ledger_writer" not in app.extensions
+
+def test_adjust_timeout_before_write_is_cancelled(tmp_path):
+    """Test that an adjustment still queued at the timeout is cancelled and answered with 503."""
+    app = ledger_app(tmp_path, DB_POOL_TIMEOUT=0.1, LEDGER_FLUSH_INTERVAL=0.5)
+    product_id = add_product(app, 5)
+    _, headers = create_user(app)
+
+    response = app.test_client().post(f"/api/inventory/products/{product_id}/adjust", headers=headers,
+                                      json={"quantity_change": 1})
+    assert response.status_code == 503
+    app.extensions["ledger_writer"].flush(5)
+
+    with app.app_context():
+        assert get_db().get(Product, product_id).quantity == 5
+
+def test_adjust_timeout_during_write_is_pending(tmp_path):
+    """Test that an adjustment already being written at the timeout is answered with 202, not 500."""
+    app = ledger_app(tmp_path, DB_POOL_TIMEOUT=0.1)
+    product_id = add_product(app, 5)
+    _, headers = create_user(app)
+    ledger = app.extensions["ledger_writer"]
+    apply = ledger.apply
+
+    def slow_apply(session, entries):
+        time.sleep(0.3)
+        return apply(session, entries)
+
+    ledger.apply = slow_apply
+    response = app.test_client().post(f"/api/inventory/products/{product_id}/adjust", headers=headers,
+                                      json={"quantity_change": 1, "reference": "PO-7"})
+    assert response.status_code == 202
+    assert response.get_json()["status"] == "pending"
+    assert response.get_json()["reference"] == "PO-7"
+    ledger.flush(5)
+
+    with app.app_context():
+        assert get_db().get(Product, product_id).quantity == 6
+
+def test_ledger_writers_racing_never_go_negative(tmp_path):
+    """Test that several ledger writers on one product only apply the adjustments its stock covers."""
+    app = ledger_app(tmp_path, LEDGER_FLUSH_INTERVAL=0.01)
+    product_id = add_product(app, 5)
+    session_factory = get_database(app).session_factory
+    writers = [LedgerWriter(session_factory, batch_size=10, flush_interval=0.001) for _ in range(4)]
+
+    futures = [writer.submit(product_id, -1) for _ in range(40) for writer in writers]
+    applied = 0
+    for future in futures:
+        try:
+            future.result(10)
+            applied += 1
+        except InsufficientStockError:
+            pass
+    for writer in writers:
+        writer.stop()
+
+    assert applied == 5
+    with app.app_context():
+        db = get_db()
+        assert db.get(Product, product_id).quantity == 0
+        assert db.query(InventoryTransaction).filter_by(product_id=product_id).count() == 5
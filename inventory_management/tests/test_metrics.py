@@ -0,0 +1,87 @@
+import time
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from inventory_management.app import create_app
+from inventory_management.models.user import User
+from inventory_management.services.permissions import seed_roles_and_permissions
+from inventory_management.utils.database import get_db
+from inventory_management.utils.profiler import SamplingProfiler
+
+@pytest.fixture
+def metrics_client():
+    app = create_app("testing", {"METRICS_ENABLED": True})
+    with app.app_context():
+        db = get_db()
+        role = seed_roles_and_permissions(db)["viewer"]
+        user = User(username="metrics", email="metrics@example.com", role_id=role.id)
+        user.set_password("Password1!")
+        db.add(user)
+        db.commit()
+    return app.test_client()
+
+def metric_value(text, line_prefix):
+    for line in text.splitlines():
+        if line.startswith(line_prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_prefix} not found in metrics")
+
+def test_metrics_endpoint(metrics_client):
+    """Test that requests, SQL, bcrypt and JWT timings are exported."""
+    token = metrics_client.post("/api/auth/login", json={"username": "metrics", "password": "Password1!"}).get_json()["token"]
+    metrics_client.get("/api/inventory/products", headers={"Authorization": f"Bearer {token}"})
+
+    response = metrics_client.get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    labels = 'endpoint="inventory.get_products",method="GET",status="200"'
+    assert metric_value(text, f"http_request_duration_seconds_count{{{labels}}}") == 1
+    assert metric_value(text, 'http_request_duration_seconds_bucket{' + labels + ',le="+Inf"}') == 1
+    assert metric_value(text, 'http_request_sql_statements_sum{endpoint="auth.login"}') >= 1
+    assert metric_value(text, 'password_hash_duration_seconds_count{operation="check"}') == 1
+    assert metric_value(text, "jwt_decode_duration_seconds_count") == 1
+
+def test_metrics_are_opt_in(client):
+    """Test that /metrics does not exist unless METRICS_ENABLED is set."""
+    assert client.get("/metrics").status_code == 404
+
+def test_sampling_profiler_dumps_slow_requests(tmp_path):
+    """Test that a slow request's stacks are written in folded format."""
+    profiler = SamplingProfiler(str(tmp_path), threshold=0.01, interval=0.001)
+
+    def busy_handler():
+        deadline = time.perf_counter() + 0.1
+        while time.perf_counter() < deadline:
+            pass
+
+    profiler.begin()
+    busy_handler()
+    path = profiler.end(0.1, "inventory.slow")
+    profiler.stop()
+
+    assert path is not None and path.endswith(".folded")
+    lines = open(path).read().splitlines()
+    assert any("busy_handler" in line for line in lines)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+    profiler.begin()
+    assert profiler.end(0.001, "inventory.fast") is None
+
+def test_failed_statement_clears_start_time():
+    """Test that a statement that raises is counted and leaves no start time behind."""
+    app = create_app("testing", {"METRICS_ENABLED": True})
+    metrics = app.extensions["metrics"]
+    with app.app_context():
+        db = get_db()
+        metrics.start_request()
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                db.execute(text("SELECT * FROM missing_table"))
+            db.rollback()
+        db.execute(text("SELECT 1"))
+
+        assert "metrics_query_start" not in db.connection().info
+        assert metrics.end_request()[0] == 4
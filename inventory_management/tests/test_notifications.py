@@ -0,0 +1,126 @@
+import socket
+import pytest
+from inventory_management.models.inventory import Product
+from inventory_management.services.notification_service import (
+    LowStockAlert,
+    NotificationDispatcher,
+    SMTPConnection,
+    get_dispatcher,
+)
+from inventory_management.utils.database import get_db
+
+aiosmtpd_controller = pytest.importorskip("aiosmtpd.controller")
+
+class RecordingHandler:
+    """aiosmtpd handler that keeps received messages and counts connections."""
+
+    def __init__(self):
+        self.messages = []
+        self.connections = 0
+
+    async def handle_EHLO(self, server, session, envelope, hostname, responses):
+        self.connections += 1
+        session.host_name = hostname
+        return responses
+
+    async def handle_DATA(self, server, session, envelope):
+        self.messages.append(envelope.content.decode("utf-8", errors="replace"))
+        return "250 Message accepted for delivery"
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = aiosmtpd_controller.Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+def make_dispatcher(controller, **kwargs):
+    connection = SMTPConnection(controller.hostname, controller.port)
+    options = {"dedup_window": 60, "batch_size": 10, "batch_interval": 0.2}
+    options.update(kwargs)
+    return NotificationDispatcher(connection, "inventory@example.com", ["manager@example.com"], **options)
+
+def test_alerts_are_batched_into_one_digest(smtp_server):
+    """Test that alerts queued together are sent as a single digest email."""
+    controller, handler = smtp_server
+    dispatcher = make_dispatcher(controller)
+
+    for i in range(3):
+        assert dispatcher.enqueue(LowStockAlert(f"LOW-00{i}", f"Product {i}", 1, 5))
+    assert dispatcher.flush(timeout=5)
+
+    assert len(handler.messages) == 1
+    assert "LOW-000" in handler.messages[0] and "LOW-002" in handler.messages[0]
+    assert dispatcher.stats()["sent_alerts"] == 3
+
+def test_repeated_alerts_are_deduplicated(smtp_server):
+    """Test that the same SKU is only alerted once within the window."""
+    controller, handler = smtp_server
+    dispatcher = make_dispatcher(controller)
+
+    assert dispatcher.enqueue(LowStockAlert("DUP-001", "Dup", 2, 5))
+    assert not dispatcher.enqueue(LowStockAlert("DUP-001", "Dup", 1, 5))
+    assert dispatcher.flush(timeout=5)
+
+    assert len(handler.messages) == 1
+    assert dispatcher.stats()["deduplicated"] == 1
+
+def test_dropped_alert_is_not_deduplicated(smtp_server):
+    """Test that an alert dropped on a full queue does not suppress the next one for its SKU."""
+    controller, _ = smtp_server
+    dispatcher = make_dispatcher(controller, queue_size=1)
+    # Keep the worker from draining the queue
+    dispatcher.start = lambda: None
+
+    assert dispatcher.enqueue(LowStockAlert("FULL-001", "First", 1, 5))
+    assert not dispatcher.enqueue(LowStockAlert("FULL-002", "Second", 1, 5))
+    assert dispatcher.stats()["dropped"] == 1
+
+    dispatcher._queue.get_nowait()
+    assert dispatcher.enqueue(LowStockAlert("FULL-002", "Second", 1, 5))
+    assert dispatcher.stats()["deduplicated"] == 0
+
+def test_smtp_connection_is_reused(smtp_server):
+    """Test that consecutive digests share one SMTP connection."""
+    controller, handler = smtp_server
+    dispatcher = make_dispatcher(controller, batch_interval=0)
+
+    dispatcher.enqueue(LowStockAlert("REUSE-01", "First", 1, 5))
+    assert dispatcher.flush(timeout=5)
+    dispatcher.enqueue(LowStockAlert("REUSE-02", "Second", 1, 5))
+    assert dispatcher.flush(timeout=5)
+
+    assert len(handler.messages) == 2
+    assert handler.connections == 1
+    dispatcher.connection.close()
+
+def test_stock_adjustment_queues_alert(client, app, auth_headers, smtp_server):
+    """Test that crossing the threshold queues an alert without sending inline."""
+    controller, handler = smtp_server
+    app.config["NOTIFICATION_ENABLED"] = True
+    with app.app_context():
+        dispatcher = get_dispatcher()
+    dispatcher.connection = SMTPConnection(controller.hostname, controller.port)
+    dispatcher.batch_interval = 0
+
+    with app.app_context():
+        db = get_db()
+        product = Product(sku="ALERT-001", name="Alerting", price=1.00, quantity=12, low_stock_threshold=10)
+        db.add(product)
+        db.commit()
+        product_id = product.id
+
+    response = client.post(f"/api/inventory/products/{product_id}/adjust", headers=auth_headers,
+                           json={"quantity_change": -5})
+    assert response.status_code == 200
+    assert dispatcher.flush(timeout=5)
+
+    assert len(handler.messages) == 1
+    assert "ALERT-001" in handler.messages[0]
+    dispatcher.connection.close()
@@ -0,0 +1,60 @@
+import threading
+import pytest
+from inventory_management.models.user import Role, User
+from inventory_management.utils.database import get_db
+from inventory_management.utils.passwords import PasswordHasher, PasswordHasherBusy
+
+def test_hash_and_check_password():
+    """Test hashing and verifying through the worker pool."""
+    hasher = PasswordHasher(rounds=4)
+    password_hash = hasher.hash_password("Password1!")
+
+    assert password_hash.startswith("$2b$04$")
+    assert hasher.check_password("Password1!", password_hash)
+    assert not hasher.check_password("wrong", password_hash)
+
+def test_needs_rehash_on_cost_change():
+    """Test that hashes made with another work factor need rehashing."""
+    old_hash = PasswordHasher(rounds=4).hash_password("Password1!")
+
+    assert not PasswordHasher(rounds=4).needs_rehash(old_hash)
+    assert PasswordHasher(rounds=5).needs_rehash(old_hash)
+
+def test_full_queue_raises_busy():
+    """Test that callers are turned away when every slot is taken."""
+    hasher = PasswordHasher(rounds=4, max_workers=1, max_pending=0, queue_timeout=0.05)
+    release = threading.Event()
+    started = threading.Event()
+
+    def block():
+        started.set()
+        release.wait(5)
+
+    blocker = threading.Thread(target=hasher._run, args=("block", block))
+    blocker.start()
+    started.wait(5)
+    try:
+        with pytest.raises(PasswordHasherBusy):
+            hasher.hash_password("Password1!")
+    finally:
+        release.set()
+        blocker.join()
+
+def test_login_rehashes_old_work_factor(client, app):
+    """Test that a successful login upgrades a hash made with an old cost."""
+    with app.app_context():
+        db = get_db()
+        role = Role(name="staff")
+        db.add(role)
+        db.flush()
+        user = User(username="bob", email="bob@example.com", role_id=role.id,
+                    password_hash=PasswordHasher(rounds=5).hash_password("Password1!"))
+        db.add(user)
+        db.commit()
+
+    response = client.post("/api/auth/login", json={"username": "bob", "password": "Password1!"})
+    assert response.status_code == 200
+
+    with app.app_context():
+        user = get_db().query(User).filter_by(username="bob").first()
+        assert user.password_hash.startswith("$2b$04$")
@@ -0,0 +1,78 @@
+import csv
+from datetime import datetime, timedelta
+import pytest
+from inventory_management.models.inventory import Category, InventoryTransaction, Product
+from inventory_management.services.notification_service import build_report_email
+from inventory_management.services.reporting import build_inventory_report
+from inventory_management.utils.database import get_db, get_engine
+
+pytest.importorskip("pandas")
+
+NOW = datetime(2024, 3, 31)
+
+def seed_catalog(db):
+    tools = Category(name="Tools")
+    db.add(tools)
+    db.flush()
+    hammer = Product(sku="HAM-001", name="Hammer", price=10.0, quantity=20, category_id=tools.id)
+    saw = Product(sku="SAW-001", name="Saw", price=25.0, quantity=0, category_id=tools.id)
+    loose = Product(sku="MISC-001", name="Loose part", price=0.5, quantity=100)
+    db.add_all([hammer, saw, loose])
+    db.flush()
+    db.add_all([
+        # 30 hammers out during the period, one old removal and one restock outside it
+        InventoryTransaction(product_id=hammer.id, quantity_change=-30, transaction_type="removal", timestamp=NOW - timedelta(days=5)),
+        InventoryTransaction(product_id=hammer.id, quantity_change=50, transaction_type="addition", timestamp=NOW - timedelta(days=4)),
+        InventoryTransaction(product_id=hammer.id, quantity_change=-99, transaction_type="removal", timestamp=NOW - timedelta(days=90)),
+        InventoryTransaction(product_id=saw.id, quantity_change=-3, transaction_type="removal", timestamp=NOW - timedelta(days=1)),
+    ])
+    db.commit()
+
+def read_csv(path):
+    with open(path, newline="") as f:
+        return {row[next(iter(row))]: row for row in csv.DictReader(f)}
+
+def test_inventory_report_metrics(app, tmp_path):
+    """Test valuation, turnover and days of cover per product and category."""
+    with app.app_context():
+        seed_catalog(get_db())
+        report = build_inventory_report(get_engine(), tmp_path, period_days=30, chunksize=2, now=NOW)
+
+    assert report.summary == {"products": 3, "quantity": 120, "valuation": 250.0, "units_out": 33}
+
+    products = {row["sku"]: row for row in read_csv(tmp_path / "products.csv").values()}
+    assert float(products["HAM-001"]["valuation"]) == 200.0
+    assert int(products["HAM-001"]["units_out"]) == 30
+    assert float(products["HAM-001"]["turnover"]) == 1.5
+    assert float(products["HAM-001"]["days_of_cover"]) == 20.0
+    # No stock on hand and no sales: metrics are left empty rather than inf
+    assert products["SAW-001"]["turnover"] == ""
+    assert products["MISC-001"]["days_of_cover"] == ""
+
+    categories = report.categories.set_index("category")
+    assert categories.loc["Tools", "valuation"] == 200.0
+    assert categories.loc["Tools", "units_out"] == 33
+    assert categories.loc["Uncategorized", "products"] == 1
+
+def test_inventory_report_parquet(app, tmp_path):
+    """Test that the report can be written as Parquet."""
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    with app.app_context():
+        seed_catalog(get_db())
+        build_inventory_report(get_engine(), tmp_path, fmt="parquet", chunksize=2, now=NOW)
+
+    assert len(pd.read_parquet(tmp_path / "products.parquet")) == 3
+
+def test_report_email_attaches_files(app, tmp_path):
+    """Test that the report email carries the summary and the report files."""
+    with app.app_context():
+        seed_catalog(get_db())
+        report = build_inventory_report(get_engine(), tmp_path, now=NOW)
+
+    msg = build_report_email("inventory@example.com", "owner@example.com", report)
+    attachments = [part.get_filename() for part in msg.get_payload()[1:]]
+
+    assert attachments == ["products.csv", "categories.csv"]
+    assert "Stock valuation: 250.00" in msg.get_payload()[0].get_payload()
@@ -0,0 +1,84 @@
+import pytest
+from inventory_management.app import create_app
+from inventory_management.models.inventory import Product
+from inventory_management.services.response_cache import get_response_cache
+from inventory_management.utils.database import get_db
+
+@pytest.fixture
+def app():
+    """An app with the response cache, which is off by default."""
+    return create_app("testing", {"RESPONSE_CACHE_ENABLED": True})
+
+def create_product(app, sku="CACHE-001", quantity=10):
+    with app.app_context():
+        db = get_db()
+        product = Product(sku=sku, name="Cached", price=1.00, quantity=quantity)
+        db.add(product)
+        db.commit()
+        return product.id
+
+def test_repeated_reads_are_served_from_cache(client, app, auth_headers, count_queries):
+    """Test that a repeated GET and a conditional GET do not touch the database."""
+    product_id = create_product(app)
+    url = f"/api/inventory/products/{product_id}"
+
+    first = client.get(url, headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    with count_queries() as queries:
+        second = client.get(url, headers=auth_headers)
+        not_modified = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert queries.count == 0
+
+    assert second.get_json() == first.get_json()
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == etag
+
+    stats = client.get("/health/cache").get_json()["responses"]
+    assert (stats["hits"], stats["not_modified"]) == (1, 1)
+
+def test_conditional_get_does_not_render(client, app, auth_headers, count_queries):
+    """Test that a matching If-None-Match is answered from table versions alone."""
+    product_id = create_product(app)
+    url = f"/api/inventory/products/{product_id}"
+    etag = client.get(url, headers=auth_headers).headers["ETag"]
+
+    with app.app_context():
+        get_response_cache().clear()
+    with count_queries() as queries:
+        response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert queries.count == 0
+    assert response.status_code == 304
+    assert response.get_data() == b""
+
+def test_response_cache_is_opt_in():
+    """Test that the response cache is off unless RESPONSE_CACHE_ENABLED is set."""
+    assert "response_cache" not in create_app("testing").extensions
+
+def test_writes_invalidate_cached_reads(client, app, auth_headers):
+    """Test that a stock adjustment bumps the product table version."""
+    product_id = create_product(app)
+    url = f"/api/inventory/products/{product_id}"
+    etag = client.get(url, headers=auth_headers).headers["ETag"]
+
+    response = client.post(f"{url}/adjust", headers=auth_headers, json={"quantity_change": -3})
+    assert response.status_code == 200
+
+    response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["quantity"] == 7
+    assert response.headers["ETag"] != etag
+
+def test_rolled_back_writes_keep_cache(client, app, auth_headers):
+    """Test that a failed write does not invalidate cached reads."""
+    product_id = create_product(app, quantity=1)
+    url = f"/api/inventory/products/{product_id}"
+    client.get(url, headers=auth_headers)
+
+    response = client.post(f"{url}/adjust", headers=auth_headers, json={"quantity_change": -5})
+    assert response.status_code == 400
+
+    client.get(url, headers=auth_headers)
+    stats = client.get("/health/cache").get_json()["responses"]
+    assert (stats["hits"], stats["misses"]) == (1, 1)
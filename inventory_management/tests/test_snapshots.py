@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from inventory_management.models.inventory import InventoryTransaction, Product, StockSnapshot
+from inventory_management.services.snapshot_service import stock_as_of, take_stock_snapshots
+from inventory_management.utils.database import get_db
+
+T0 = datetime(2024, 1, 1)
+
+def at(days):
+    return T0 + timedelta(days=days)
+
+def seed_history(db):
+    """Create a product opened with 10 units on day 0 and one change per day after."""
+    product = Product(sku="SNAP-001", name="Snapshotted", price=1.00, quantity=10, created_at=T0)
+    db.add(product)
+    db.flush()
+    for day, change in [(1, 5), (2, -3), (3, 4), (4, -6)]:
+        db.add(InventoryTransaction(product_id=product.id, quantity_change=change,
+                                    transaction_type="adjustment", timestamp=at(day)))
+        product.quantity += change
+    db.commit()
+    return product.id
+
+def test_stock_as_of_without_snapshots(app):
+    """Test that stock is derived backwards from the current quantity before any snapshot."""
+    with app.app_context():
+        db = get_db()
+        product_id = seed_history(db)
+
+        assert stock_as_of(db, product_id, at(0.5)).quantity == 10
+        assert stock_as_of(db, product_id, at(2.5)).quantity == 12
+        assert stock_as_of(db, product_id, at(5)).quantity == 10
+
+def test_snapshots_are_incremental(app):
+    """Test that re-running snapshots only writes rows for products that changed."""
+    with app.app_context():
+        db = get_db()
+        product_id = seed_history(db)
+        db.add(Product(sku="SNAP-002", name="Idle", price=1.00, quantity=7, created_at=T0))
+        db.commit()
+
+        assert take_stock_snapshots(db, at(2.5)) == 2
+        assert take_stock_snapshots(db, at(2.5)) == 0
+        assert take_stock_snapshots(db, at(3.5)) == 1
+
+        quantities = dict(db.execute(
+            select(StockSnapshot.taken_at, StockSnapshot.quantity).where(StockSnapshot.product_id == product_id)
+        ).all())
+        assert quantities == {at(2.5): 12, at(3.5): 16}
+        assert db.scalar(select(func.count()).select_from(StockSnapshot)) == 3
+
+def test_stock_as_of_replays_only_the_delta(app):
+    """Test that point-in-time queries start from the nearest snapshot."""
+    with app.app_context():
+        db = get_db()
+        product_id = seed_history(db)
+        take_stock_snapshots(db, at(2.5))
+
+        stock = stock_as_of(db, product_id, at(3.5))
+        assert (stock.quantity, stock.snapshot_at, stock.replayed) == (16, at(2.5), 1)
+
+        stock = stock_as_of(db, product_id, at(1.5))
+        assert (stock.quantity, stock.snapshot_at, stock.replayed) == (15, at(2.5), 1)
+
+def test_stock_endpoint(client, app, auth_headers):
+    """Test the point-in-time stock endpoint and the snapshot CLI command."""
+    with app.app_context():
+        product_id = seed_history(get_db())
+
+    result = app.test_cli_runner().invoke(args=["snapshot-stock", "--at", "2024-01-03 12:00:00"])
+    assert "Wrote 1 stock snapshots" in result.output
+
+    response = client.get(f"/api/inventory/products/{product_id}/stock?as_of=2024-01-04T12:00:00Z",
+                          headers=auth_headers)
+    assert response.status_code == 200
+    assert response.get_json()["quantity"] == 16
+    assert response.get_json()["snapshot_at"] == "2024-01-03T12:00:00"
+
+    response = client.get(f"/api/inventory/products/{product_id}/stock?as_of=yesterday", headers=auth_headers)
+    assert response.status_code == 400
+
+    response = client.get("/api/inventory/products/999/stock", headers=auth_headers)
+    assert response.status_code == 404
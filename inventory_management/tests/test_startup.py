@@ -0,0 +1,17 @@
+import subprocess
+import sys
+from benchmarks.bench_startup import LAZY_MODULES
+
+def test_create_app_does_not_import_heavy_modules():
+    """Test that pandas, bcrypt, email_validator and email.mime are only imported on first use."""
+    script = (
+        "import sys\n"
+        "from inventory_management.app import create_app\n"
+        "create_app('testing')\n"
+        "print(' '.join(sorted(sys.modules)))\n"
+    )
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    modules = completed.stdout.split()
+
+    loaded = [name for name in LAZY_MODULES if any(m == name or m.startswith(f"{name}.") for m in modules)]
+    assert loaded == []
@@ -0,0 +1,79 @@
+import pytest
+from inventory_management.utils.validators import (
+    SKU_BAD_CHARACTERS,
+    SKU_BAD_LENGTH,
+    SKU_BAD_START,
+    SKU_NOT_A_STRING,
+    SKU_OK,
+    SKU_TRAILING_HYPHEN,
+    validate_password,
+    validate_sku,
+    validate_skus,
+)
+
+SKUS = {
+    "ABC-123": SKU_OK,
+    "a1b2c3d4e5f6g7h8i9j0": SKU_OK,
+    "AB1": SKU_BAD_LENGTH,
+    "": SKU_BAD_LENGTH,
+    "1ABC-23": SKU_BAD_START,
+    "ABC-12-": SKU_TRAILING_HYPHEN,
+    "ABC_123": SKU_BAD_CHARACTERS,
+    "ÉABC-12": SKU_BAD_CHARACTERS,
+    "ABC-12\n": SKU_BAD_CHARACTERS,
+    None: SKU_NOT_A_STRING,
+}
+
+@pytest.mark.parametrize("password, message", [
+    ("Passw1!", "Password must be at least 8 characters long"),
+    ("password1!", "Password must contain at least one uppercase letter"),
+    ("PASSWORD1!", "Password must contain at least one lowercase letter"),
+    ("Password!", "Password must contain at least one digit"),
+    ("Password1", "Password must contain at least one special character"),
+    ("Password1!", "Password meets requirements"),
+])
+def test_validate_password(password, message):
+    """Test that each password rule reports its own message."""
+    result = validate_password(password)
+    assert result["message"] == message
+    assert result["valid"] == (message == "Password meets requirements")
+
+def test_validation_results_are_immutable():
+    """Test that shared result objects cannot be modified by callers."""
+    with pytest.raises(TypeError):
+        validate_sku("ABC-123")["valid"] = False
+
+def test_validate_sku_messages():
+    """Test that SKU rules are reported in the documented order."""
+    assert validate_sku("ABC-123") == {"valid": True, "message": "SKU format is valid"}
+    assert validate_sku("1B-")["message"] == "SKU must be between 5 and 20 characters long"
+    assert validate_sku("1ABC-23")["message"] == "SKU must start with a letter"
+    assert validate_sku("ABC-12-")["message"] == "SKU must not end with a hyphen"
+    assert validate_sku("ABC_123")["message"] == "SKU must contain only letters, numbers, and hyphens"
+
+def test_validate_skus_list():
+    """Test batch validation of a list of SKUs."""
+    mask, codes = validate_skus(list(SKUS))
+    assert codes == list(SKUS.values())
+    assert mask == [code == SKU_OK for code in SKUS.values()]
+
+def test_validate_skus_series():
+    """Test that vectorized Series validation agrees with the single-SKU validator."""
+    pd = pytest.importorskip("pandas")
+    series = pd.Series(list(SKUS), index=range(10, 10 + len(SKUS)), dtype=object)
+
+    mask, codes = validate_skus(series)
+
+    assert list(codes) == list(SKUS.values())
+    assert list(mask) == [code == SKU_OK for code in SKUS.values()]
+    assert list(mask.index) == list(series.index)
+
+def test_validate_skus_string_series():
+    """Test vectorized validation of a pandas string Series with missing values."""
+    pd = pytest.importorskip("pandas")
+    series = pd.Series(["ABC-123", None, "1ABC-23"], dtype="string")
+
+    mask, codes = validate_skus(series)
+
+    assert list(mask) == [True, False, False]
+    assert list(codes) == [SKU_OK, SKU_NOT_A_STRING, SKU_BAD_START]